@@ -1,23 +1,58 @@
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.core.database import get_async_db
-from app.services.document_processing import DocumentProcessingService
-from app.services.retrieval import RetrievalService
+from app.core.database import get_async_db, AsyncSessionLocal
+from app.controllers.document_controller import DocumentController
+from app.services.document_processing import DOCUMENT_PAYLOAD_FIELDS, DocumentProcessingService
+from app.services.container import get_retrieval_service, get_vector_store
+from app.services.retrieval import REQUIRED_PAYLOAD_FIELDS, RetrievalService
+from app.services.reembedding import ReembeddingService, list_reembed_checkpoints
+from app.infrastructure.vector_store.base import BaseVectorStore
+from app.infrastructure.vector_store.qdrant_store import versioned_collection_name
+from app.core.config.vector_store import get_vector_store_settings
+from app.infrastructure.cache.embedding_cache import get_embedding_cache
+from app.models.schemas.requests import DocumentFilter
 from app.models.database.document import Document
 from app.models.enums import DocumentStatus
 from app.utils.logging_setup import create_logger
 from app.utils.service_health import ServiceHealthChecker
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 logger = create_logger(__name__, log_file_name="endpoint.log")
 
+# Re-embedding jobs running in this process, keyed by target collection
+_reembed_jobs: Dict[str, asyncio.Task] = {}
+
 class SearchQuery(BaseModel):
     query: str
     limit: int = 5
 
+class ReembedRequest(BaseModel):
+    embedding_model: str = Field(..., description="Embedding model to re-embed all chunks with")
+    vector_size: int = Field(..., description="Dimension of the new model's vectors", ge=1)
+    provider: Optional[str] = Field(None, description="Embedding provider ('ollama' or 'local'), defaults to EMBEDDING_PROVIDER")
+    activate: bool = Field(True, description="Swap the served alias to the new collection when done")
+
+class PointPayloadUpdate(BaseModel):
+    chunk_uuid: str = Field(..., description="UUID of the chunk whose point is updated")
+    payload: Dict[str, Any] = Field(..., description="Payload fields to set on the point")
+
+class PayloadUpdateRequest(BaseModel):
+    filters: Optional[DocumentFilter] = Field(None, description="Select points by document metadata, used with payload")
+    payload: Optional[Dict[str, Any]] = Field(None, description="Payload fields to set on all points matching filters")
+    updates: List[PointPayloadUpdate] = Field(default_factory=list, description="Per-point payload updates")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "filters": {"department": "IT"},
+                "payload": {"department": "Information Technology"},
+            }
+        }
+
 async def generate_embeddings_task(document_id: int, db: AsyncSession):
     """
     Background task to generate embeddings for a document
@@ -184,11 +219,11 @@ async def process_document_embeddings(
 async def search_similar_chunks(
     query: str,
     limit: int = 5,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    retrieval_service: RetrievalService = Depends(get_retrieval_service),
 ) -> List[Dict[str, Any]]:
     """Search for similar chunks using a text query"""
     try:
-        retrieval_service = RetrievalService()
         results = await retrieval_service.search_similar_chunks(
             query_text=query,
             limit=limit
@@ -201,11 +236,11 @@ async def search_similar_chunks(
 @router.post("/search")
 async def search_similar_chunks_post(
     query: SearchQuery,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    retrieval_service: RetrievalService = Depends(get_retrieval_service),
 ) -> List[Dict[str, Any]]:
     """Search for similar chunks using a text query (POST method)"""
     try:
-        retrieval_service = RetrievalService()
         results = await retrieval_service.search_similar_chunks(
             query_text=query.query,
             limit=query.limit
@@ -214,3 +249,177 @@ async def search_similar_chunks_post(
     except Exception as e:
         logger.error(f"Error in similarity search: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+def _validate_payload_update(request: PayloadUpdateRequest):
+    """Reject updates that would break retrieval or leave Postgres and the vector store apart"""
+    if not request.updates and not (request.filters and request.payload):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide 'filters' together with 'payload', or a list of 'updates'"
+        )
+    payloads = [request.payload or {}] + [update.payload for update in request.updates]
+    protected = sorted({field for payload in payloads for field in payload if field in REQUIRED_PAYLOAD_FIELDS})
+    if protected:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Payload fields {protected} identify chunks and cannot be updated"
+        )
+    per_point_document_fields = sorted({
+        field for update in request.updates for field in update.payload if field in DOCUMENT_PAYLOAD_FIELDS
+    })
+    if per_point_document_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Document fields {per_point_document_fields} apply to whole documents; "
+                   f"update them with 'filters' and 'payload'"
+        )
+    for field in DOCUMENT_PAYLOAD_FIELDS:
+        value = (request.payload or {}).get(field, "")
+        if field in (request.payload or {}) and (not isinstance(value, str) or not value):
+            raise HTTPException(status_code=400, detail=f"'{field}' must be a non-empty string")
+
+@router.patch("/payloads")
+async def update_payloads(
+    request: PayloadUpdateRequest,
+    db: AsyncSession = Depends(get_async_db),
+    retrieval_service: RetrievalService = Depends(get_retrieval_service),
+) -> Dict[str, Any]:
+    """
+    Correct chunk metadata without re-embedding.
+    A filter with one payload (e.g. renaming a department) is applied in a single request.
+    Document fields in it (division, department, document_name) are also written to the
+    matching documents rows, in the same transaction, so re-embedding and re-ingestion
+    keep the correction. Per-point updates are grouped by identical payload and sent in
+    batches; they change the vector store only and cannot touch document fields.
+    Chunk identifiers (uuid, chunk_id, document_id) cannot be updated.
+    """
+    _validate_payload_update(request)
+    try:
+        result = {"updated_points": 0, "operations": 0, "updated_documents": 0}
+        if request.filters and request.payload:
+            document_values = {
+                DOCUMENT_PAYLOAD_FIELDS[field]: value
+                for field, value in request.payload.items()
+                if field in DOCUMENT_PAYLOAD_FIELDS
+            }
+            if document_values:
+                # Committed only once the vector store accepted the same update
+                result["updated_documents"] = await DocumentController(db).update_documents_by_filter(
+                    request.filters, document_values
+                )
+            await retrieval_service.update_payloads_by_filter(
+                filters=request.filters,
+                payload=request.payload,
+            )
+            await db.commit()
+            result["operations"] += 1
+        if request.updates:
+            batch_result = await retrieval_service.update_payloads(
+                ids=[retrieval_service.point_id_for(update.chunk_uuid) for update in request.updates],
+                payloads=[update.payload for update in request.updates],
+            )
+            result["updated_points"] += batch_result["updated_points"]
+            result["operations"] += batch_result["operations"]
+        return result
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error updating payloads: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/collection/config")
+async def apply_collection_config(
+    vector_store: BaseVectorStore = Depends(get_vector_store),
+) -> Dict[str, Any]:
+    """
+    Apply the configured quantization, on-disk vector and HNSW settings to the served
+    collection. Qdrant re-optimizes segments in the background while searches continue.
+    """
+    try:
+        return await vector_store.apply_collection_config()
+    except (ValueError, NotImplementedError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error applying collection config: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cache/stats")
+async def get_embedding_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the shared embedding cache"""
+    cache = get_embedding_cache()
+    if not cache:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+async def reembed_task(request: ReembedRequest):
+    """
+    Background task filling a shadow collection; uses its own session since it outlives the request
+    """
+    async with AsyncSessionLocal() as session:
+        service = ReembeddingService(
+            db_session=session,
+            embedding_model=request.embedding_model,
+            vector_size=request.vector_size,
+            provider_name=request.provider,
+        )
+        try:
+            await service.run(activate=request.activate)
+        finally:
+            await service.close()
+
+
+@router.post("/reembed")
+async def start_reembedding(request: ReembedRequest):
+    """
+    Re-embed all chunks with a new model into a model-versioned shadow collection.
+    Search keeps using the current collection until the job swaps the alias.
+    Interrupted jobs resume from their checkpoint when started again.
+    """
+    settings = get_vector_store_settings()
+    if settings.VECTOR_STORE_BACKEND.lower() != "qdrant":
+        raise HTTPException(
+            status_code=400,
+            detail="Re-embedding swaps Qdrant collection aliases and requires VECTOR_STORE_BACKEND=qdrant"
+        )
+
+    target = versioned_collection_name(
+        settings.QDRANT_COLLECTION,
+        request.embedding_model,
+        request.vector_size,
+    )
+
+    running = _reembed_jobs.get(target)
+    if running and not running.done():
+        raise HTTPException(
+            status_code=409,
+            detail=f"Re-embedding into {target} is already running"
+        )
+
+    _reembed_jobs[target] = asyncio.create_task(reembed_task(request))
+    return {
+        "message": f"Re-embedding started into {target}",
+        "target_collection": target,
+        "resumed_from": next(
+            (job for job in list_reembed_checkpoints() if job.get("target_collection") == target),
+            None,
+        ),
+    }
+
+
+@router.get("/reembed/status")
+async def get_reembedding_status(
+    vector_store: BaseVectorStore = Depends(get_vector_store),
+) -> Dict[str, Any]:
+    """Progress of all re-embedding jobs and the collection currently served"""
+    try:
+        active_collection = await vector_store.get_alias_target()
+    except Exception as e:
+        logger.error(f"Failed to resolve active collection: {str(e)}")
+        active_collection = None
+    return {
+        "active_collection": active_collection,
+        "jobs": list_reembed_checkpoints(),
+    }
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from app.core.database import get_async_db
+from app.services.container import get_generation_service
 from app.services.generation import GenerationService
 from app.utils.logging_setup import create_logger
 from app.models.schemas.requests import GenerationRequest
@@ -48,7 +49,10 @@ class GenerationResponse(BaseModel):
     summary="Generate LLM Response (SSE)",
     description="Generate a response using RAG (Retrieval Augmented Generation) with optional filtering",
 )
-async def generate_response(request: GenerationRequest):
+async def generate_response(
+    request: GenerationRequest,
+    generation_service: GenerationService = Depends(get_generation_service),
+):
     """
     Generate a response using RAG (Retrieval Augmented Generation)
 
@@ -63,7 +67,6 @@ async def generate_response(request: GenerationRequest):
     """
 
     async def event_generator():
-        generation_service = GenerationService()
         import json
 
         async for chunk in generation_service.generate_response_stream(
@@ -73,6 +76,7 @@ async def generate_response(request: GenerationRequest):
             temperature=request.temperature,
             min_score=request.min_score,
             filters=request.filters,
+            search_profile=request.search_profile,
         ):
             # chunk is a dict with type and content/contexts/query
             yield f"data: {json.dumps(chunk)}\n\n"
@@ -1,12 +1,13 @@
 from pydantic import BaseModel
 from datetime import date
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_async_db
-from app.models.schemas.requests import RetrievalRequest, DocumentFilter
-from app.services.retrieval import RetrievalService, get_retrieval_service
-from app.models.schemas.search_response import SearchResponse, SearchResultItem, ChunkMetadata
+from app.models.schemas.requests import RetrievalRequest, BatchRetrievalRequest, DocumentFilter
+from app.services.container import get_retrieval_service
+from app.services.retrieval import RetrievalService, SearchPage, get_query_embedding_cache
+from app.models.schemas.search_response import SearchResponse, BatchSearchResponse, SearchResultItem, ChunkMetadata
 
 router = APIRouter()
 
@@ -14,72 +15,100 @@ router = APIRouter()
 @router.post("/search", response_model=SearchResponse)
 async def search_similar(
     request: RetrievalRequest,
+    retrieval_service: RetrievalService = Depends(get_retrieval_service),
 ) -> SearchResponse:
     """
-    Search for similar documents using vector similarity search
+    Search for similar documents using vector similarity search.
+    Pages are fetched server-side; pass next_cursor back as cursor for the next page.
     """
     try:
-        retrieval_service: RetrievalService = get_retrieval_service()
-
-        results = await retrieval_service.retrieve_similar(
-            query=request.query,
-            limit=request.limit,
-            filters=request.filters
-        )
+        page = await retrieval_service.retrieve_page(request)
+        return _build_search_response(request, page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Filter by minimum score and apply offset/limit
-        filtered_results = [
-            r for r in results if r.score >= request.min_score]
-        paginated_results = filtered_results[request.offset:request.offset + request.limit]
 
-        search_items = []
-        for result in paginated_results:
-            metadata = result.payload
-            search_items.append(SearchResultItem(
-                score=result.score,
-                content=result.content,
-                metadata=ChunkMetadata(
-                    chunk_id=metadata.get("chunk_id"),
-                    document_id=metadata.get("document_id"),
-                    document_page=metadata.get("document_page"),
-                    uuid=metadata.get("uuid"),
-                    document_type=metadata.get("document_type"),
-                    department=metadata.get("department"),
-                    division=metadata.get("division"),
-                    document_nature=metadata.get("document_nature"),
-                    created_at=metadata.get("created_at")
-                ),
-                extra_info=metadata.get("chunk_metadata", {})
-            ))
-            
-        search_response = SearchResponse(
-            results=search_items,
-            query=request.query,
-            total_results=len(filtered_results)
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_similar_batch(
+    request: BatchRetrievalRequest,
+    retrieval_service: RetrievalService = Depends(get_retrieval_service),
+) -> BatchSearchResponse:
+    """
+    Search for several queries at once: all queries are embedded in one provider call
+    and searched in one vector store request, keeping per-query filters and limits
+    """
+    try:
+        pages = await retrieval_service.retrieve_similar_batch(request.queries)
+        return BatchSearchResponse(
+            responses=[
+                _build_search_response(query_request, page)
+                for query_request, page in zip(request.queries, pages)
+            ]
         )
-
-        return search_response
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _build_search_response(request: RetrievalRequest, page: SearchPage) -> SearchResponse:
+    search_items = []
+    for result in page.results:
+        metadata = result.payload
+        search_items.append(SearchResultItem(
+            score=result.score,
+            content=result.content,
+            metadata=ChunkMetadata(
+                chunk_id=metadata.get("chunk_id"),
+                document_id=metadata.get("document_id"),
+                document_page=metadata.get("document_page"),
+                uuid=metadata.get("uuid"),
+                document_type=metadata.get("document_type"),
+                department=metadata.get("department"),
+                division=metadata.get("division"),
+                document_nature=metadata.get("document_nature"),
+                created_at=metadata.get("created_at")
+            ),
+            extra_info=metadata.get("chunk_metadata", {})
+        ))
+
+    return SearchResponse(
+        results=search_items,
+        query=request.query,
+        total_results=page.total_results,
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get("/query-cache/stats")
+async def get_query_cache_stats() -> Dict[str, Any]:
+    """
+    Hit rate and size of the query embedding cache
+    """
+    return get_query_embedding_cache().stats()
+
+
 @router.post("/store")
 async def store_embeddings(
     texts: List[str],
     metadata: List[Dict[str, Any]],
-    ids: Optional[List[str]] = None,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    retrieval_service: RetrievalService = Depends(get_retrieval_service),
 ):
     """
-    Store embeddings for a list of texts with associated metadata
+    Store embeddings for a list of texts with associated metadata.
+    Every metadata item needs the chunk "uuid"; point ids are derived from it, so
+    re-sending the same chunks overwrites their points instead of duplicating them.
     """
     try:
-        retrieval_service = RetrievalService()
         await retrieval_service.store_embeddings(
             texts=texts,
             metadata=metadata,
-            ids=ids
         )
         return {"message": "Embeddings stored successfully"}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,6 +1,6 @@
 import uuid
 from typing import List, Optional, Dict, Any
-from sqlalchemy import select, func, and_, delete
+from sqlalchemy import select, func, and_, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.database import DocumentChunk, Document
 from app.infrastructure.ingest.docling import DoclingChunking
@@ -9,6 +9,9 @@ from app.utils.logging_setup import create_logger
 
 logger = create_logger(__name__)
 
+# Rows per multi-row INSERT; 5 bound columns each stays far below asyncpg's 32767 parameter limit
+BULK_INSERT_BATCH_SIZE = 1000
+
 
 class DocumentChunkController:
     """
@@ -30,12 +33,15 @@ class DocumentChunkController:
     async def create_chunks_from_document_file(self, document: Document, file_path: str) -> List[DocumentChunk]:
         """Create chunks from a document file using the chunking service"""
         try:
-            chunks = self.chunker.chunk_pdf_document(file_path, document.id)
-            
-            # Store chunks in database
-            for chunk in chunks:
-                self.db_session.add(chunk)
+            # Imported here: the service container depends on this controller
+            from app.services.container import get_service_container
+
+            chunks = await get_service_container().conversion_pool.chunk_document(
+                file_path, document.id
+            )
             
+            # Store chunks in database, in one transaction
+            await self.bulk_insert_chunks(chunks)
             await self.db_session.commit()
             logger.info(f"Created {len(chunks)} chunks for document {document.id}")
             return chunks
@@ -44,6 +50,49 @@ class DocumentChunkController:
             await self.db_session.rollback()
             raise
 
+    async def bulk_insert_chunks(
+        self, chunks: List[DocumentChunk], batch_size: int = BULK_INSERT_BATCH_SIZE
+    ) -> List[int]:
+        """
+        Insert new chunks with multi-row INSERT ... RETURNING id statements, one per
+        batch_size chunks, and set their ids. Does not commit, so callers control the
+        transaction. Falls back to session.add_all when the database cannot return ids
+        from multi-row inserts in order.
+        """
+        if not chunks:
+            return []
+        try:
+            dialect = self.db_session.get_bind().dialect
+            if not dialect.insert_executemany_returning_sort_by_parameter_order:
+                self.db_session.add_all(chunks)
+                await self.db_session.flush()
+                return [chunk.id for chunk in chunks]
+
+            ids = []
+            for i in range(0, len(chunks), batch_size):
+                batch = chunks[i : i + batch_size]
+                result = await self.db_session.execute(
+                    insert(DocumentChunk).returning(DocumentChunk.id, sort_by_parameter_order=True),
+                    [
+                        {
+                            "uuid": chunk.uuid,
+                            "document_id": chunk.document_id,
+                            "content": chunk.content,
+                            "document_page": chunk.document_page,
+                            "chunk_metadata": chunk.chunk_metadata,
+                        }
+                        for chunk in batch
+                    ],
+                )
+                batch_ids = result.scalars().all()
+                for chunk, chunk_id in zip(batch, batch_ids):
+                    chunk.id = chunk_id
+                ids.extend(batch_ids)
+            return ids
+        except Exception as e:
+            logger.error(f"Error bulk inserting {len(chunks)} chunks: {str(e)}")
+            raise
+
     async def get_chunk_by_id(self, chunk_id: int) -> Optional[DocumentChunk]:
         """Retrieve a chunk by ID"""
         try:
@@ -186,6 +235,42 @@ class DocumentChunkController:
             logger.error(f"Error getting chunks with document info: {str(e)}")
             raise
 
+    async def list_chunks_with_documents_after(self, last_chunk_id: int,
+                                               limit: int = 100) -> List[tuple]:
+        """List (chunk, document) pairs with ids above last_chunk_id, ordered by chunk id"""
+        try:
+            query = select(DocumentChunk, Document).join(
+                Document, DocumentChunk.document_id == Document.id
+            ).where(DocumentChunk.id > last_chunk_id).order_by(DocumentChunk.id).limit(limit)
+
+            result = await self.db_session.execute(query)
+            return result.all()
+        except Exception as e:
+            logger.error(f"Error listing chunks after {last_chunk_id}: {str(e)}")
+            raise
+
+    async def get_chunk_contents(self, chunk_ids: List[int]) -> List[tuple]:
+        """Fetch (id, content, chunk_metadata) rows for the given chunk ids in one query"""
+        try:
+            query = select(
+                DocumentChunk.id, DocumentChunk.content, DocumentChunk.chunk_metadata
+            ).where(DocumentChunk.id.in_(chunk_ids))
+
+            result = await self.db_session.execute(query)
+            return result.all()
+        except Exception as e:
+            logger.error(f"Error getting chunk contents: {str(e)}")
+            raise
+
+    async def count_chunks(self) -> int:
+        """Count all chunks"""
+        try:
+            result = await self.db_session.execute(select(func.count(DocumentChunk.id)))
+            return result.scalar()
+        except Exception as e:
+            logger.error(f"Error counting chunks: {str(e)}")
+            raise
+
     async def get_chunk_stats(self) -> Dict[str, Any]:
         """Get statistics about chunks"""
         try:
@@ -1,8 +1,9 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.database import Document
 from app.models.enums import DocumentStatus
+from app.models.schemas.requests import DocumentFilter
 from app.utils.logging_setup import create_logger
 
 logger = create_logger(__name__)
@@ -101,6 +102,42 @@ class DocumentController:
             await self.db_session.rollback()
             raise
 
+    async def update_documents_by_filter(
+        self, filters: DocumentFilter, values: Dict[str, Any]
+    ) -> int:
+        """
+        Set column values on the documents matching filters, matched the way vector store
+        filters match payloads. Does not commit, so the caller can pair it with the
+        vector store update in one transaction. Returns the number of documents updated.
+        """
+        try:
+            conditions = []
+            for field, column in (
+                ("division", Document.division),
+                ("department", Document.department),
+                ("document_name", Document.title),
+                ("document_id", Document.id),
+            ):
+                value = getattr(filters, field, None)
+                if not value:
+                    continue
+                values_list = value if isinstance(value, list) else [value]
+                if field == "document_id":
+                    conditions.append(column.in_([int(v) for v in values_list]))
+                else:
+                    conditions.append(column.in_([str(v).lower() for v in values_list]))
+            if not conditions:
+                raise ValueError("A non-empty filter is required to update documents")
+
+            result = await self.db_session.execute(
+                update(Document).where(and_(*conditions)).values(**values)
+            )
+            logger.info(f"Updated {values} on {result.rowcount} documents")
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Error updating documents by filter: {str(e)}")
+            raise
+
     async def delete_document(self, document_id: int) -> bool:
         """Delete a document and its chunks"""
         try:
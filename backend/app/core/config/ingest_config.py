@@ -0,0 +1,28 @@
+from pydantic import ConfigDict, Field
+from pydantic_settings import BaseSettings
+
+
+class IngestSettings(BaseSettings):
+    model_config: ConfigDict = {
+        "env_file": ".env",
+        "env_file_encoding": "utf-8",
+        "extra": "ignore",
+    }
+
+    INGEST_PROCESS_POOL_ENABLED: bool = Field(True, description="Convert and chunk documents in a worker process pool instead of the API process")
+    INGEST_WORKERS: int = Field(2, description="Conversion worker processes, each holding a loaded Docling converter", ge=1)
+    INGEST_WORKER_MEMORY_LIMIT_MB: int = Field(0, description="Address space limit per conversion worker in MB (0: no limit)", ge=0)
+    INGEST_WORKER_MAX_TASKS: int = Field(200, description="Conversion tasks (whole documents or page shards of streamed PDFs) a worker runs before it is replaced, releasing leaked memory (0: never)", ge=0)
+    INGEST_PREWARM_WORKERS: bool = Field(False, description="Start conversion workers and load their models at application startup")
+    INGEST_STREAMING_ENABLED: bool = Field(True, description="Convert large PDFs page window by page window, persisting chunks as each window is ready")
+    INGEST_STREAMING_WINDOW_PAGES: int = Field(20, description="Pages per shard of a streamed PDF; bounds conversion memory", ge=1)
+    INGEST_SHARDS_IN_FLIGHT: int = Field(0, description="Page shards of one document converted in parallel (0: one per worker)", ge=0)
+    CONVERSION_CACHE_ENABLED: bool = Field(True, description="Cache converted documents on disk, keyed by file content, Docling version and pipeline options")
+    CONVERSION_CACHE_DIR: str = Field("_development/temp/conversion_cache", description="Directory of the conversion cache, shared by all workers")
+    CONVERSION_CACHE_MAX_SIZE_MB: int = Field(2048, description="Conversion cache size above which least recently used entries are evicted", ge=1)
+    CONVERSION_CACHE_MAX_AGE_DAYS: float = Field(30, description="Conversion cache entries unused for longer than this are evicted", gt=0)
+
+
+def get_ingest_settings():
+    """Get ingest settings. Reads from .env file each time."""
+    return IngestSettings()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import ConfigDict, Field
 from pydantic_settings import BaseSettings
 
@@ -9,14 +11,64 @@ class VectorStoreSettings(BaseSettings):
         "extra": "ignore",
     }
 
+    VECTOR_STORE_BACKEND: str = Field("qdrant", description="Vector store: 'qdrant' or 'numpy' (in-process brute force, for tests and small deployments)")
+    NUMPY_STORE_DIR: str = Field("_development/vector_store", description="Data directory of the NumPy vector store")
     QDRANT_HOST: str = Field("localhost", description="QDrant server host")
     QDRANT_PORT: int = Field(6333, description="QDrant server port")
     QDRANT_COLLECTION: str = Field("rag_mvp", description="QDrant collection name")
+    QDRANT_GRPC_PORT: int = Field(6334, description="QDrant gRPC port, used for bulk ingestion")
+    QDRANT_BULK_BATCH_SIZE: int = Field(256, description="Points per upsert request in bulk ingestion")
+    QDRANT_BULK_PARALLELISM: int = Field(4, description="Concurrent in-flight upsert requests in bulk ingestion")
+    QDRANT_PAYLOAD_BATCH_SIZE: int = Field(1000, description="Maximum point ids per set-payload operation in bulk payload updates")
     OLLAMA_BASE_URL: str = Field("http://ollama:11434", description="Ollama API base URL")
     OLLAMA_CHAT_MODEL: str = Field("qwen2.5:0.5b", description="Ollama chat model to use")
     OLLAMA_EMBEDDING_MODEL: str = Field("nomic-embed-text:latest", description="Ollama embedding model to use")
+    EMBEDDING_PROVIDER: str = Field("ollama", description="Embedding provider: 'ollama' or 'local' (in-process ONNX model)")
+    LOCAL_EMBEDDING_MODEL: str = Field("nomic-ai/nomic-embed-text-v1.5", description="fastembed model used by the local embedding provider")
+    LOCAL_EMBEDDING_CACHE_DIR: str = Field("_development/models/fastembed", description="Download directory for local embedding models")
+    LOCAL_EMBEDDING_THREADS: Optional[int] = Field(None, description="ONNX Runtime threads per inference (default: all cores)")
+    LOCAL_EMBEDDING_WORKERS: int = Field(2, description="Thread pool size for concurrent local embedding calls")
+    LOCAL_EMBEDDING_BATCH_SIZE: int = Field(32, description="Inference batch size of the local embedding model")
+    QDRANT_QUANTIZATION: str = Field("none", description="Vector quantization: 'none', 'scalar' (int8) or 'binary'")
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = Field(True, description="Keep quantized vectors in RAM")
+    QDRANT_ON_DISK_VECTORS: bool = Field(False, description="Keep original float32 vectors on disk (memmap) instead of RAM")
+    QDRANT_HNSW_M: int = Field(16, description="HNSW graph edges per node")
+    QDRANT_HNSW_EF_CONSTRUCT: int = Field(100, description="HNSW candidate list size during index build")
+    QDRANT_SEARCH_HNSW_EF: Optional[int] = Field(None, description="HNSW candidate list size at query time (default: Qdrant's)")
+    QDRANT_SEARCH_RESCORE: bool = Field(True, description="Rescore quantized candidates with the original vectors")
+    QDRANT_SEARCH_OVERSAMPLING: float = Field(2.0, description="Candidates fetched per requested result when searching quantized vectors")
+    QDRANT_FAST_SEARCH_HNSW_EF: int = Field(16, description="HNSW ef of the 'fast' search profile")
+    QDRANT_EXACT_SEARCH_THRESHOLD: int = Field(5000, description="Filtered searches matching at most this many points use exact search automatically")
+    QDRANT_LEAN_PAYLOADS: bool = Field(False, description="Store only filterable fields and ids in Qdrant; chunk content is hydrated from Postgres at search time")
+    CHUNK_CONTENT_CACHE_SIZE: int = Field(5000, description="Number of chunk contents kept in memory for hydrating lean search results")
     VECTOR_SIZE: int = Field(768, description="Size of embedding vectors")
     MIN_SIMILARITY_SCORE: float = Field(0.6, description="Minimum similarity score threshold for including results")
+    EMBEDDING_CACHE_ENABLED: bool = Field(True, description="Cache embeddings by (model, normalized text hash)")
+    EMBEDDING_CACHE_DIR: str = Field("_development/temp/embedding_cache", description="Directory for the on-disk embedding cache")
+    EMBEDDING_CACHE_MEMORY_SIZE: int = Field(10000, description="Number of embeddings kept in the in-process LRU tier")
+    QUERY_EMBEDDING_CACHE_SIZE: int = Field(1024, description="Number of query embeddings kept in memory")
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: float = Field(600.0, description="Time-to-live of cached query embeddings")
+    EMBEDDING_SCHEDULER_ENABLED: bool = Field(True, description="Coalesce concurrent embedding requests into shared provider calls")
+    EMBEDDING_BATCH_WINDOW_MS: float = Field(10.0, description="Time window for coalescing concurrent embedding requests")
+    EMBEDDING_BATCH_MAX_SIZE: int = Field(64, description="Maximum number of texts per coalesced embedding call")
+    EMBEDDING_MAX_IN_FLIGHT_BATCHES: int = Field(2, description="Maximum concurrent embedding calls to the provider")
+    EMBEDDING_BATCH_TOKEN_BUDGET: int = Field(4096, description="Token budget per document embedding batch (chunk tokenizer tokens)")
+    EMBEDDING_BATCH_MAX_CHUNKS: int = Field(64, description="Upper bound on chunks per document embedding batch")
+    EMBEDDING_PIPELINE_DEPTH: int = Field(2, description="Batches buffered between the embed, upsert and status-update stages")
+    OLLAMA_MAX_CONNECTIONS: int = Field(20, description="Connection pool size of the shared Ollama HTTP client")
+    OLLAMA_MAX_KEEPALIVE_CONNECTIONS: int = Field(10, description="Idle keep-alive connections kept open to Ollama")
+    OLLAMA_EMBEDDING_TIMEOUT: float = Field(120.0, description="Timeout in seconds for one Ollama embed call")
+    REEMBED_BATCH_SIZE: int = Field(64, description="Chunks per batch when re-embedding into a shadow collection")
+    REEMBED_THROTTLE_SECONDS: float = Field(0.5, description="Pause between re-embedding batches to leave room for live queries")
+    REEMBED_CHECKPOINT_DIR: str = Field("_development/temp/reembed", description="Directory for resumable re-embedding checkpoints; must be shared by all API workers, which read the model of the served collection from it")
+    SERVED_MODEL_CHECK_SECONDS: float = Field(5.0, description="How often each worker checks the served alias and switches to the embedding model of the collection it points at", ge=0)
+
+    @property
+    def EMBEDDING_MODEL(self) -> str:
+        """Embedding model of the configured provider"""
+        if self.EMBEDDING_PROVIDER.lower() == "local":
+            return self.LOCAL_EMBEDDING_MODEL
+        return self.OLLAMA_EMBEDDING_MODEL
 
 
 def get_vector_store_settings():
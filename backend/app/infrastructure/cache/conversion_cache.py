@@ -0,0 +1,182 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Optional, Tuple
+
+from docling_core.types.doc.document import DoclingDocument
+
+from app.core.config.ingest_config import get_ingest_settings
+from app.utils.logging_setup import create_logger
+
+logger = create_logger(__name__)
+
+CACHE_SUFFIX = ".json.gz"
+# Temp files older than this were left behind by a crashed writer
+STALE_TEMP_SECONDS = 3600
+# Minimum time between eviction sweeps of one process, unless writes outgrow EVICT_WRITE_FRACTION
+EVICT_INTERVAL_SECONDS = 60
+# Share of max_size_bytes written since the last sweep that triggers the next one early
+EVICT_WRITE_FRACTION = 0.1
+
+
+def file_sha256(file_path: str) -> str:
+    """SHA-256 of a file's content, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def docling_version() -> str:
+    """Versions of the packages that determine conversion output"""
+    versions = []
+    for package in ("docling", "docling-core", "docling-parse", "docling-ibm-models"):
+        try:
+            versions.append(f"{package}={version(package)}")
+        except PackageNotFoundError:
+            continue
+    return ",".join(versions)
+
+
+def make_conversion_key(
+    file_digest: str, pipeline_fingerprint: str, page_range: Optional[Tuple[int, int]] = None
+) -> str:
+    """
+    Content-addressed key of one conversion, from the file_sha256 digest of the source file.
+    Stable across processes and restarts, and changes whenever the file, the Docling version
+    or the pipeline options change. Shards of one document share the digest, hashed once.
+    """
+    parts = [file_digest, docling_version(), pipeline_fingerprint]
+    if page_range:
+        parts.append(f"pages={page_range[0]}-{page_range[1]}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class ConversionCache:
+    """
+    Disk cache of converted DoclingDocuments, stored as gzipped Docling JSON.
+    Entries are written to a temp file and renamed into place, so concurrent writers in
+    different worker processes never expose partial files. Hits refresh an entry's mtime;
+    entries unused for max_age_seconds, then the least recently used beyond max_size_bytes,
+    are evicted by a directory sweep. Writes trigger a sweep at most every
+    evict_interval_seconds, or earlier once they add a tenth of max_size_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size_mb: int = 2048,
+        max_age_days: float = 30,
+        evict_interval_seconds: float = EVICT_INTERVAL_SECONDS,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.max_age_seconds = max_age_days * 24 * 3600
+        self.evict_interval_seconds = evict_interval_seconds
+        self._last_evict: Optional[float] = None
+        self._written_since_evict = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, key: str) -> Optional[DoclingDocument]:
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                document = DoclingDocument.model_validate(json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to load {path.name} from conversion cache, will reconvert: {e}")
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # Evicted by another process meanwhile
+        logger.info(f"Loaded converted document from cache: {path.name}")
+        return document
+
+    def set(self, key: str, document: DoclingDocument) -> None:
+        try:
+            fd, temp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{key}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8", compresslevel=6) as f:
+                    json.dump(document.export_to_dict(), f)
+                os.replace(temp_name, self._path(key))
+            except BaseException:
+                Path(temp_name).unlink(missing_ok=True)
+                raise
+            written = self._path(key).stat().st_size
+            logger.info(f"Cached converted document: {self._path(key).name}")
+        except Exception as e:
+            logger.warning(f"Failed to cache converted document: {e}")
+            return
+        self._written_since_evict += written
+        if self._evict_due():
+            self.evict()
+
+    def _evict_due(self) -> bool:
+        if self._last_evict is None:
+            return True
+        if time.monotonic() - self._last_evict >= self.evict_interval_seconds:
+            return True
+        return self._written_since_evict >= self.max_size_bytes * EVICT_WRITE_FRACTION
+
+    def evict(self) -> int:
+        """Remove expired entries, then the least recently used above the size limit"""
+        self._last_evict = time.monotonic()
+        self._written_since_evict = 0
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.cache_dir.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Removed by another process
+            if path.name.endswith(".tmp"):
+                if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                    path.unlink(missing_ok=True)
+                continue
+            if not path.name.endswith(CACHE_SUFFIX):
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} conversion cache entries")
+        return removed
+
+
+@lru_cache(maxsize=1)
+def get_conversion_cache() -> Optional[ConversionCache]:
+    """
+    Get the conversion cache of this process, or None if caching is disabled
+    """
+    settings = get_ingest_settings()
+    if not settings.CONVERSION_CACHE_ENABLED:
+        return None
+    return ConversionCache(
+        cache_dir=settings.CONVERSION_CACHE_DIR,
+        max_size_mb=settings.CONVERSION_CACHE_MAX_SIZE_MB,
+        max_age_days=settings.CONVERSION_CACHE_MAX_AGE_DAYS,
+    )
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from app.core.config.vector_store import get_vector_store_settings
+from app.utils.logging_setup import create_logger
+from app.utils.memory_cache import LRUCache
+
+logger = create_logger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing so trivially different copies share a key"""
+    normalized = unicodedata.normalize("NFC", text)
+    return " ".join(normalized.split())
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """Build the content-addressed key for an (embedding model, text) pair"""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: an in-process LRU in front of a local SQLite store.
+    Keys are (embedding model, sha256 of normalized text), so identical chunks
+    across documents and re-embedding runs only hit the provider once.
+    """
+
+    def __init__(self, cache_dir: str, memory_size: int = 10000):
+        self.memory = LRUCache(maxsize=memory_size)
+        self.db_path = Path(cache_dir) / "embeddings.sqlite3"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _read_disk(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    # Read-only float32 view over the blob, no per-element conversion
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def _write_disk(self, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [
+                    (key, np.asarray(vector, dtype=np.float32).tobytes())
+                    for key, vector in items.items()
+                ],
+            )
+            self._conn.commit()
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Look up keys in memory first, then on disk. Returns only the hits."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        missing = []
+        for key in keys:
+            vector = self.memory.get(key)
+            if vector is None:
+                missing.append(key)
+            else:
+                found[key] = vector
+
+        if missing:
+            try:
+                disk_found = await asyncio.to_thread(self._read_disk, missing)
+            except Exception as e:
+                logger.warning(f"Embedding cache read failed, treating as misses: {e}")
+                disk_found = {}
+
+            for key, vector in disk_found.items():
+                self.memory.set(key, vector)
+                found[key] = vector
+            self.disk_hits += len(disk_found)
+            self.misses += len(missing) - len(disk_found)
+
+        return found
+
+    async def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store vectors in both tiers"""
+        if not items:
+            return
+        for key, vector in items.items():
+            self.memory.set(key, vector)
+        try:
+            await asyncio.to_thread(self._write_disk, items)
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters across both tiers"""
+        memory_stats = self.memory.stats()
+        return {
+            "memory_hits": memory_stats["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_size": memory_stats["size"],
+        }
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Get the shared embedding cache, or None if caching is disabled
+    """
+    settings = get_vector_store_settings()
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return None
+    return EmbeddingCache(
+        cache_dir=settings.EMBEDDING_CACHE_DIR,
+        memory_size=settings.EMBEDDING_CACHE_MEMORY_SIZE,
+    )
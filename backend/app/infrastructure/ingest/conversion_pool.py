@@ -0,0 +1,269 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; workers then run without a memory limit
+    resource = None
+
+from docling.datamodel.base_models import InputFormat
+
+from app.core.config.ingest_config import get_ingest_settings
+from app.infrastructure.cache.conversion_cache import file_sha256
+from app.infrastructure.ingest.docling import MAX_WHOLE_DOCUMENT_SIZE, DoclingChunking, ShardMerger
+from app.models.database.chunk import DocumentChunk
+from app.utils.logging_setup import create_logger
+
+logger = create_logger(__name__)
+
+# (uuid, content, page number, chunk metadata as JSON). One string per chunk pickles much
+# smaller and faster across the process boundary than ORM objects or nested metadata dicts.
+SerializedChunk = Tuple[str, str, Optional[int], str]
+# Chunks of one page shard with the item counts ShardMerger needs
+SerializedShard = Tuple[List[SerializedChunk], Dict[str, int]]
+
+# Converter and chunker of the current worker process, loaded once by _init_worker
+_worker_chunking: Optional[DoclingChunking] = None
+
+
+def serialize_chunks(chunks: List[DocumentChunk]) -> List[SerializedChunk]:
+    return [
+        (chunk.uuid, chunk.content, chunk.document_page, json.dumps(chunk.chunk_metadata))
+        for chunk in chunks
+    ]
+
+
+def deserialize_chunks(records: List[SerializedChunk], document_id: int = None) -> List[DocumentChunk]:
+    return [
+        DocumentChunk(
+            uuid=chunk_uuid,
+            content=content,
+            document_id=document_id,
+            document_page=page,
+            chunk_metadata=json.loads(metadata),
+        )
+        for chunk_uuid, content, page, metadata in records
+    ]
+
+
+def _init_worker(memory_limit_mb: int):
+    """Pool initializer: apply the memory limit and load Docling models once per worker"""
+    global _worker_chunking
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    _worker_chunking = DoclingChunking()
+    try:
+        _worker_chunking.document_converter.initialize_pipeline(InputFormat.PDF)
+        _worker_chunking.chunker  # Loads the tokenizer
+        logger.info(f"Conversion worker {os.getpid()} ready")
+    except Exception as e:
+        # A failing initializer breaks the whole pool; let the document that needs the models report it
+        logger.error(f"Conversion worker {os.getpid()} failed to preload models: {str(e)}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _chunk_file(file_path: str) -> List[SerializedChunk]:
+    """Convert and chunk one file inside a worker process"""
+    return serialize_chunks(_worker_chunking.chunk_pdf_document(file_path))
+
+
+def _chunk_shard(
+    file_path: str, start_page: int, end_page: int, file_digest: Optional[str] = None
+) -> SerializedShard:
+    """Convert and chunk one page shard inside a worker process"""
+    chunks, ref_counts = _worker_chunking.chunk_pdf_shard(
+        file_path, start_page, end_page, file_digest=file_digest
+    )
+    return serialize_chunks(chunks), ref_counts
+
+
+class ConversionPool:
+    """
+    Runs Docling conversion and chunking in a pool of warm worker processes, so CPU-heavy
+    layout analysis and OCR never block the API event loop. Each worker keeps its loaded
+    DocumentConverter between tasks and is replaced after INGEST_WORKER_MAX_TASKS tasks,
+    each a whole document or one page shard of a streamed PDF. A worker killed by its memory limit fails the documents in flight and the
+    pool is restarted for the next ones.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        memory_limit_mb: Optional[int] = None,
+        max_tasks_per_worker: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.settings = get_ingest_settings()
+        self.workers = workers or self.settings.INGEST_WORKERS
+        self.memory_limit_mb = (
+            self.settings.INGEST_WORKER_MEMORY_LIMIT_MB if memory_limit_mb is None else memory_limit_mb
+        )
+        self.max_tasks_per_worker = (
+            self.settings.INGEST_WORKER_MAX_TASKS if max_tasks_per_worker is None else max_tasks_per_worker
+        )
+        self.enabled = self.settings.INGEST_PROCESS_POOL_ENABLED if enabled is None else enabled
+        self.window_pages = self.settings.INGEST_STREAMING_WINDOW_PAGES
+        self.shards_in_flight = self.settings.INGEST_SHARDS_IN_FLIGHT or self.workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._local_chunking: Optional[DoclingChunking] = None
+        # DocumentConverter is not thread-safe; serializes conversions without the pool
+        self._local_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            options = {}
+            if self.max_tasks_per_worker:
+                options["max_tasks_per_child"] = self.max_tasks_per_worker
+            # spawn: forking a process that has loaded torch/ONNX models is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb,),
+                **options,
+            )
+            logger.info(
+                f"Started conversion pool with {self.workers} workers "
+                f"(memory limit: {self.memory_limit_mb or 'none'} MB)"
+            )
+        return self._executor
+
+    @property
+    def local_chunking(self) -> DoclingChunking:
+        if self._local_chunking is None:
+            self._local_chunking = DoclingChunking()
+        return self._local_chunking
+
+    async def warm_up(self):
+        """Start all workers and load their models before the first document arrives"""
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *(loop.run_in_executor(self.executor, _ping) for _ in range(self.workers))
+        )
+        logger.info(f"Conversion workers warmed up: {sorted(set(pids))}")
+
+    async def chunk_document(self, file_path: str, document_id: int = None) -> List[DocumentChunk]:
+        """Convert and chunk a PDF without blocking the event loop"""
+        if not self.enabled:
+            # Still off the event loop, but sharing the API process' CPU and memory
+            return await asyncio.to_thread(
+                self._run_local, self.local_chunking.chunk_pdf_document, file_path, document_id
+            )
+
+        records = await self._run(file_path, _chunk_file, file_path)
+        return deserialize_chunks(records, document_id)
+
+    async def streamed_page_count(self, file_path: str) -> Optional[int]:
+        """
+        Page count of a PDF that should be streamed (longer than one window, or too large
+        to convert at once), None when it is converted as a whole
+        """
+        if not self.settings.INGEST_STREAMING_ENABLED or Path(file_path).suffix.lower() != ".pdf":
+            return None
+        page_count = await asyncio.to_thread(DoclingChunking.get_page_count, file_path)
+        if page_count > self.window_pages or Path(file_path).stat().st_size > MAX_WHOLE_DOCUMENT_SIZE:
+            return page_count
+        return None
+
+    async def iter_chunk_batches(
+        self, file_path: str, document_id: int = None
+    ) -> AsyncIterator[List[DocumentChunk]]:
+        """
+        Yield the chunks of a PDF one batch at a time, in document order. Large documents
+        are split into page shards converted in parallel across the pool workers, while
+        the caller persists the batches already merged; small ones arrive as a single batch.
+        """
+        page_count = await self.streamed_page_count(file_path)
+        if page_count is None:
+            chunks = await self.chunk_document(file_path, document_id)
+            if chunks:
+                yield chunks
+            return
+
+        windows = deque(DoclingChunking.page_windows(page_count, self.window_pages))
+        # One shard converting in the API process' thread pool, otherwise one per worker
+        in_flight = self.shards_in_flight if self.enabled else 1
+        # Workers get one shard queued ahead; the local converter is not thread-safe
+        ahead = 1 if self.enabled else 0
+        logger.info(
+            f"Streaming {file_path}: {page_count} pages in {len(windows)} shards "
+            f"of {self.window_pages} pages, {in_flight} converting at a time"
+        )
+        # Conversion cache keys of all shards derive from one hash of the file
+        file_digest = (
+            await asyncio.to_thread(file_sha256, file_path)
+            if self.settings.CONVERSION_CACHE_ENABLED
+            else None
+        )
+        merger = ShardMerger()
+        pending = deque()
+        try:
+            while windows or pending:
+                # Keep the pool busy, one shard ahead of the batch being persisted; at most
+                # in_flight + ahead shards are held in memory
+                while windows and len(pending) < in_flight + ahead:
+                    pending.append(asyncio.ensure_future(
+                        self._chunk_shard(file_path, *windows.popleft(), file_digest=file_digest)
+                    ))
+                records, ref_counts = await pending.popleft()
+                chunks = merger.merge(deserialize_chunks(records, document_id), ref_counts)
+                if chunks:
+                    yield chunks
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _chunk_shard(
+        self, file_path: str, start_page: int, end_page: int, file_digest: Optional[str] = None
+    ) -> SerializedShard:
+        if not self.enabled:
+            chunks, ref_counts = await asyncio.to_thread(
+                self._run_local, self.local_chunking.chunk_pdf_shard,
+                file_path, start_page, end_page, file_digest=file_digest,
+            )
+            return serialize_chunks(chunks), ref_counts
+        return await self._run(file_path, _chunk_shard, file_path, start_page, end_page, file_digest)
+
+    def _run_local(self, fn, *args, **kwargs):
+        """Run fn on the API process' converter, one document or shard at a time"""
+        with self._local_lock:
+            return fn(*args, **kwargs)
+
+    async def _run(self, file_path: str, fn, *args):
+        """Run fn in the pool, restarting the pool if a worker died"""
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool as e:
+            logger.error(f"Conversion worker died while processing {file_path}: {str(e)}")
+            if self._executor is executor:
+                self._reset()
+            raise RuntimeError(
+                f"Conversion worker died while processing {file_path} "
+                f"(memory limit: {self.memory_limit_mb or 'none'} MB)"
+            ) from e
+
+    def _reset(self):
+        """Drop a broken executor; the next document starts a fresh pool"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def close(self):
+        self._reset()
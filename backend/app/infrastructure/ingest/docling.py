@@ -1,19 +1,51 @@
-from typing import List
-import pickle
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 import os
+import re
+import pypdfium2
+from app.infrastructure.cache.conversion_cache import (
+    file_sha256,
+    get_conversion_cache,
+    make_conversion_key,
+)
 from app.models.database.chunk import DocumentChunk
 from app.utils.logging_setup import create_logger
 from .base_chunking import BaseChunking
 from docling.chunking import HybridChunker
+from docling.datamodel.base_models import InputFormat
 from docling.document_converter import DocumentConverter as DoclingDocumentConverter
 import uuid
 from pathlib import Path
-from docling_core.types.doc.document import DoclingDocument
+from docling_core.types.doc.document import DoclingDocument, SectionHeaderItem, TitleItem
 from docling_core.transforms.chunker.base import BaseChunk
+from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
 
 
 logger = create_logger(__name__)
 
+# Tokenizer behind HybridChunker's token limits; shared so other token budgets match chunk sizes
+CHUNK_TOKENIZER_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Chunk size cap. HybridChunker takes it from the tokenizer instance, not its own max_tokens
+CHUNK_MAX_TOKENS = 256
+
+# Whole-document conversion holds the full DoclingDocument in memory; larger files are streamed
+MAX_WHOLE_DOCUMENT_SIZE = 50 * 1024 * 1024  # 50MB
+
+# DoclingDocument item lists referenced by chunk doc_items as "#/<collection>/<index>"
+REF_COLLECTIONS = ("groups", "texts", "pictures", "tables", "key_value_items", "form_items")
+_REF_PATTERN = re.compile(r"^#/(%s)/(\d+)$" % "|".join(REF_COLLECTIONS))
+# Heading levels of a shard chunk's headings, parallel to them; consumed by ShardMerger
+HEADING_LEVELS_KEY = "heading_levels"
+
+
+@lru_cache(maxsize=1)
+def get_chunk_tokenizer() -> HuggingFaceTokenizer:
+    """Get the tokenizer used by the HybridChunker"""
+    return HuggingFaceTokenizer.from_pretrained(
+        model_name=CHUNK_TOKENIZER_MODEL, max_tokens=CHUNK_MAX_TOKENS
+    )
+
+
 class DoclingChunking(BaseChunking):
     """Docling-based document chunking implementation"""
 
@@ -21,9 +53,7 @@ class DoclingChunking(BaseChunking):
         super().__init__()
         self._chunker = None
         self._document_converter = None
-        self.cache_dir = Path("_development/temp/doc_cache")
-        # Create cache directory if it doesn't exist
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.conversion_cache = get_conversion_cache()
 
     @property
     def chunker(self):
@@ -35,14 +65,45 @@ class DoclingChunking(BaseChunking):
         """Create a chunker instance with the specified parameters."""
         # Use smaller token limit and disable memory-intensive features
         return HybridChunker(
-            max_tokens=256,  # Reduced from 400 to 256
+            tokenizer=get_chunk_tokenizer(),  # Caps chunks at CHUNK_MAX_TOKENS
             merge_peers=False,  # Disable merging to reduce memory usage
         )
 
-    def _get_cache_path(self, file_path: str) -> Path:
-        """Get the cache file path for a given document"""
-        file_hash = str(hash(Path(file_path).read_bytes()))
-        return self.cache_dir / f"{Path(file_path).stem}_{file_hash}.pkl"
+    @property
+    def pipeline_fingerprint(self) -> str:
+        """PDF pipeline and its options, the part of the converter config that shapes its output"""
+        options = self.document_converter.format_to_options[InputFormat.PDF]
+        # Accelerator options (threads, device) do not change the result
+        pipeline_options = options.pipeline_options.model_dump_json(exclude={"accelerator_options"})
+        return f"{options.pipeline_cls.__name__}:{options.backend.__name__}:{pipeline_options}"
+
+    def _convert(
+        self,
+        file_path: str,
+        page_range: Optional[Tuple[int, int]] = None,
+        file_digest: Optional[str] = None,
+    ) -> DoclingDocument:
+        """
+        Convert a file or page range, going through the conversion cache when enabled.
+        Pass the file_sha256 digest when the caller already has it, to skip re-hashing the file.
+        """
+        cache_key = None
+        if self.conversion_cache is not None:
+            cache_key = make_conversion_key(
+                file_digest or file_sha256(file_path), self.pipeline_fingerprint, page_range
+            )
+            cached = self.conversion_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if page_range:
+            result = self.document_converter.convert(source=file_path, page_range=page_range)
+        else:
+            result = self.document_converter.convert(source=file_path)
+
+        if cache_key is not None:
+            self.conversion_cache.set(cache_key, result.document)
+        return result.document
 
     @property
     def document_converter(self):
@@ -63,7 +124,7 @@ class DoclingChunking(BaseChunking):
     def read_document(self, file_path: str) -> DoclingDocument:
         """
         Read a PDF document and return its text content.
-        Uses caching to speed up development and includes memory optimizations.
+        Uses the conversion cache and rejects files too large to convert at once.
         """
         try:
             if not Path(file_path).exists():
@@ -71,37 +132,12 @@ class DoclingChunking(BaseChunking):
             
             # Check file size first to prevent memory issues
             file_size = Path(file_path).stat().st_size
-            max_size = 50 * 1024 * 1024  # 50MB limit
+            max_size = MAX_WHOLE_DOCUMENT_SIZE
             if file_size > max_size:
                 raise ValueError(f"File too large ({file_size / 1024 / 1024:.1f}MB). Maximum allowed size is {max_size / 1024 / 1024}MB")
             
-            cache_path = self._get_cache_path(file_path)
-            
-            # Try to load from cache first
-            if cache_path.exists():
-                try:
-                    logger.info(f"Loading document from cache: {cache_path}")
-                    with open(cache_path, 'rb') as f:
-                        return pickle.load(f)
-                except Exception as e:
-                    logger.warning(f"Failed to load from cache, will reprocess: {e}")
-                    # Continue to reprocess if cache is corrupted
-            
-            # If not in cache, convert and store
             logger.info(f"Converting document: {file_path}")
-            document = self.document_converter.convert(source=file_path)
-            result = document.document
-            
-            # Cache the result (with error handling)
-            try:
-                logger.info(f"Caching converted document: {cache_path}")
-                with open(cache_path, 'wb') as f:
-                    pickle.dump(result, f)
-            except Exception as e:
-                logger.warning(f"Failed to cache document: {e}")
-                # Continue without caching
-            
-            return result
+            return self._convert(file_path)
         except FileNotFoundError as e:
             logger.error(f"File not found: {str(e)}")
             raise e
@@ -130,6 +166,69 @@ class DoclingChunking(BaseChunking):
         document = self.read_document(pdf_path)
         return self.chunk_general_document(document, document_id)
 
+    @staticmethod
+    def get_page_count(file_path: str) -> int:
+        """Number of pages of a PDF, read without converting it"""
+        pdf = pypdfium2.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def read_page_range(
+        self, file_path: str, start_page: int, end_page: int, file_digest: Optional[str] = None
+    ) -> DoclingDocument:
+        """
+        Convert only pages start_page..end_page (1-based, inclusive) of a PDF.
+        Provenance page numbers stay those of the full document. No size limit applies,
+        since memory is bounded by the number of pages converted.
+        """
+        try:
+            logger.info(f"Converting pages {start_page}-{end_page} of {file_path}")
+            return self._convert(file_path, page_range=(start_page, end_page), file_digest=file_digest)
+        except Exception as e:
+            logger.error(f"Failed to read pages {start_page}-{end_page} of {file_path}: {str(e)}")
+            raise Exception(f"Failed to read document pages {start_page}-{end_page}: {str(e)}")
+
+    def chunk_pdf_shard(
+        self,
+        pdf_path: str,
+        start_page: int,
+        end_page: int,
+        document_id: int = None,
+        file_digest: Optional[str] = None,
+    ) -> Tuple[List[DocumentChunk], Dict[str, int]]:
+        """
+        Chunk one page range of a PDF. Also returns the item counts of the converted shard,
+        which ShardMerger needs to renumber item references of the following shards, and
+        records the level of each chunk heading for ShardMerger to merge heading paths.
+        file_digest is the document's file_sha256, hashed once for all of its shards.
+        """
+        document = self.read_page_range(pdf_path, start_page, end_page, file_digest=file_digest)
+        ref_counts = {name: len(getattr(document, name)) for name in REF_COLLECTIONS}
+        chunks = self.chunk_general_document(document, document_id)
+
+        # Levels as HybridChunker assigns them: titles 0, section headers their own level
+        heading_levels = {}
+        for item, _ in document.iterate_items():
+            if isinstance(item, SectionHeaderItem):
+                heading_levels[item.text] = item.level
+            elif isinstance(item, TitleItem):
+                heading_levels[item.text] = 0
+        for chunk in chunks:
+            headings = chunk.chunk_metadata.get("headings")
+            if headings:
+                chunk.chunk_metadata[HEADING_LEVELS_KEY] = [heading_levels.get(h, 1) for h in headings]
+        return chunks, ref_counts
+
+    @staticmethod
+    def page_windows(page_count: int, window_pages: int) -> List[tuple]:
+        """Consecutive (start_page, end_page) ranges covering a document"""
+        return [
+            (start, min(start + window_pages - 1, page_count))
+            for start in range(1, page_count + 1, window_pages)
+        ]
+
     def chunk_general_document(
         self, document: DoclingDocument, document_id: int = None
     ) -> List[DocumentChunk]:
@@ -169,3 +268,58 @@ class DoclingChunking(BaseChunking):
         Chunk a single page content.
         """
         return self.chunk_general_document(content)
+
+
+class ShardMerger:
+    """
+    Joins the chunks of consecutive page shards of one PDF, fed in page order, into the
+    sequence whole-document conversion would produce. Each shard is converted as its own
+    DoclingDocument, so item references ("#/texts/3") restart at zero and headings of a
+    section that began in an earlier shard are unknown to it. Heading paths are merged by
+    level, as the chunker itself does: a shard heading replaces the carried heading of its
+    level and deeper ones, and keeps the carried parents above it.
+
+    Chunks are per document item (merge_peers is off), so shard edges fall on chunk
+    boundaries and need no re-splitting.
+    """
+
+    def __init__(self):
+        self.ref_offsets: Dict[str, int] = {name: 0 for name in REF_COLLECTIONS}
+        self.heading_by_level: Dict[int, str] = {}
+
+    def merge(self, chunks: List[DocumentChunk], ref_counts: Dict[str, int]) -> List[DocumentChunk]:
+        for chunk in chunks:
+            metadata = self._offset_refs(chunk.chunk_metadata or {})
+            headings = metadata.get("headings")
+            levels = metadata.pop(HEADING_LEVELS_KEY, None) or list(range(len(headings or [])))
+            if headings:
+                # Parents above the shard's outermost heading come from earlier shards
+                outermost = min(levels)
+                self.heading_by_level = {
+                    level: text for level, text in self.heading_by_level.items() if level < outermost
+                }
+                self.heading_by_level.update(zip(levels, headings))
+            if self.heading_by_level:
+                # Also continues a section whose heading is in an earlier shard
+                metadata["headings"] = [self.heading_by_level[level] for level in sorted(self.heading_by_level)]
+            chunk.chunk_metadata = metadata
+        for name, count in ref_counts.items():
+            self.ref_offsets[name] += count
+        return chunks
+
+    def _offset_refs(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                key: self._offset_ref(item) if key in ("self_ref", "$ref") else self._offset_refs(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self._offset_refs(item) for item in value]
+        return value
+
+    def _offset_ref(self, ref: Any) -> Any:
+        match = _REF_PATTERN.match(ref) if isinstance(ref, str) else None
+        if not match:
+            return ref
+        collection, index = match.groups()
+        return f"#/{collection}/{int(index) + self.ref_offsets[collection]}"
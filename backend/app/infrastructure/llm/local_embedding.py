@@ -0,0 +1,71 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+
+from app.core.config.vector_store import get_vector_store_settings
+from app.utils.logging_setup import create_logger
+
+
+logger = create_logger(__name__)
+
+
+class LocalEmbeddingService:
+    """
+    In-process embedding provider running an ONNX sentence-embedding model on CPU (via fastembed).
+    Skips the HTTP hop to Ollama and returns float32 NumPy arrays directly.
+    """
+
+    def __init__(self, embedding_model: str = None):
+        self.settings = get_vector_store_settings()
+        self.EMBEDDING_MODEL = embedding_model or self.settings.LOCAL_EMBEDDING_MODEL
+        self._model = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.settings.LOCAL_EMBEDDING_WORKERS,
+            thread_name_prefix="local-embedding",
+        )
+
+    @property
+    def model(self):
+        """Lazy initialization of the ONNX model, so importing the module stays cheap"""
+        if not self._model:
+            try:
+                from fastembed import TextEmbedding
+
+                self._model = TextEmbedding(
+                    model_name=self.EMBEDDING_MODEL,
+                    cache_dir=self.settings.LOCAL_EMBEDDING_CACHE_DIR,
+                    threads=self.settings.LOCAL_EMBEDDING_THREADS,
+                )
+                logger.info(f"Local embedding model {self.EMBEDDING_MODEL} loaded")
+            except ImportError as e:
+                raise RuntimeError(
+                    "The local embedding provider requires the 'fastembed' package. "
+                    f"Install it with 'pip install fastembed'. Original error: {str(e)}"
+                )
+            except Exception as e:
+                logger.error(f"Failed to load local embedding model: {str(e)}")
+                raise RuntimeError(f"Failed to load local embedding model: {str(e)}")
+        return self._model
+
+    def _embed_sync(self, texts: List[str]) -> np.ndarray:
+        vectors = list(self.model.embed(texts, batch_size=self.settings.LOCAL_EMBEDDING_BATCH_SIZE))
+        return np.asarray(vectors, dtype=np.float32)
+
+    async def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Get embeddings for multiple texts as a (len(texts), dim) float32 array"""
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._embed_sync, list(texts))
+        except Exception as e:
+            logger.error(f"Error getting local embeddings: {str(e)}")
+            raise
+
+    async def get_query_embeddings(self, queries: List[str]) -> np.ndarray:
+        """Get embeddings for queries"""
+        return await self.get_embeddings(queries)
+
+    async def close(self):
+        """Release the inference thread pool"""
+        self._executor.shutdown(wait=False)
@@ -1,7 +1,10 @@
+import asyncio
 import httpx
 from typing import List, Dict, Any
 import json
 
+import numpy as np
+
 from ollama import chat, embed, ChatResponse, EmbedResponse, AsyncClient, Client
 
 from app.core.config.vector_store import get_vector_store_settings
@@ -12,19 +15,26 @@ logger = create_logger(__name__)
 
 
 class OllamaService:
-    def __init__(self):
+    def __init__(self, embedding_model: str = None):
         self.settings = get_vector_store_settings()
         self.embed_url = f"{self.settings.OLLAMA_BASE_URL}/api/embeddings"
         self._async_client = None
         self._client = None
-        self.EMBEDDING_MODEL = self.settings.OLLAMA_EMBEDDING_MODEL
+        self.EMBEDDING_MODEL = embedding_model or self.settings.OLLAMA_EMBEDDING_MODEL
         self.CHAT_MODEL = self.settings.OLLAMA_CHAT_MODEL
 
     @property
     def async_client(self) -> AsyncClient:
         """Get async client for Ollama"""
         if not self._async_client:
-            self._async_client = AsyncClient(host=self.settings.OLLAMA_BASE_URL)
+            # Pooled keep-alive connections, reused for the lifetime of this service
+            self._async_client = AsyncClient(
+                host=self.settings.OLLAMA_BASE_URL,
+                limits=httpx.Limits(
+                    max_connections=self.settings.OLLAMA_MAX_CONNECTIONS,
+                    max_keepalive_connections=self.settings.OLLAMA_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            )
         return self._async_client
 
     @property
@@ -34,22 +44,36 @@ class OllamaService:
             self._client = Client(host=self.settings.OLLAMA_BASE_URL)
         return self._client
 
-    async def _get_embedding(self, text_list: List[str]) -> List[float]:
-        """Get embeddings for a single text using Ollama"""
+    async def close(self):
+        """Close pooled HTTP connections"""
+        if self._async_client:
+            # ollama's AsyncClient does not expose aclose for its httpx client
+            await self._async_client._client.aclose()
+            self._async_client = None
+        if self._client:
+            self._client._client.close()
+            self._client = None
+
+    async def _get_embedding(self, text_list: List[str]) -> np.ndarray:
+        """Get embeddings for a list of texts using Ollama as a float32 matrix"""
         try:
-            embed_response = await self.async_client.embed(model=self.EMBEDDING_MODEL, input=text_list)
-            return embed_response.embeddings
+            embed_response = await asyncio.wait_for(
+                self.async_client.embed(model=self.EMBEDDING_MODEL, input=text_list),
+                timeout=self.settings.OLLAMA_EMBEDDING_TIMEOUT,
+            )
+            # Convert straight off the wire so no boxed floats travel further
+            return np.asarray(embed_response.embeddings, dtype=np.float32)
         except Exception as e:
             logger.error(f"Error getting embedding from Ollama: {str(e)}")
             raise
 
-    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Get embeddings for multiple texts"""
+    async def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Get embeddings for multiple texts as a (len(texts), dim) float32 array"""
         embeddings = await self._get_embedding(texts)
         return embeddings
 
-    async def get_query_embeddings(self, queries: List[str]) -> List[float]:
-        """Get embeddings for a single query"""
+    async def get_query_embeddings(self, queries: List[str]) -> np.ndarray:
+        """Get embeddings for queries"""
         try:
             queries_embed_response = await self._get_embedding(queries)
             return queries_embed_response
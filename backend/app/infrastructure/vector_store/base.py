@@ -0,0 +1,146 @@
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.models.schemas.requests import DocumentFilter, SearchProfile
+from app.models.schemas.search_result import SearchResult
+
+# Payload fields searches can filter on, in the order filters are applied
+FILTER_FIELDS = ("division", "department", "document_id", "document_name")
+
+# Fixed namespace so the same chunk and model always map to the same point id
+POINT_ID_NAMESPACE = uuid.UUID("6f1c2b7e-3d4a-5e8f-9a0b-1c2d3e4f5a6b")
+
+
+def point_id(chunk_uuid: str, model_version: str) -> str:
+    """
+    Deterministic vector point id (UUIDv5) of a chunk embedded with a given model.
+    Re-sending the same chunk overwrites its point, so retried upserts never duplicate.
+    """
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{model_version}:{chunk_uuid}"))
+
+
+class BaseVectorStore(ABC):
+    """
+    Interface of the vector stores behind RetrievalService.
+
+    Implementations share the filter semantics of DocumentFilter: every given field must
+    match, a list of values matches any of them, document_id values are compared as
+    integers and all other values as lowercased strings.
+    """
+
+    collection_name: str
+    vector_size: int
+
+    @abstractmethod
+    async def ensure_collection(self):
+        """Create or load the collection; idempotent"""
+
+    @abstractmethod
+    async def close(self):
+        """Release connections or flush local state"""
+
+    @abstractmethod
+    async def store_vectors(
+        self,
+        vectors: np.ndarray,
+        metadata: List[Dict[str, Any]],
+        ids: List[str] = None,
+    ):
+        """Upsert vectors with their payloads"""
+
+    async def bulk_store_vectors(
+        self,
+        vectors: np.ndarray,
+        metadata: List[Dict[str, Any]],
+        ids: List[str] = None,
+        batch_size: Optional[int] = None,
+        parallelism: Optional[int] = None,
+    ) -> int:
+        """Upsert a large number of vectors; stores without a bulk path use store_vectors"""
+        await self.store_vectors(vectors=vectors, metadata=metadata, ids=ids)
+        return len(vectors)
+
+    @abstractmethod
+    async def search_similar(
+        self,
+        query_vector: np.ndarray,
+        limit: int = 5,
+        min_score: float = 0.3,
+        filters: Optional[DocumentFilter] = None,
+        search_params: Optional[Any] = None,
+        profile: Optional[SearchProfile] = None,
+        offset: int = 0,
+    ) -> List[SearchResult]:
+        """Top results by cosine similarity, skipping offset and scores below min_score"""
+
+    @abstractmethod
+    async def search_similar_batch(
+        self,
+        query_vectors: np.ndarray,
+        limits: List[int],
+        min_scores: List[float],
+        filters: List[Optional[DocumentFilter]],
+        profiles: List[Optional[SearchProfile]],
+        offsets: Optional[List[int]] = None,
+    ) -> List[List[SearchResult]]:
+        """Run several searches at once; the i-th query uses the i-th parameters"""
+
+    @abstractmethod
+    async def update_payloads(
+        self,
+        ids: List[str],
+        payloads: List[Dict[str, Any]],
+    ) -> Dict[str, int]:
+        """Merge payload deltas into existing points"""
+
+    @abstractmethod
+    async def update_payloads_by_filter(
+        self, filters: DocumentFilter, payload: Dict[str, Any]
+    ) -> None:
+        """Merge one payload delta into every point matching filters"""
+
+    @abstractmethod
+    async def estimate_matches(self, filters: Optional[DocumentFilter] = None) -> int:
+        """Approximate number of points matching filters"""
+
+    async def resolve_search_profile(
+        self, profile: Optional[SearchProfile], filters: Optional[DocumentFilter]
+    ) -> SearchProfile:
+        """The given profile, or the one selected automatically for the filters"""
+        return profile or SearchProfile.BALANCED
+
+    async def get_alias_target(self, alias_name: Optional[str] = None) -> Optional[str]:
+        """Collection an alias points to; stores without aliases have none"""
+        return None
+
+    async def apply_collection_config(self) -> Dict[str, Any]:
+        raise NotImplementedError(f"{type(self).__name__} has no collection config to apply")
+
+    @staticmethod
+    def _point_ids(ids: Optional[List[str]], count: int) -> List:
+        """Validate explicit point ids; positional fallbacks would overwrite unrelated points"""
+        if not ids or len(ids) != count:
+            raise ValueError(f"Expected {count} point ids, got {len(ids) if ids else 0}")
+        return list(ids)
+
+    def _process_filter_value(self, field: str, value):
+        """Helper to process and normalize filter values for Qdrant FieldCondition."""
+        try:
+            if field == "document_id":
+                # Always cast to int(s)
+                if isinstance(value, list):
+                    return [int(v) for v in value]
+                else:
+                    return int(value)
+            else:
+                # Convert string(s) to lowercase for consistency
+                if isinstance(value, list):
+                    return [str(v).lower() for v in value]
+                else:
+                    return str(value).lower()
+        except Exception as e:
+            print(f"Error processing filter value for field '{field}': {e}")
+            return value  # fallback to original value if something goes wrong
@@ -0,0 +1,22 @@
+from typing import Optional
+
+from app.core.config.vector_store import get_vector_store_settings
+from app.infrastructure.vector_store.base import BaseVectorStore
+from app.infrastructure.vector_store.numpy_store import NumpyVectorStore
+from app.infrastructure.vector_store.qdrant_store import QdrantVectorStore
+
+
+def create_vector_store(
+    collection_name: Optional[str] = None,
+    vector_size: Optional[int] = None,
+    backend: Optional[str] = None,
+) -> BaseVectorStore:
+    """Create a vector store, defaulting to VECTOR_STORE_BACKEND"""
+    backend = (backend or get_vector_store_settings().VECTOR_STORE_BACKEND).lower()
+    if backend == "qdrant":
+        return QdrantVectorStore(collection_name=collection_name, vector_size=vector_size)
+    if backend == "numpy":
+        return NumpyVectorStore(collection_name=collection_name, vector_size=vector_size)
+    raise ValueError(
+        f"Unknown VECTOR_STORE_BACKEND '{backend}'. Expected 'qdrant' or 'numpy'"
+    )
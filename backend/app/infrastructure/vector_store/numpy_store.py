@@ -0,0 +1,392 @@
+import asyncio
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from app.core.config.vector_store import get_vector_store_settings
+from app.infrastructure.vector_store.base import FILTER_FIELDS, BaseVectorStore
+from app.models.schemas.requests import DocumentFilter, SearchProfile
+from app.models.schemas.search_result import SearchResult
+from app.utils.logging_setup import create_logger
+
+logger = create_logger(__name__)
+
+INITIAL_CAPACITY = 1024
+VECTORS_FILE = "vectors.npy"
+PAYLOADS_FILE = "payloads.jsonl"
+# Sentinel for points without an integer document_id
+_MISSING_INT = np.iinfo(np.int64).min
+
+
+class NumpyVectorStore(BaseVectorStore):
+    """
+    In-process brute-force vector store for tests, laptop demos and small deployments.
+
+    Vectors are L2-normalized rows of a memory-mapped float32 matrix, so cosine similarity
+    is one matrix product and top-k selection uses argpartition. Payloads are kept per row,
+    with the filterable fields mirrored in NumPy columns so filters become vectorized masks.
+    Every write flushes the matrix and appends to a JSONL payload log; save() compacts the
+    log, and save_snapshot()/load_snapshot() copy the store to and from another directory.
+    """
+
+    def __init__(
+        self,
+        collection_name: Optional[str] = None,
+        vector_size: Optional[int] = None,
+        data_dir: Optional[str] = None,
+    ):
+        self.settings = get_vector_store_settings()
+        self.collection_name = collection_name or self.settings.QDRANT_COLLECTION
+        self.vector_size = vector_size or self.settings.VECTOR_SIZE
+        self.path = Path(data_dir or self.settings.NUMPY_STORE_DIR) / self.collection_name
+        self._lock = threading.RLock()
+        self._vectors: Optional[np.ndarray] = None
+        self._ids: List = []
+        self._rows: Dict[Any, int] = {}
+        self._payloads: List[Dict[str, Any]] = []
+        self._columns: Dict[str, np.ndarray] = {}
+        self._log = None
+        self._ready = False
+
+    @property
+    def count(self) -> int:
+        return len(self._ids)
+
+    async def ensure_collection(self):
+        """Load the store from disk, or create it empty"""
+        if not self._ready:
+            await asyncio.to_thread(self._open)
+
+    def _open(self):
+        with self._lock:
+            if self._ready:
+                return
+            self.path.mkdir(parents=True, exist_ok=True)
+            vectors_path = self.path / VECTORS_FILE
+            if vectors_path.exists():
+                self._vectors = np.load(vectors_path, mmap_mode="r+")
+                if self._vectors.shape[1] != self.vector_size:
+                    raise ValueError(
+                        f"{vectors_path} holds {self._vectors.shape[1]}-dimensional vectors, "
+                        f"expected {self.vector_size}"
+                    )
+            else:
+                self._vectors = open_memmap(
+                    vectors_path, mode="w+", dtype=np.float32,
+                    shape=(INITIAL_CAPACITY, self.vector_size),
+                )
+            capacity = self._vectors.shape[0]
+            self._columns = {
+                field: np.full(capacity, _MISSING_INT, dtype=np.int64)
+                if field == "document_id" else np.full(capacity, None, dtype=object)
+                for field in FILTER_FIELDS
+            }
+
+            payloads_path = self.path / PAYLOADS_FILE
+            if payloads_path.exists():
+                with open(payloads_path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            self._set_payload(record["id"], record["payload"])
+            self._log = open(payloads_path, "a", encoding="utf-8")
+            self._ready = True
+            logger.info(f"Opened NumPy vector store {self.path} with {self.count} points")
+
+    def _set_payload(self, point_id, payload: Dict[str, Any]) -> int:
+        """Assign the payload of a point, appending a row for new ids"""
+        row = self._rows.get(point_id)
+        if row is None:
+            row = len(self._ids)
+            self._rows[point_id] = row
+            self._ids.append(point_id)
+            self._payloads.append(payload)
+        else:
+            self._payloads[row] = payload
+        for field in FILTER_FIELDS:
+            value = payload.get(field)
+            if field == "document_id":
+                self._columns[field][row] = value if isinstance(value, int) else _MISSING_INT
+            else:
+                self._columns[field][row] = value if isinstance(value, str) else None
+        return row
+
+    def _reserve(self, rows: int):
+        """Grow the matrix and columns to hold at least rows points"""
+        capacity = self._vectors.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2)
+        vectors_path = self.path / VECTORS_FILE
+        tmp_path = self.path / f"{VECTORS_FILE}.tmp"
+        grown = open_memmap(
+            tmp_path, mode="w+", dtype=np.float32, shape=(new_capacity, self.vector_size)
+        )
+        grown[: self.count] = self._vectors[: self.count]
+        grown.flush()
+        del self._vectors
+        os.replace(tmp_path, vectors_path)
+        self._vectors = np.load(vectors_path, mmap_mode="r+")
+        for field, column in self._columns.items():
+            fill = _MISSING_INT if column.dtype == np.int64 else None
+            extended = np.full(new_capacity, fill, dtype=column.dtype)
+            extended[:capacity] = column
+            self._columns[field] = extended
+
+    def _write_log(self, point_ids: List, rows: List[int]):
+        for point_id, row in zip(point_ids, rows):
+            self._log.write(json.dumps({"id": point_id, "payload": self._payloads[row]}, default=str) + "\n")
+        self._log.flush()
+
+    def _store_sync(self, vectors: np.ndarray, metadata: List[Dict[str, Any]], ids: List):
+        with self._lock:
+            new_ids = [point_id for point_id in dict.fromkeys(ids) if point_id not in self._rows]
+            self._reserve(self.count + len(new_ids))
+            rows = [self._set_payload(point_id, dict(payload)) for point_id, payload in zip(ids, metadata)]
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            self._vectors[rows] = vectors / np.where(norms == 0, 1, norms)
+            self._vectors.flush()
+            self._write_log(ids, rows)
+
+    async def store_vectors(
+        self,
+        vectors: np.ndarray,
+        metadata: List[Dict[str, Any]],
+        ids: List[str] = None,
+    ):
+        """Upsert vectors with their metadata; existing ids are overwritten in place"""
+        try:
+            await self.ensure_collection()
+            vectors = np.asarray(vectors, dtype=np.float32)
+            if vectors.ndim != 2 or vectors.shape[1] != self.vector_size:
+                raise ValueError(
+                    f"Expected vectors of shape (n, {self.vector_size}), got {vectors.shape}"
+                )
+            point_ids = self._point_ids(ids, len(vectors))
+            await asyncio.to_thread(self._store_sync, vectors, metadata, point_ids)
+            logger.info(f"Stored {len(vectors)} vectors in NumPy store {self.collection_name}")
+        except Exception as e:
+            logger.error(f"Error storing vectors: {str(e)}")
+            raise
+
+    def _mask(self, filters: Optional[DocumentFilter]) -> Optional[np.ndarray]:
+        """Boolean row mask of the points matching filters, None when nothing is filtered"""
+        if not filters:
+            return None
+        mask = None
+        for field in FILTER_FIELDS:
+            value = getattr(filters, field, None)
+            if not value:
+                continue
+            processed_value = self._process_filter_value(field, value)
+            values = processed_value if isinstance(processed_value, list) else [processed_value]
+            column = self._columns[field][: self.count]
+            # OR within a field, AND across fields
+            field_mask = np.zeros(self.count, dtype=bool)
+            for v in values:
+                field_mask |= column == v
+            mask = field_mask if mask is None else mask & field_mask
+        return mask
+
+    def _top_k(self, scores: np.ndarray, mask: Optional[np.ndarray], limit: int, min_score: float, offset: int) -> List[int]:
+        candidates = scores >= min_score
+        if mask is not None:
+            candidates &= mask
+        candidates = np.flatnonzero(candidates)
+        k = offset + limit
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return ordered[offset:k].tolist()
+
+    def _search_sync(
+        self,
+        query_vectors: np.ndarray,
+        limits: List[int],
+        min_scores: List[float],
+        filters: List[Optional[DocumentFilter]],
+        offsets: List[int],
+    ) -> List[List[SearchResult]]:
+        with self._lock:
+            if not self.count:
+                return [[] for _ in limits]
+            norms = np.linalg.norm(query_vectors, axis=1, keepdims=True)
+            queries = query_vectors / np.where(norms == 0, 1, norms)
+            # One matrix product scores every query against every point
+            scores = queries @ self._vectors[: self.count].T
+            return [
+                self._to_search_results(
+                    rows=self._top_k(scores[i], self._mask(filters[i]), limits[i], min_scores[i], offsets[i]),
+                    scores=scores[i],
+                )
+                for i in range(len(limits))
+            ]
+
+    def _to_search_results(self, rows: List[int], scores: np.ndarray) -> List[SearchResult]:
+        search_results = []
+        for row in rows:
+            try:
+                payload = {k: v for k, v in self._payloads[row].items() if k != "content"}
+                search_results.append(SearchResult(
+                    id=str(self._ids[row]),
+                    # Clip float rounding so scores stay within SearchResult's [0, 1] bounds
+                    score=float(min(max(scores[row], 0.0), 1.0)),
+                    content=self._payloads[row].get("content", ""),
+                    payload=payload,
+                ))
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Skipping invalid search result: {str(e)}")
+        return search_results
+
+    async def search_similar(
+        self,
+        query_vector: np.ndarray,
+        limit: int = 5,
+        min_score: float = 0.3,
+        filters: Optional[DocumentFilter] = None,
+        search_params: Optional[Any] = None,
+        profile: Optional[SearchProfile] = None,
+        offset: int = 0,
+    ) -> List[SearchResult]:
+        """Exact top-k cosine search; search params and profiles do not apply"""
+        results = await self.search_similar_batch(
+            query_vectors=np.asarray(query_vector, dtype=np.float32).reshape(1, -1),
+            limits=[limit],
+            min_scores=[min_score],
+            filters=[filters],
+            profiles=[profile],
+            offsets=[offset],
+        )
+        return results[0]
+
+    async def search_similar_batch(
+        self,
+        query_vectors: np.ndarray,
+        limits: List[int],
+        min_scores: List[float],
+        filters: List[Optional[DocumentFilter]],
+        profiles: List[Optional[SearchProfile]],
+        offsets: Optional[List[int]] = None,
+    ) -> List[List[SearchResult]]:
+        """Exact top-k cosine search for several queries with one matrix product"""
+        try:
+            await self.ensure_collection()
+            return await asyncio.to_thread(
+                self._search_sync,
+                np.asarray(query_vectors, dtype=np.float32),
+                limits,
+                min_scores,
+                filters,
+                offsets or [0] * len(limits),
+            )
+        except Exception as e:
+            logger.error(f"Error searching vectors: {str(e)}")
+            raise
+
+    def _merge_payloads_sync(self, rows: List[int], payloads: List[Dict[str, Any]]):
+        with self._lock:
+            point_ids = [self._ids[row] for row in rows]
+            for point_id, row, payload in zip(point_ids, rows, payloads):
+                self._set_payload(point_id, {**self._payloads[row], **payload})
+            self._write_log(point_ids, rows)
+
+    async def update_payloads(
+        self,
+        ids: List[str],
+        payloads: List[Dict[str, Any]],
+    ) -> Dict[str, int]:
+        """Merge payload deltas into existing points; unknown ids are skipped"""
+        try:
+            await self.ensure_collection()
+            known = [(self._rows[i], p) for i, p in zip(ids, payloads) if i in self._rows]
+            await asyncio.to_thread(
+                self._merge_payloads_sync, [row for row, _ in known], [p for _, p in known]
+            )
+            logger.info(f"Updated payloads for {len(known)} vectors in NumPy store")
+            return {"updated_points": len(known), "operations": len(known)}
+        except Exception as e:
+            logger.error(f"Error updating payloads: {str(e)}")
+            raise
+
+    async def update_payloads_by_filter(
+        self, filters: DocumentFilter, payload: Dict[str, Any]
+    ) -> None:
+        """Merge one payload delta into every point matching filters"""
+        await self.ensure_collection()
+        mask = self._mask(filters)
+        if mask is None:
+            raise ValueError("A non-empty filter is required for filtered payload updates")
+        rows = np.flatnonzero(mask).tolist()
+        await asyncio.to_thread(self._merge_payloads_sync, rows, [payload] * len(rows))
+        logger.info(f"Updated payloads of {len(rows)} vectors in NumPy store by filter")
+
+    async def estimate_matches(self, filters: Optional[DocumentFilter] = None) -> int:
+        """Exact number of points matching filters"""
+        await self.ensure_collection()
+        mask = self._mask(filters)
+        return self.count if mask is None else int(mask.sum())
+
+    async def resolve_search_profile(
+        self, profile: Optional[SearchProfile], filters: Optional[DocumentFilter]
+    ) -> SearchProfile:
+        # Brute-force search is always exact
+        return profile or SearchProfile.EXACT
+
+    def save(self):
+        """Flush vectors and compact the payload log to one record per point"""
+        with self._lock:
+            if not self._ready:
+                return
+            self._vectors.flush()
+            self._log.close()
+            payloads_path = self.path / PAYLOADS_FILE
+            tmp_path = self.path / f"{PAYLOADS_FILE}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for point_id, payload in zip(self._ids, self._payloads):
+                    f.write(json.dumps({"id": point_id, "payload": payload}, default=str) + "\n")
+            os.replace(tmp_path, payloads_path)
+            self._log = open(payloads_path, "a", encoding="utf-8")
+
+    def save_snapshot(self, snapshot_dir: str):
+        """Write a consistent copy of the store to snapshot_dir"""
+        with self._lock:
+            self.save()
+            target = Path(snapshot_dir)
+            target.mkdir(parents=True, exist_ok=True)
+            np.save(target / VECTORS_FILE, np.asarray(self._vectors[: self.count]))
+            shutil.copyfile(self.path / PAYLOADS_FILE, target / PAYLOADS_FILE)
+        logger.info(f"Saved snapshot of {self.count} points to {target}")
+
+    def load_snapshot(self, snapshot_dir: str):
+        """Replace the store's contents with a snapshot written by save_snapshot"""
+        source = Path(snapshot_dir)
+        with self._lock:
+            self._reset()
+            self.path.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source / VECTORS_FILE, self.path / VECTORS_FILE)
+            shutil.copyfile(source / PAYLOADS_FILE, self.path / PAYLOADS_FILE)
+            self._open()
+        logger.info(f"Loaded snapshot {source} into {self.path}")
+
+    def _reset(self):
+        if self._log:
+            self._log.close()
+        self._log = None
+        self._vectors = None
+        self._ids, self._rows, self._payloads, self._columns = [], {}, [], {}
+        self._ready = False
+
+    async def close(self):
+        """Compact the payload log and release the memory map"""
+        await asyncio.to_thread(self._close_sync)
+
+    def _close_sync(self):
+        with self._lock:
+            self.save()
+            self._reset()
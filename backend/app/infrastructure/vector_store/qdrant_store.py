@@ -1,64 +1,403 @@
-from typing import List, Dict, Any, Optional
+import asyncio
+import json
+import re
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import date
 import httpx
-from qdrant_client import QdrantClient, AsyncQdrantClient
+import numpy as np
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.models import Filter, FieldCondition, MatchValue, Range
 from app.core.config.vector_store import get_vector_store_settings
+from app.infrastructure.vector_store.base import FILTER_FIELDS, BaseVectorStore, point_id
 from app.utils.logging_setup import create_logger
 from app.models.schemas.search_result import SearchResult
-from app.models.schemas.requests import DocumentFilter
+from app.models.schemas.requests import DocumentFilter, SearchProfile
+from app.utils.memory_cache import LRUCache
 
 logger = create_logger(__name__)
 
+# Payload fields used by _build_filter, indexed so filtered searches skip payload scans
+PAYLOAD_INDEXES: Dict[str, models.PayloadSchemaType] = {
+    "division": models.PayloadSchemaType.KEYWORD,
+    "department": models.PayloadSchemaType.KEYWORD,
+    "document_name": models.PayloadSchemaType.KEYWORD,
+    "document_id": models.PayloadSchemaType.INTEGER,
+}
 
-class QdrantVectorStore:
-    def __init__(self):
+# Upper bound on update operations sent in one batch_update_points request
+MAX_OPERATIONS_PER_REQUEST = 64
+
+
+def versioned_collection_name(base_name: str, embedding_model: str, vector_size: int) -> str:
+    """Name of the physical collection holding vectors of one embedding model version"""
+    model_slug = re.sub(r"[^a-z0-9]+", "_", embedding_model.lower()).strip("_")
+    return f"{base_name}__{model_slug}__{vector_size}"
+
+
+class QdrantVectorStore(BaseVectorStore):
+    """
+    Vector store backed by Qdrant.
+
+    Retrieval reads and writes through QDRANT_COLLECTION, which is an alias pointing at a
+    model-versioned collection (see versioned_collection_name). Re-embedding fills a shadow
+    collection and then swaps the alias atomically.
+    """
+
+    def __init__(self, collection_name: Optional[str] = None, vector_size: Optional[int] = None):
         self.settings = get_vector_store_settings()
-        self.client = QdrantClient(
-            host=self.settings.QDRANT_HOST, port=self.settings.QDRANT_PORT
-        )
+        self.collection_name = collection_name or self.settings.QDRANT_COLLECTION
+        self.vector_size = vector_size or self.settings.VECTOR_SIZE
+        # Async client only: nothing on the request path may block the event loop
         self.async_client = AsyncQdrantClient(
             host=self.settings.QDRANT_HOST, port=self.settings.QDRANT_PORT
         )
-        self._ensure_collection_exists()
+        self._bulk_client: Optional[AsyncQdrantClient] = None
+        # Estimated match counts of recent filters, used to pick the search profile
+        self._filter_counts = LRUCache(maxsize=1024, ttl_seconds=60)
+        self._collection_ready = False
+        self._bootstrap_lock = asyncio.Lock()
 
-    def _ensure_collection_exists(self):
-        """Ensure the collection exists, create it if it doesn't"""
-        try:
-            collections = self.client.get_collections().collections
-            collection_names = [c.name for c in collections]
-
-            if self.settings.QDRANT_COLLECTION not in collection_names:
-                self.client.create_collection(
-                    collection_name=self.settings.QDRANT_COLLECTION,
-                    vectors_config=models.VectorParams(
-                        size=self.settings.VECTOR_SIZE, distance=models.Distance.COSINE
-                    ),
+    @property
+    def bulk_client(self) -> AsyncQdrantClient:
+        """gRPC client used for bulk ingestion, created on first use"""
+        if self._bulk_client is None:
+            self._bulk_client = AsyncQdrantClient(
+                host=self.settings.QDRANT_HOST,
+                port=self.settings.QDRANT_PORT,
+                grpc_port=self.settings.QDRANT_GRPC_PORT,
+                prefer_grpc=True,
+            )
+        return self._bulk_client
+
+    async def ensure_collection(self):
+        """
+        Ensure the collection exists, create it if it doesn't.
+        The served alias is created as an alias over a model-versioned collection.
+        Runs once per store: at application startup for the shared store, or on first use.
+        """
+        if self._collection_ready:
+            return
+        async with self._bootstrap_lock:
+            if self._collection_ready:
+                return
+            try:
+                collections = (await self.async_client.get_collections()).collections
+                collection_names = [c.name for c in collections]
+                aliases = (await self.async_client.get_aliases()).aliases
+                alias_names = [a.alias_name for a in aliases]
+
+                if self.collection_name in collection_names or self.collection_name in alias_names:
+                    await self.ensure_payload_indexes()
+                    self._collection_ready = True
+                    return
+
+                if self.collection_name == self.settings.QDRANT_COLLECTION:
+                    target = versioned_collection_name(
+                        self.collection_name, self.settings.EMBEDDING_MODEL, self.vector_size
+                    )
+                    if target not in collection_names:
+                        await self._create_collection(target)
+                    await self.async_client.update_collection_aliases(
+                        change_aliases_operations=[
+                            models.CreateAliasOperation(
+                                create_alias=models.CreateAlias(
+                                    collection_name=target, alias_name=self.collection_name
+                                )
+                            )
+                        ]
+                    )
+                    logger.info(f"Created alias {self.collection_name} -> {target}")
+                else:
+                    await self._create_collection(self.collection_name)
+                await self.ensure_payload_indexes()
+                self._collection_ready = True
+            except Exception as e:
+                logger.error(f"Error ensuring collection exists: {str(e)}")
+                raise
+
+    async def ensure_payload_indexes(self) -> Dict[str, str]:
+        """
+        Create the payload indexes in PAYLOAD_INDEXES that are missing on the collection,
+        and recreate those that exist with the wrong type. Returns the action per field.
+        """
+        payload_schema = (
+            await self.async_client.get_collection(self.collection_name)
+        ).payload_schema or {}
+        actions = {}
+        for field, schema_type in PAYLOAD_INDEXES.items():
+            existing = payload_schema.get(field)
+            if existing is not None and existing.data_type == schema_type:
+                actions[field] = "ok"
+                continue
+            if existing is not None:
+                logger.warning(
+                    f"Payload index on {field} has type {existing.data_type}, "
+                    f"recreating it as {schema_type}"
+                )
+                await self.async_client.delete_payload_index(
+                    collection_name=self.collection_name, field_name=field, wait=True
                 )
-                logger.info(f"Created collection: {self.settings.QDRANT_COLLECTION}")
+                actions[field] = "recreated"
+            else:
+                actions[field] = "created"
+            await self.async_client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field,
+                field_schema=schema_type,
+                wait=True,
+            )
+            logger.info(f"Created {schema_type} payload index on {field} in {self.collection_name}")
+        return actions
+
+    async def _create_collection(self, name: str):
+        await self.async_client.create_collection(
+            collection_name=name,
+            vectors_config=models.VectorParams(
+                size=self.vector_size,
+                distance=models.Distance.COSINE,
+                on_disk=self.settings.QDRANT_ON_DISK_VECTORS,
+            ),
+            hnsw_config=self._hnsw_config(),
+            quantization_config=self._quantization_config(),
+        )
+        logger.info(
+            f"Created collection: {name} (quantization={self.settings.QDRANT_QUANTIZATION}, "
+            f"on_disk={self.settings.QDRANT_ON_DISK_VECTORS})"
+        )
+
+    def _hnsw_config(self) -> models.HnswConfigDiff:
+        return models.HnswConfigDiff(
+            m=self.settings.QDRANT_HNSW_M,
+            ef_construct=self.settings.QDRANT_HNSW_EF_CONSTRUCT,
+        )
+
+    def _quantization_config(self):
+        """Quantization config from settings, None when quantization is off"""
+        mode = self.settings.QDRANT_QUANTIZATION.lower()
+        always_ram = self.settings.QDRANT_QUANTIZATION_ALWAYS_RAM
+        if mode == "none":
+            return None
+        if mode == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, quantile=0.99, always_ram=always_ram
+                )
+            )
+        if mode == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=always_ram)
+            )
+        raise ValueError(f"Unsupported QDRANT_QUANTIZATION: {self.settings.QDRANT_QUANTIZATION}")
+
+    def default_search_params(self) -> models.SearchParams:
+        """Query-time HNSW and rescoring parameters from settings"""
+        quantization = None
+        if self.settings.QDRANT_QUANTIZATION.lower() != "none":
+            quantization = models.QuantizationSearchParams(
+                rescore=self.settings.QDRANT_SEARCH_RESCORE,
+                oversampling=self.settings.QDRANT_SEARCH_OVERSAMPLING,
+            )
+        return models.SearchParams(
+            hnsw_ef=self.settings.QDRANT_SEARCH_HNSW_EF, quantization=quantization
+        )
+
+    def search_params_for(self, profile: SearchProfile) -> models.SearchParams:
+        """Map a search profile to Qdrant query-time parameters"""
+        quantized = self.settings.QDRANT_QUANTIZATION.lower() != "none"
+        if profile == SearchProfile.EXACT:
+            return models.SearchParams(
+                exact=True,
+                quantization=models.QuantizationSearchParams(ignore=True) if quantized else None,
+            )
+        if profile == SearchProfile.FAST:
+            return models.SearchParams(
+                hnsw_ef=self.settings.QDRANT_FAST_SEARCH_HNSW_EF,
+                quantization=models.QuantizationSearchParams(rescore=False) if quantized else None,
+            )
+        return self.default_search_params()
+
+    async def estimate_count(self, search_filter: Optional[Filter] = None) -> int:
+        """
+        Approximate number of points matching a filter (all points without one),
+        from Qdrant's cardinality estimate, cached briefly per filter
+        """
+        key = search_filter.model_dump_json(exclude_none=True) if search_filter else ""
+        count = self._filter_counts.get(key)
+        if count is None:
+            count = (
+                await self.async_client.count(
+                    collection_name=self.collection_name,
+                    count_filter=search_filter,
+                    exact=False,
+                )
+            ).count
+            self._filter_counts.set(key, count)
+        return count
+
+    async def select_search_profile(self, search_filter: Optional[Filter]) -> SearchProfile:
+        """
+        Use exact search when the filter narrows the candidates enough that a full scan
+        of them is cheaper than walking the HNSW graph, balanced otherwise
+        """
+        if search_filter is None:
+            return SearchProfile.BALANCED
+        if await self.estimate_count(search_filter) <= self.settings.QDRANT_EXACT_SEARCH_THRESHOLD:
+            return SearchProfile.EXACT
+        return SearchProfile.BALANCED
+
+    async def resolve_search_profile(
+        self, profile: Optional[SearchProfile], filters: Optional[DocumentFilter]
+    ) -> SearchProfile:
+        """The given profile, or the one selected automatically for the filters"""
+        return await self._resolve_profile(profile, self._build_filter(filters))
+
+    async def estimate_matches(self, filters: Optional[DocumentFilter] = None) -> int:
+        """Approximate number of points matching a DocumentFilter"""
+        await self.ensure_collection()
+        return await self.estimate_count(self._build_filter(filters))
+
+    async def apply_collection_config(self) -> Dict[str, Any]:
+        """
+        Migrate an existing collection to the configured quantization, on-disk and HNSW
+        settings in place. Qdrant rebuilds segments in the background and keeps serving
+        searches meanwhile; collection status is yellow until optimization finishes.
+        """
+        target = await self.get_alias_target(self.collection_name) or self.collection_name
+        quantization_config = self._quantization_config() or models.Disabled.DISABLED
+        try:
+            await self.async_client.update_collection(
+                collection_name=target,
+                vectors_config={
+                    "": models.VectorParamsDiff(on_disk=self.settings.QDRANT_ON_DISK_VECTORS)
+                },
+                hnsw_config=self._hnsw_config(),
+                quantization_config=quantization_config,
+            )
+            info = await self.async_client.get_collection(target)
+            logger.info(f"Applied collection config to {target}, status {info.status}")
+            return {
+                "collection": target,
+                "status": str(info.status),
+                "quantization": self.settings.QDRANT_QUANTIZATION,
+                "on_disk": self.settings.QDRANT_ON_DISK_VECTORS,
+                "hnsw_m": self.settings.QDRANT_HNSW_M,
+                "hnsw_ef_construct": self.settings.QDRANT_HNSW_EF_CONSTRUCT,
+            }
         except Exception as e:
-            logger.error(f"Error ensuring collection exists: {str(e)}")
+            logger.error(f"Error applying collection config to {target}: {str(e)}")
             raise
 
-    def _process_filter_value(self, field: str, value):
-        """Helper to process and normalize filter values for Qdrant FieldCondition."""
+    async def get_alias_target(self, alias_name: Optional[str] = None) -> Optional[str]:
+        """Return the collection an alias points to, or None if it is not an alias"""
+        alias_name = alias_name or self.settings.QDRANT_COLLECTION
+        aliases = (await self.async_client.get_aliases()).aliases
+        for alias in aliases:
+            if alias.alias_name == alias_name:
+                return alias.collection_name
+        return None
+
+    async def activate_collection(self, target: str, alias_name: Optional[str] = None):
+        """
+        Point the served alias at target in one atomic alias update.
+        Refuses while a legacy plain collection holds the alias name: replacing it means
+        deleting it, which migrate_legacy_collection does only after copying its points.
+        """
+        alias_name = alias_name or self.settings.QDRANT_COLLECTION
+        operations = []
+        current = await self.get_alias_target(alias_name)
+        if current == target:
+            return
+        if current:
+            operations.append(
+                models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias_name))
+            )
+        elif await self.async_client.collection_exists(alias_name):
+            raise RuntimeError(
+                f"{alias_name} is a plain collection, not an alias, and cannot be swapped "
+                f"atomically. Migrate it once with 'python scripts/migrate_legacy_collection.py', "
+                f"then activate {target} again."
+            )
+
+        operations.append(
+            models.CreateAliasOperation(
+                create_alias=models.CreateAlias(collection_name=target, alias_name=alias_name)
+            )
+        )
+        await self.async_client.update_collection_aliases(change_aliases_operations=operations)
+        logger.info(f"Switched alias {alias_name} from {current} to {target}")
+
+    async def migrate_legacy_collection(self, embedding_model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Turn a legacy plain collection named QDRANT_COLLECTION into an alias over a
+        model-versioned copy of it. Points are copied while the legacy collection keeps
+        serving; it is deleted only once the copy holds all of its points, and the alias is
+        created right after, so searches fail only for the moment between the two calls.
+        Point ids are re-derived from payload uuids, as ingestion derives them. Safe to re-run.
+        """
+        alias_name = self.settings.QDRANT_COLLECTION
+        current = await self.get_alias_target(alias_name)
+        if current:
+            return {"alias": alias_name, "collection": current, "migrated_points": 0}
+        if not await self.async_client.collection_exists(alias_name):
+            raise ValueError(f"No collection named {alias_name} to migrate")
+
+        embedding_model = embedding_model or self.settings.EMBEDDING_MODEL
+        info = await self.async_client.get_collection(alias_name)
+        vector_size = info.config.params.vectors.size
+        target = versioned_collection_name(alias_name, embedding_model, vector_size)
+        target_store = QdrantVectorStore(collection_name=target, vector_size=vector_size)
+        copied = 0
         try:
-            if field == "document_id":
-                # Always cast to int(s)
-                if isinstance(value, list):
-                    return [int(v) for v in value]
-                else:
-                    return int(value)
-            else:
-                # Convert string(s) to lowercase for consistency
-                if isinstance(value, list):
-                    return [str(v).lower() for v in value]
-                else:
-                    return str(value).lower()
-        except Exception as e:
-            print(f"Error processing filter value for field '{field}': {e}")
-            return value  # fallback to original value if something goes wrong
+            offset = None
+            while True:
+                points, offset = await self.async_client.scroll(
+                    collection_name=alias_name,
+                    limit=self.settings.QDRANT_BULK_BATCH_SIZE,
+                    offset=offset,
+                    with_vectors=True,
+                    with_payload=True,
+                )
+                if points:
+                    copied += await target_store.bulk_store_vectors(
+                        vectors=np.asarray([point.vector for point in points], dtype=np.float32),
+                        metadata=[point.payload or {} for point in points],
+                        ids=[
+                            point_id(str(point.payload["uuid"]), embedding_model)
+                            if (point.payload or {}).get("uuid") else point.id
+                            for point in points
+                        ],
+                    )
+                if offset is None:
+                    break
+
+            legacy_count = (await self.async_client.count(alias_name, exact=True)).count
+            if copied < legacy_count:
+                raise RuntimeError(
+                    f"Copied {copied} of the {legacy_count} points of {alias_name} to {target}; "
+                    f"points were added during the copy, run the migration again"
+                )
+        finally:
+            await target_store.close()
+
+        logger.warning(f"Dropping legacy collection {alias_name} to replace it with an alias")
+        await self.async_client.delete_collection(alias_name)
+        await self.async_client.update_collection_aliases(
+            change_aliases_operations=[
+                models.CreateAliasOperation(
+                    create_alias=models.CreateAlias(collection_name=target, alias_name=alias_name)
+                )
+            ]
+        )
+        logger.info(f"Migrated {copied} points of legacy collection {alias_name} to {target}")
+        return {"alias": alias_name, "collection": target, "migrated_points": copied}
+
+    async def close(self):
+        """Close the Qdrant client connections"""
+        await self.async_client.close()
+        if self._bulk_client is not None:
+            await self._bulk_client.close()
+            self._bulk_client = None
 
     def _build_filter(self, filters: Optional[DocumentFilter]) -> Optional[Filter]:
         """Build Qdrant filter from DocumentFilter"""
@@ -68,7 +407,7 @@ class QdrantVectorStore:
 
             must_conditions = []
 
-            for field in ["division", "department", "document_id", "document_name"]:
+            for field in FILTER_FIELDS:
                 value = getattr(filters, field, None)
                 if value:
                     processed_value = self._process_filter_value(field, value)
@@ -101,33 +440,89 @@ class QdrantVectorStore:
 
     async def store_vectors(
         self,
-        vectors: List[List[float]],
+        vectors: np.ndarray,
         metadata: List[Dict[str, Any]],
         ids: List[str] = None,
     ):
-        """Store vectors with their metadata in QDrant"""
+        """
+        Store vectors with their metadata in QDrant.
+        Vectors stay a float32 matrix until they are serialized for the upsert request.
+        """
         try:
-            points = []
-            for i, (vector, meta) in enumerate(zip(vectors, metadata)):
-                point_id = ids[i] if ids and i < len(ids) else i
-                points.append(
-                    models.PointStruct(id=point_id, vector=vector, payload=meta)
-                )
+            await self.ensure_collection()
+            vectors = np.asarray(vectors, dtype=np.float32)
+            point_ids = self._point_ids(ids, len(vectors))
 
-            self.client.upsert(
-                collection_name=self.settings.QDRANT_COLLECTION, points=points
+            await self.async_client.upsert(
+                collection_name=self.collection_name,
+                points=models.Batch(
+                    ids=point_ids,
+                    # Wire boundary: the only place vectors become Python floats
+                    vectors=vectors.tolist(),
+                    payloads=metadata,
+                ),
             )
             logger.info(f"Stored {len(vectors)} vectors in QDrant")
         except Exception as e:
             logger.error(f"Error storing vectors: {str(e)}")
             raise
 
+    async def bulk_store_vectors(
+        self,
+        vectors: np.ndarray,
+        metadata: List[Dict[str, Any]],
+        ids: List[str] = None,
+        batch_size: Optional[int] = None,
+        parallelism: Optional[int] = None,
+    ) -> int:
+        """
+        Bulk-ingest vectors over gRPC: the points are split into batches that are sent
+        concurrently with wait=False, followed by one waited upsert as a consistency barrier.
+        Qdrant applies the updates of a collection in order, so once the barrier returns
+        every earlier batch is applied and searchable.
+        """
+        try:
+            await self.ensure_collection()
+            vectors = np.asarray(vectors, dtype=np.float32)
+            point_ids = self._point_ids(ids, len(vectors))
+            batch_size = batch_size or self.settings.QDRANT_BULK_BATCH_SIZE
+            slots = asyncio.Semaphore(parallelism or self.settings.QDRANT_BULK_PARALLELISM)
+            batches = [slice(i, i + batch_size) for i in range(0, len(vectors), batch_size)]
+            if not batches:
+                return 0
+
+            async def upsert_batch(batch: slice, wait: bool):
+                async with slots:
+                    await self.bulk_client.upsert(
+                        collection_name=self.collection_name,
+                        points=models.Batch(
+                            ids=point_ids[batch],
+                            vectors=vectors[batch].tolist(),
+                            payloads=metadata[batch],
+                        ),
+                        wait=wait,
+                    )
+
+            await asyncio.gather(*(upsert_batch(batch, wait=False) for batch in batches[:-1]))
+            await upsert_batch(batches[-1], wait=True)
+            logger.info(
+                f"Bulk stored {len(vectors)} vectors in QDrant "
+                f"({len(batches)} batches of up to {batch_size})"
+            )
+            return len(vectors)
+        except Exception as e:
+            logger.error(f"Error bulk storing vectors: {str(e)}")
+            raise
+
     async def search_similar(
         self,
-        query_vector: List[float],
+        query_vector: np.ndarray,
         limit: int = 5,
         min_score: float = 0.3,
         filters: Optional[DocumentFilter] = None,
+        search_params: Optional[models.SearchParams] = None,
+        profile: Optional[SearchProfile] = None,
+        offset: int = 0,
     ) -> List[SearchResult]:
         """
         Search for similar vectors in QDrant
@@ -136,61 +531,162 @@ class QdrantVectorStore:
             query_vector: The vector to search for
             limit: Maximum number of results to return
             filters: Optional DocumentFilter to apply to the search
+            search_params: Optional query-time parameters, overrides profile
+            profile: Optional search profile, selected from the filter when omitted
+            offset: Number of top results to skip, applied by Qdrant
 
         Returns:
             List of SearchResult objects containing matched documents with their
             similarity scores and metadata
         """
         try:
+            await self.ensure_collection()
             # Build filter if provided
             search_filter = self._build_filter(filters) if filters else None
+            if search_params is None:
+                profile = await self._resolve_profile(profile, search_filter)
+                search_params = self.search_params_for(profile)
 
             results = await self.async_client.search(
-                collection_name=self.settings.QDRANT_COLLECTION,
+                collection_name=self.collection_name,
                 query_vector=query_vector,
                 score_threshold=min_score,
                 limit=limit,
+                offset=offset,
                 query_filter=search_filter,
+                search_params=search_params,
             )
 
-            search_results = []
-            for hit in results:
-                try:
-                    # Extract payload and ensure required fields exist
-                    payload = {k: v for k, v in hit.payload.items() if k != "content"}
-                    content = hit.payload.get("content", "")
-
-                    # Create SearchResult with validated data
-                    result = SearchResult(
-                        id=int(hit.id),
-                        score=float(hit.score),
-                        content=content,
-                        payload=payload,
-                    )
-                    search_results.append(result)
-                except (ValueError, KeyError) as e:
-                    logger.warning(f"Skipping invalid search result: {str(e)}")
-                    continue
-
-            return search_results
+            return self._to_search_results(results)
         except Exception as e:
             logger.error(f"Error searching vectors: {str(e)}")
             raise
 
+    async def search_similar_batch(
+        self,
+        query_vectors: np.ndarray,
+        limits: List[int],
+        min_scores: List[float],
+        filters: List[Optional[DocumentFilter]],
+        profiles: List[Optional[SearchProfile]],
+        offsets: Optional[List[int]] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Run several searches in one Qdrant search_batch request.
+        The i-th query uses the i-th limit, score threshold, filter, profile and offset.
+        """
+        try:
+            await self.ensure_collection()
+            search_filters = [self._build_filter(f) if f else None for f in filters]
+            selected_profiles = await asyncio.gather(*(
+                self._resolve_profile(profile, search_filter)
+                for profile, search_filter in zip(profiles, search_filters)
+            ))
+            offsets = offsets or [0] * len(limits)
+            requests = [
+                models.SearchRequest(
+                    vector=np.asarray(vector, dtype=np.float32).tolist(),
+                    filter=search_filter,
+                    limit=limit,
+                    offset=offset,
+                    score_threshold=min_score,
+                    params=self.search_params_for(profile),
+                    with_payload=True,
+                )
+                for vector, limit, offset, min_score, search_filter, profile in zip(
+                    query_vectors, limits, offsets, min_scores, search_filters, selected_profiles
+                )
+            ]
+            batch_results = await self.async_client.search_batch(
+                collection_name=self.collection_name, requests=requests
+            )
+            return [self._to_search_results(results) for results in batch_results]
+        except Exception as e:
+            logger.error(f"Error batch searching vectors: {str(e)}")
+            raise
+
+    async def _resolve_profile(
+        self, profile: Optional[SearchProfile], search_filter: Optional[Filter]
+    ) -> SearchProfile:
+        return profile or await self.select_search_profile(search_filter)
+
+    @staticmethod
+    def _to_search_results(hits) -> List[SearchResult]:
+        search_results = []
+        for hit in hits:
+            try:
+                # Extract payload and ensure required fields exist
+                payload = {k: v for k, v in hit.payload.items() if k != "content"}
+                content = hit.payload.get("content", "")
+
+                # Create SearchResult with validated data
+                result = SearchResult(
+                    id=str(hit.id),
+                    score=float(hit.score),
+                    content=content,
+                    payload=payload,
+                )
+                search_results.append(result)
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Skipping invalid search result: {str(e)}")
+                continue
+
+        return search_results
+
     async def update_payloads(
         self,
         ids: List[str],
         payloads: List[Dict[str, Any]],
-    ):
-        """Update payloads for existing vectors in QDrant"""
-        for point_id, payload in zip(ids, payloads):
-            try:
-                await self.async_client.set_payload(
-                    collection_name=self.settings.QDRANT_COLLECTION,
-                    points=[point_id],
-                    payload=payload,
+    ) -> Dict[str, int]:
+        """
+        Update payloads for existing vectors in QDrant.
+        Points sharing an identical payload delta become one set-payload operation, and
+        operations are sent together in batch update requests instead of one call per point.
+        """
+        try:
+            groups: Dict[str, Tuple[Dict[str, Any], List]] = {}
+            for id_, payload in zip(ids, payloads):
+                key = json.dumps(payload, sort_keys=True, default=str)
+                groups.setdefault(key, (payload, []))[1].append(id_)
+
+            points_per_operation = self.settings.QDRANT_PAYLOAD_BATCH_SIZE
+            operations = [
+                models.SetPayloadOperation(
+                    set_payload=models.SetPayload(
+                        payload=payload, points=point_ids[i : i + points_per_operation]
+                    )
                 )
-                logger.info(f"Updated payloads for {len(ids)} vectors in QDrant")
-            except Exception as e:
-                logger.error(f"Error updating payloads: {str(e)}")
-                raise
+                for payload, point_ids in groups.values()
+                for i in range(0, len(point_ids), points_per_operation)
+            ]
+            for i in range(0, len(operations), MAX_OPERATIONS_PER_REQUEST):
+                await self.async_client.batch_update_points(
+                    collection_name=self.collection_name,
+                    update_operations=operations[i : i + MAX_OPERATIONS_PER_REQUEST],
+                )
+            logger.info(
+                f"Updated payloads for {len(ids)} vectors in QDrant "
+                f"({len(groups)} distinct payloads, {len(operations)} operations)"
+            )
+            return {"updated_points": len(ids), "operations": len(operations)}
+        except Exception as e:
+            logger.error(f"Error updating payloads: {str(e)}")
+            raise
+
+    async def update_payloads_by_filter(
+        self, filters: DocumentFilter, payload: Dict[str, Any]
+    ) -> None:
+        """Apply one payload delta to every point matching filters, in a single request"""
+        query_filter = self._build_filter(filters)
+        if query_filter is None:
+            raise ValueError("A non-empty filter is required for filtered payload updates")
+        try:
+            await self.async_client.set_payload(
+                collection_name=self.collection_name,
+                payload=payload,
+                points=models.FilterSelector(filter=query_filter),
+            )
+            logger.info(f"Updated payloads in QDrant for filter {filters.model_dump(exclude_none=True)}")
+        except Exception as e:
+            logger.error(f"Error updating payloads by filter: {str(e)}")
+            raise
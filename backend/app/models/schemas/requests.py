@@ -1,4 +1,5 @@
 from datetime import date
+from enum import Enum
 from typing import Dict, Optional, List, Union
 from pydantic import BaseModel, Field
 
@@ -6,6 +7,13 @@ from app.utils.logging_setup import create_logger
 
 logger = create_logger(__name__)
 
+class SearchProfile(str, Enum):
+    """Speed/recall trade-off of a vector search"""
+    FAST = "fast"  # Small HNSW ef, quantized scores without rescoring
+    BALANCED = "balanced"  # Configured defaults
+    EXACT = "exact"  # Full scan over original vectors, maximum recall
+
+
 class DocumentFilter(BaseModel):
     """Filter parameters for document retrieval"""
     division: Optional[Union[str, List[str]]] = Field(None, description="Filter by division(s)")
@@ -45,6 +53,10 @@ class RetrievalRequest(BaseModel):
         default=0.0, description="Minimum similarity score threshold", ge=0.0, le=1.0)
     filters: Optional[DocumentFilter] = Field(
         None, description="Optional filtering parameters")
+    search_profile: Optional[SearchProfile] = Field(
+        None, description="Search profile (fast, balanced, exact); chosen automatically when omitted")
+    cursor: Optional[str] = Field(
+        None, description="Cursor from the previous page's next_cursor; takes precedence over offset")
 
     class Config:
         """Configuration for the RetrievalRequest model"""
@@ -64,6 +76,23 @@ class RetrievalRequest(BaseModel):
         }
 
 
+class BatchRetrievalRequest(BaseModel):
+    """Several retrieval requests answered with one embedding call and one vector search"""
+    queries: List[RetrievalRequest] = Field(
+        ..., description="Retrieval requests, each with its own filters and limits", min_length=1, max_length=64)
+
+    class Config:
+        """Configuration for the BatchRetrievalRequest model"""
+        json_schema_extra = {
+            "example": {
+                "queries": [
+                    {"query": "pipeline inspection interval", "limit": 5},
+                    {"query": "safety valve installation", "limit": 3, "filters": {"division": "Piping"}}
+                ]
+            }
+        }
+
+
 class GenerationRequest(BaseModel):
     """Request parameters for document generation with LLM"""
     query: str = Field(...,
@@ -79,6 +108,8 @@ class GenerationRequest(BaseModel):
         None, description="Optional filtering parameters")
     context: Optional[str] = Field(
         None, description="Additional context for the generation")
+    search_profile: Optional[SearchProfile] = Field(
+        None, description="Search profile (fast, balanced, exact); chosen automatically when omitted")
 
     class Config:
         """Configuration for the GenerationRequest model"""
@@ -22,4 +22,8 @@ class SearchResultItem(BaseModel):
 class SearchResponse(BaseModel):
     results: List[SearchResultItem] = Field(..., description="List of search results")
     query: str = Field(..., description="Original search query")
-    total_results: int = Field(..., description="Total number of results found")
+    total_results: int = Field(..., description="Total number of results: exact on the last page, an estimate of the matching chunks otherwise")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, absent on the last page")
+
+class BatchSearchResponse(BaseModel):
+    responses: List[SearchResponse] = Field(..., description="One search response per query, in request order")
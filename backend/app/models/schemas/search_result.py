@@ -3,7 +3,7 @@ from pydantic import BaseModel, Field, field_validator
 
 
 class SearchResult(BaseModel):
-    id: int = Field(..., description="Unique identifier for the search result")
+    id: str = Field(..., description="Vector point id of the search result (UUID)")
     score: float = Field(
         ..., description="Similarity score of the search result (0.0 to 1.0)"
     )
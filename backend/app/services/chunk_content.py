@@ -0,0 +1,77 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.controllers.document_chunk_controller import DocumentChunkController
+from app.core.config.vector_store import get_vector_store_settings
+from app.core.database import AsyncSessionLocal
+from app.models.schemas.search_result import SearchResult
+from app.utils.logging_setup import create_logger
+from app.utils.memory_cache import LRUCache
+
+logger = create_logger(__name__)
+
+# Payload fields kept in Qdrant in lean mode: ids plus everything searches filter or display on
+LEAN_PAYLOAD_FIELDS = (
+    "chunk_id",
+    "document_id",
+    "uuid",
+    "document_page_no",
+    "division",
+    "department",
+    "document_name",
+    "created_at",
+)
+
+
+class ChunkContentStore:
+    """
+    Hydrates search results whose Qdrant payload carries no chunk text.
+    Contents come from a local LRU cache first, then from Postgres with one IN query per page.
+    """
+
+    def __init__(self, cache_size: int = 5000):
+        self.cache = LRUCache(maxsize=cache_size)
+
+    async def get_many(self, chunk_ids: List[int]) -> Dict[int, Tuple[str, Optional[Dict[str, Any]]]]:
+        """Map chunk id -> (content, chunk_metadata)"""
+        found = {}
+        missing = []
+        for chunk_id in dict.fromkeys(chunk_ids):
+            cached = self.cache.get(chunk_id)
+            if cached is None:
+                missing.append(chunk_id)
+            else:
+                found[chunk_id] = cached
+
+        if missing:
+            async with AsyncSessionLocal() as session:
+                rows = await DocumentChunkController(session).get_chunk_contents(missing)
+            for chunk_id, content, chunk_metadata in rows:
+                found[chunk_id] = (content, chunk_metadata)
+                self.cache.set(chunk_id, (content, chunk_metadata))
+        return found
+
+    async def hydrate(self, results: List[SearchResult]) -> List[SearchResult]:
+        """Fill in content and chunk_metadata of results stored with lean payloads"""
+        lean_results = [r for r in results if not r.content]
+        if not lean_results:
+            return results
+        try:
+            contents = await self.get_many([int(r.payload["chunk_id"]) for r in lean_results])
+        except Exception as e:
+            logger.error(f"Error hydrating search results: {str(e)}")
+            raise
+
+        for result in lean_results:
+            content, chunk_metadata = contents.get(int(result.payload["chunk_id"]), ("", None))
+            result.content = content
+            result.payload.setdefault("chunk_metadata", chunk_metadata or {})
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_chunk_content_store() -> ChunkContentStore:
+    """
+    Get the shared chunk content store
+    """
+    return ChunkContentStore(cache_size=get_vector_store_settings().CHUNK_CONTENT_CACHE_SIZE)
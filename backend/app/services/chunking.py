@@ -5,7 +5,9 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.controllers.document_chunk_controller import BULK_INSERT_BATCH_SIZE, DocumentChunkController
 from app.infrastructure.ingest.docling import DoclingChunking
+from app.services.container import get_service_container
 
 
 from app.models.database import DocumentChunk
@@ -15,7 +17,7 @@ logger = create_logger(__name__, log_file_name="chunking.log")
 
 
 class ChunkingService:
-    def __init__(self, db_session: AsyncSession | Session, batch_size=5):  # Reduced from 10 to 5
+    def __init__(self, db_session: AsyncSession | Session, batch_size=BULK_INSERT_BATCH_SIZE):  # Rows per INSERT
         self.db_session = db_session
         self._chunking_provider = None
         self.batch_size = batch_size
@@ -28,40 +30,42 @@ class ChunkingService:
 
     async def process_document(self, document_id: int, file_path: str):
         """
-        Process a document by chunking it and storing the chunks in the database in batches.
+        Process a document by chunking it and storing the chunks in the database with
+        multi-row inserts, committed in one transaction per document.
 
         Args:
             document_id: ID of the document in the database
             file_path: Path to the document file
         """
         try:
-            # Get chunks using DoclingChunking
-            chunks = self.chunking_provider.chunk_pdf_document(
-                pdf_path=file_path, document_id=document_id
-            )
-
-            # Process chunks in batches
-            for i in range(0, len(chunks), self.batch_size):
-                batch = chunks[i : i + self.batch_size]
-
-                # Store batch of chunks in database
-                for chunk in batch:
-                    self.db_session.add(chunk)
-
-                # Commit each batch
+            # Convert and chunk in the worker pool so the event loop stays free; large PDFs
+            # arrive shard by shard and each batch is inserted before the next is held
+            total = 0
+            conversion_pool = get_service_container().conversion_pool
+            async for chunks in conversion_pool.iter_chunk_batches(file_path, document_id):
                 if isinstance(self.db_session, AsyncSession):
-                    await self.db_session.commit()
+                    await DocumentChunkController(self.db_session).bulk_insert_chunks(
+                        chunks, batch_size=self.batch_size
+                    )
                 else:
-                    self.db_session.commit()
+                    self.db_session.add_all(chunks)
+                    self.db_session.flush()
                     logger.warning("Using deprecated sync database session")
 
+                total += len(chunks)
                 logger.info(
-                    f"Processed batch of {len(batch)} chunks for document {document_id} "
-                    f"(progress: {i + len(batch)}/{len(chunks)})"
+                    f"Inserted batch of {len(chunks)} chunks for document {document_id} "
+                    f"(progress: {total} chunks)"
                 )
 
+            # One commit per document: a failure leaves no partial set of chunks behind
+            if isinstance(self.db_session, AsyncSession):
+                await self.db_session.commit()
+            else:
+                self.db_session.commit()
+
             logger.info(
-                f"Successfully processed document {document_id} into {len(chunks)} chunks"
+                f"Successfully processed document {document_id} into {total} chunks"
             )
 
         except Exception as e:
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+
+from app.infrastructure.ingest.conversion_pool import ConversionPool
+from app.infrastructure.llm.ollama import OllamaService
+from app.infrastructure.vector_store.base import BaseVectorStore
+from app.infrastructure.vector_store.factory import create_vector_store
+from app.services.embedding import EmbeddingsService, get_embeddings_service
+from app.services.generation import GenerationService
+from app.services.retrieval import RetrievalService
+from app.utils.logging_setup import create_logger
+
+logger = create_logger(__name__)
+
+
+@dataclass
+class ServiceContainer:
+    """
+    Application-scoped services, built once at startup so every request reuses the same
+    pooled Ollama/vector store connections and document conversion workers instead of
+    opening new clients per request.
+    """
+
+    embeddings_service: EmbeddingsService
+    vector_store: BaseVectorStore
+    llm_service: OllamaService
+    retrieval_service: RetrievalService
+    generation_service: GenerationService
+    conversion_pool: ConversionPool
+
+    @classmethod
+    def create(cls) -> "ServiceContainer":
+        embeddings_service = get_embeddings_service()
+        vector_store = create_vector_store()
+        llm_service = OllamaService()
+        retrieval_service = RetrievalService(
+            embeddings_service=embeddings_service, vector_store=vector_store
+        )
+        generation_service = GenerationService(
+            llm_service=llm_service, retrieval_service=retrieval_service
+        )
+        return cls(
+            embeddings_service=embeddings_service,
+            vector_store=vector_store,
+            llm_service=llm_service,
+            retrieval_service=retrieval_service,
+            generation_service=generation_service,
+            conversion_pool=ConversionPool(),
+        )
+
+    async def start(self):
+        """Bootstrap external resources once, before the first request is served"""
+        await self.vector_store.ensure_collection()
+        if self.conversion_pool.settings.INGEST_PREWARM_WORKERS:
+            await self.conversion_pool.warm_up()
+
+    async def close(self):
+        """Release pooled connections and stop background workers"""
+        for name, resource in (
+            ("embeddings service", self.embeddings_service),
+            ("LLM service", self.llm_service),
+            ("vector store", self.vector_store),
+            ("conversion pool", self.conversion_pool),
+        ):
+            try:
+                await resource.close()
+            except Exception as e:
+                logger.error(f"Error closing {name}: {str(e)}")
+
+
+_container: Optional[ServiceContainer] = None
+
+
+def init_service_container() -> ServiceContainer:
+    """Build the application service container (called from the FastAPI lifespan)"""
+    global _container
+    if _container is None:
+        _container = ServiceContainer.create()
+        logger.info("Service container initialized")
+    return _container
+
+
+def get_service_container() -> ServiceContainer:
+    """
+    Get the application service container; builds it lazily for code running
+    outside the FastAPI lifespan (scripts, background jobs)
+    """
+    return _container or init_service_container()
+
+
+async def shutdown_service_container():
+    """Close the application service container"""
+    global _container
+    if _container is not None:
+        await _container.close()
+        _container = None
+        # The closed embeddings service must not be handed to a container built later
+        get_embeddings_service.cache_clear()
+        logger.info("Service container closed")
+
+
+def _app_services(request: Request) -> ServiceContainer:
+    return getattr(request.app.state, "services", None) or get_service_container()
+
+
+def get_retrieval_service(request: Request) -> RetrievalService:
+    """FastAPI dependency returning the shared RetrievalService"""
+    return _app_services(request).retrieval_service
+
+
+def get_generation_service(request: Request) -> GenerationService:
+    """FastAPI dependency returning the shared GenerationService"""
+    return _app_services(request).generation_service
+
+
+def get_vector_store(request: Request) -> BaseVectorStore:
+    """FastAPI dependency returning the shared BaseVectorStore"""
+    return _app_services(request).vector_store
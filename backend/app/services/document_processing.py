@@ -1,27 +1,46 @@
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Optional
+
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config.vector_store import get_vector_store_settings
 from app.controllers.document_controller import DocumentController
 from app.controllers.document_chunk_controller import DocumentChunkController
 from app.models.database import Document, DocumentChunk
-from app.services.embedding import EmbeddingsService
-from app.services.retrieval import RetrievalService
+from app.services.embedding_batching import (
+    count_tokens_many,
+    get_embedding_batch_planner,
+    is_oversize_batch_error,
+)
+from app.services.chunk_content import LEAN_PAYLOAD_FIELDS
+from app.services.container import get_service_container
 from app.utils.logging_setup import create_logger
 
 logger = create_logger(__name__)
 
+# Payload fields _prepare_chunk_metadata copies from the document row, and their columns
+DOCUMENT_PAYLOAD_FIELDS = {"division": "division", "department": "department", "document_name": "title"}
+
 
 class DocumentProcessingService:
     """
     Service for document processing operations that combines multiple controllers and services.
     """
 
-    def __init__(self, db_session: AsyncSession, batch_size: int = 20):
+    def __init__(self, db_session: AsyncSession, batch_size: Optional[int] = None):
         self.db_session = db_session
+        # Optional hard cap on chunks per batch; batches are otherwise sized by token budget
         self.batch_size = batch_size
+        self.batch_planner = get_embedding_batch_planner()
+        # Number of batches each pipeline stage may run ahead of the next one
+        vector_store_settings = get_vector_store_settings()
+        self.pipeline_depth = vector_store_settings.EMBEDDING_PIPELINE_DEPTH
+        self.lean_payloads = vector_store_settings.QDRANT_LEAN_PAYLOADS
         self.document_controller = DocumentController(db_session)
         self.chunk_controller = DocumentChunkController(db_session)
-        self.embeddings_service = EmbeddingsService()
-        self.retrieval_service = RetrievalService()
+        services = get_service_container()
+        self.embeddings_service = services.embeddings_service
+        self.retrieval_service = services.retrieval_service
 
     async def process_document_embeddings(self, document_id: int):
         """Process all chunks of a document to generate and store embeddings in batches"""
@@ -40,31 +59,28 @@ class DocumentProcessingService:
                 logger.info(f"No pending chunks found for document {document_id}")
                 return
 
-            # Process chunks in batches
+            # Embed with the model of the collection currently served
+            await self.retrieval_service.served_model.sync()
+
+            # Build batches from the token budget rather than a fixed chunk count
             total_chunks = len(chunks)
-            for i in range(0, total_chunks, self.batch_size):
-                batch = chunks[i : i + self.batch_size]
-
-                # Prepare texts and metadata for embedding
-                texts = [chunk.content for chunk in batch]
-                metadata = [
-                    self._prepare_chunk_metadata(chunk, document)
-                    for chunk in batch
+            # Tokenizing (and the first tokenizer load) is CPU and disk work, kept off the event loop
+            token_counts = await asyncio.to_thread(
+                count_tokens_many, [chunk.content for chunk in chunks]
+            )
+            batches = self.batch_planner.plan(
+                token_counts, model=self.embeddings_service.model_name
+            )
+            if self.batch_size:
+                batches = [
+                    slice(i, min(i + self.batch_size, batch.stop))
+                    for batch in batches
+                    for i in range(batch.start, batch.stop, self.batch_size)
                 ]
 
-                # Store embeddings through retrieval service
-                await self.retrieval_service.store_embeddings(
-                    texts=texts, metadata=metadata, ids=[chunk.id for chunk in batch]
-                )
-
-                # Update chunk status for this batch
-                chunk_ids = [chunk.id for chunk in batch]
-                await self.chunk_controller.update_chunks_status_batch(chunk_ids, "embedded")
-
-                logger.info(
-                    f"Processed batch of {len(batch)} chunks for document {document_id} "
-                    f"(progress: {i + len(batch)}/{total_chunks})"
-                )
+            await self._run_embedding_pipeline(
+                document, chunks, batches, token_counts
+            )
 
             # Update document status if all chunks are processed
             await self._update_document_status_if_complete(document_id)
@@ -77,9 +93,129 @@ class DocumentProcessingService:
             logger.error(f"Error processing document chunks: {str(e)}")
             raise
 
-    def _prepare_chunk_metadata(self, chunk: DocumentChunk, document: Document) -> Dict[str, Any]:
-        """Prepare metadata for a chunk"""
-        return {
+    async def _run_embedding_pipeline(
+        self,
+        document: Document,
+        chunks: List[DocumentChunk],
+        batches: List[slice],
+        token_counts: List[int],
+    ):
+        """
+        Run embed -> upsert -> status-update as concurrent stages joined by bounded queues,
+        so batch N+1 is embedding while batch N is upserting and batch N-1 is committed.
+
+        On the first failure upstream stages stop producing. Batches already embedded are
+        still upserted and committed if the failure was upstream of them, so progress made
+        before the failure is kept and the remaining chunks stay pending for a retry.
+        """
+        document_id = document.id
+        total_chunks = len(chunks)
+        upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_depth)
+        status_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_depth)
+        stop = asyncio.Event()
+        failed_stages = set()
+        errors: List[Exception] = []
+
+        def fail(stage: str, error: Exception):
+            logger.error(f"Embedding pipeline {stage} stage failed for document {document_id}: {error}")
+            failed_stages.add(stage)
+            errors.append(error)
+            stop.set()
+
+        async def embed_stage():
+            try:
+                for batch_slice in batches:
+                    if stop.is_set():
+                        break
+                    batch = chunks[batch_slice]
+                    texts = [chunk.content for chunk in batch]
+                    embeddings = await self._embed_with_split(texts)
+                    await upsert_queue.put((batch_slice, batch, texts, embeddings))
+            except Exception as e:
+                fail("embed", e)
+            finally:
+                await upsert_queue.put(None)
+
+        async def upsert_stage():
+            try:
+                while (item := await upsert_queue.get()) is not None:
+                    # Keep draining so the embed stage never blocks, but stop storing on failure
+                    if failed_stages & {"upsert", "status"}:
+                        continue
+                    batch_slice, batch, texts, embeddings = item
+                    try:
+                        await self.retrieval_service.store_embeddings(
+                            texts=texts,
+                            metadata=[
+                                self._prepare_chunk_metadata(chunk, document, lean=self.lean_payloads)
+                                for chunk in batch
+                            ],
+                            ids=[
+                                self.retrieval_service.point_id_for(str(chunk.uuid))
+                                for chunk in batch
+                            ],
+                            embeddings=embeddings,
+                        )
+                    except Exception as e:
+                        fail("upsert", e)
+                        continue
+                    await status_queue.put((batch_slice, batch))
+            finally:
+                await status_queue.put(None)
+
+        async def status_stage():
+            processed = 0
+            while (item := await status_queue.get()) is not None:
+                if "status" in failed_stages:
+                    continue
+                batch_slice, batch = item
+                try:
+                    await self.chunk_controller.update_chunks_status_batch(
+                        [chunk.id for chunk in batch], "embedded"
+                    )
+                except Exception as e:
+                    fail("status", e)
+                    continue
+                processed += len(batch)
+                logger.info(
+                    f"Processed batch of {len(batch)} chunks "
+                    f"({sum(token_counts[batch_slice])} tokens) for document {document_id} "
+                    f"(progress: {processed}/{total_chunks})"
+                )
+
+        await asyncio.gather(embed_stage(), upsert_stage(), status_stage())
+
+        if errors:
+            raise errors[0]
+
+    async def _embed_with_split(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a planned batch, halving it recursively when the provider times out or runs
+        out of memory. The batch is sent as is, not merged with other callers' texts.
+        """
+        try:
+            return await self.embeddings_service.get_embeddings(texts, coalesce=False)
+        except Exception as e:
+            if len(texts) < 2 or not is_oversize_batch_error(e):
+                raise
+            middle = len(texts) // 2
+            logger.warning(
+                f"Embedding batch of {len(texts)} failed ({e}), retrying as "
+                f"{middle} + {len(texts) - middle}"
+            )
+            first = await self._embed_with_split(texts[:middle])
+            second = await self._embed_with_split(texts[middle:])
+            return np.concatenate([first, second])
+
+    @staticmethod
+    def _prepare_chunk_metadata(
+        chunk: DocumentChunk, document: Document, lean: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Prepare metadata for a chunk.
+        Lean payloads keep only ids and filterable fields; content stays in Postgres.
+        """
+        metadata = {
             "chunk_id": chunk.id,
             "document_id": chunk.document_id,
             "uuid": chunk.uuid,
@@ -97,6 +233,9 @@ class DocumentProcessingService:
             "processed_by": "embedding_service",
             "extraction_method": "docling_hybrid_chunker",
         }
+        if lean:
+            return {field: metadata[field] for field in LEAN_PAYLOAD_FIELDS}
+        return metadata
 
     async def _update_document_status_if_complete(self, document_id: int):
         """Update document status to embedded if all chunks are embedded"""
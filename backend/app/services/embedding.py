@@ -1,41 +1,231 @@
 # Provider-agnostic EmbeddingsService: wraps OllamaService (or other providers in future)
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.infrastructure.cache.embedding_cache import (
+    EmbeddingCache,
+    get_embedding_cache,
+    make_cache_key,
+)
+from app.core.config.vector_store import get_vector_store_settings
+from app.infrastructure.llm.local_embedding import LocalEmbeddingService
 from app.infrastructure.llm.ollama import OllamaService
+from app.services.embedding_batching import get_embedding_batch_planner, is_oversize_batch_error
+from app.services.embedding_scheduler import EmbeddingPriority, EmbeddingScheduler
 from app.utils.logging_setup import create_logger
 
 
 logger = create_logger(__name__)
 
 
+def create_embedding_provider(provider_name: Optional[str] = None, embedding_model: Optional[str] = None):
+    """Create an embedding provider, defaulting to EMBEDDING_PROVIDER and its configured model"""
+    provider_name = (provider_name or get_vector_store_settings().EMBEDDING_PROVIDER).lower()
+    if provider_name == "ollama":
+        return OllamaService(embedding_model=embedding_model)
+    if provider_name == "local":
+        return LocalEmbeddingService(embedding_model=embedding_model)
+    raise ValueError(
+        f"Unknown EMBEDDING_PROVIDER '{provider_name}'. Expected 'ollama' or 'local'"
+    )
+
+
 class EmbeddingsService:
     """
     Service for handling text embeddings, acting as a layer between API/business logic and embedding providers (Ollama, etc).
     Use this class in retrieval, generation, etc. to decouple from provider details.
     """
 
-    def __init__(self, provider=None):
-        # Default to OllamaService, but allow injection for testing or future providers
-        self.provider = provider or OllamaService()
+    def __init__(self, provider=None, cache: Optional[EmbeddingCache] = None, use_cache: bool = True):
+        # Default to the configured provider, but allow injection for testing
+        self.provider = provider or create_embedding_provider()
+        # Shared content-addressed cache unless one is injected or caching is disabled
+        self.cache = cache or (get_embedding_cache() if use_cache else None)
+        self.provider_calls = 0
+        self.provider_texts = 0
+        # Provider calls in flight per provider; a replaced provider is closed once its calls finish
+        self._calls_in_flight: Counter = Counter()
+        self._retired_providers: List[Any] = []
+
+        settings = get_vector_store_settings()
+        # Coalesces concurrent callers into shared provider calls
+        self.scheduler = (
+            EmbeddingScheduler(
+                self._embed_with_provider,
+                window_ms=settings.EMBEDDING_BATCH_WINDOW_MS,
+                max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+                max_in_flight=settings.EMBEDDING_MAX_IN_FLIGHT_BATCHES,
+            )
+            if settings.EMBEDDING_SCHEDULER_ENABLED
+            else None
+        )
+
+    @property
+    def model_name(self) -> str:
+        """Name of the embedding model, used to namespace cache keys"""
+        return getattr(self.provider, "EMBEDDING_MODEL", type(self.provider).__name__)
+
+    async def switch_provider(self, provider):
+        """
+        Swap the provider in place, e.g. after activating a re-embedded collection.
+        The replaced provider is closed as soon as no call is using it.
+        """
+        logger.info(f"Switching embedding model from {self.model_name} to {provider.EMBEDDING_MODEL}")
+        previous, self.provider = self.provider, provider
+        if previous is provider:
+            return
+        if self._calls_in_flight[previous]:
+            self._retired_providers.append(previous)
+        else:
+            await self._close_provider(previous)
+
+    async def _close_provider(self, provider):
+        if hasattr(provider, "close"):
+            try:
+                await provider.close()
+            except Exception as e:
+                logger.error(f"Error closing embedding provider: {e}")
+
+    def has_pending_queries(self) -> bool:
+        """Whether interactive query embeddings are waiting on the scheduler"""
+        return bool(self.scheduler and self.scheduler.pending(EmbeddingPriority.QUERY))
 
-    async def get_embedding(self, text: str):
+    async def get_embedding(
+        self,
+        text: str,
+        priority: EmbeddingPriority = EmbeddingPriority.QUERY,
+        use_cache: bool = True,
+    ):
         """
         Get the embedding vector for a single text (async).
-        Returns a list of floats.
+        Returns a 1-D float32 array.
         """
         try:
-            # OllamaService expects a list of texts
-            embeddings = await self.provider.get_embeddings([text])
+            embeddings = await self.get_embeddings([text], priority=priority, use_cache=use_cache)
             return embeddings[0]
         except Exception as e:
             logger.error(f"Failed to get embedding: {e}")
             raise
 
-    async def get_embeddings(self, texts: list):
+    async def get_embeddings(
+        self,
+        texts: list,
+        priority: EmbeddingPriority = EmbeddingPriority.BULK,
+        use_cache: bool = True,
+        coalesce: bool = True,
+    ):
         """
         Get embeddings for a list of texts (async).
-        Returns a list of embedding vectors.
+        Only cache misses are sent to the provider, through the scheduler if enabled.
+        Pass use_cache=False for texts not worth persisting, such as ad-hoc queries, and
+        coalesce=False for batches already sized by the EmbeddingBatchPlanner.
+        Returns a contiguous (len(texts), dim) float32 array.
         """
         try:
-            return await self.provider.get_embeddings(texts)
+            if not texts:
+                return np.empty((0, get_vector_store_settings().VECTOR_SIZE), dtype=np.float32)
+            if not self.cache or not use_cache:
+                return await self._schedule(texts, priority, coalesce)
+
+            model = self.model_name
+            keys = [make_cache_key(model, text) for text in texts]
+            cached = await self.cache.get_many(keys)
+
+            # De-duplicate misses so repeated boilerplate in one batch is embedded once
+            miss_texts: Dict[str, str] = {}
+            for key, text in zip(keys, texts):
+                if key not in cached and key not in miss_texts:
+                    miss_texts[key] = text
+
+            if miss_texts:
+                miss_keys = list(miss_texts)
+                embeddings = await self._schedule(list(miss_texts.values()), priority, coalesce)
+                # Copy rows: a cached view would keep the whole provider matrix alive
+                fresh = {key: embedding.copy() for key, embedding in zip(miss_keys, embeddings)}
+                await self.cache.set_many(fresh)
+                cached.update(fresh)
+
+            logger.debug(
+                f"Embedding cache: {len(texts) - len(miss_texts)}/{len(texts)} hits "
+                f"for model {model}"
+            )
+            return np.stack([cached[key] for key in keys])
         except Exception as e:
             logger.error(f"Failed to get embeddings: {e}")
             raise
+
+    async def _schedule(
+        self, texts: List[str], priority: EmbeddingPriority, coalesce: bool = True
+    ) -> np.ndarray:
+        if self.scheduler:
+            return await self.scheduler.submit(texts, priority, coalesce=coalesce)
+        return await self._embed_with_provider(texts)
+
+    async def _embed_with_provider(self, texts: List[str]) -> np.ndarray:
+        self.provider_calls += 1
+        self.provider_texts += len(texts)
+        provider = self.provider
+        self._calls_in_flight[provider] += 1
+        start = time.perf_counter()
+        try:
+            embeddings = np.asarray(await provider.get_embeddings(texts), dtype=np.float32)
+        except Exception as e:
+            # Successes and failures are both recorded on the batch the provider received
+            if len(texts) > 1 and is_oversize_batch_error(e):
+                get_embedding_batch_planner().record_failure(self.model_name, len(texts))
+            raise
+        finally:
+            self._calls_in_flight[provider] -= 1
+            if not self._calls_in_flight[provider]:
+                del self._calls_in_flight[provider]
+                if provider in self._retired_providers:
+                    self._retired_providers.remove(provider)
+                    await self._close_provider(provider)
+        # Feed real provider timings to the batch planner
+        get_embedding_batch_planner().record(
+            self.model_name,
+            batch_size=len(texts),
+            num_chars=sum(len(text) for text in texts),
+            seconds=time.perf_counter() - start,
+        )
+        return embeddings
+
+    async def close(self, close_provider: bool = True):
+        """
+        Stop the scheduler and release provider connections.
+        Pass close_provider=False when the provider was handed over to another service.
+        """
+        if self.scheduler:
+            await self.scheduler.close()
+        for provider in self._retired_providers:
+            await self._close_provider(provider)
+        self._retired_providers = []
+        if close_provider and hasattr(self.provider, "close"):
+            await self.provider.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit/miss counters and provider usage for this service"""
+        return {
+            "model": self.model_name,
+            "provider_calls": self.provider_calls,
+            "provider_texts": self.provider_texts,
+            "cache": self.cache.stats() if self.cache else None,
+            "scheduler": {
+                "batches_sent": self.scheduler.batches_sent,
+                "requests_coalesced": self.scheduler.requests_coalesced,
+            }
+            if self.scheduler
+            else None,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_embeddings_service() -> EmbeddingsService:
+    """
+    Get the shared EmbeddingsService, so all callers go through one scheduler
+    """
+    return EmbeddingsService()
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+from ollama import ResponseError
+
+from app.core.config.vector_store import get_vector_store_settings
+from app.utils.logging_setup import create_logger
+
+logger = create_logger(__name__)
+
+# Rough characters-per-token ratio, used only when the chunk tokenizer cannot be loaded
+FALLBACK_CHARS_PER_TOKEN = 4
+
+_OVERSIZE_ERROR_MARKERS = ("out of memory", "oom", "context length", "too large", "timeout")
+
+
+@lru_cache(maxsize=1)
+def _load_chunk_tokenizer():
+    """The chunk tokenizer, or None if it cannot be loaded. A failed load is not retried."""
+    try:
+        from app.infrastructure.ingest.docling import get_chunk_tokenizer
+
+        return get_chunk_tokenizer()
+    except Exception as e:
+        logger.warning(f"Chunk tokenizer unavailable, estimating tokens from characters: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with the same tokenizer the HybridChunker uses to size chunks"""
+    tokenizer = _load_chunk_tokenizer()
+    if tokenizer is None:
+        return len(text) // FALLBACK_CHARS_PER_TOKEN + 1
+    return tokenizer.count_tokens(text)
+
+
+def count_tokens_many(texts: Sequence[str]) -> List[int]:
+    """Token counts of several texts; blocking, run it in a thread from async code"""
+    return [count_tokens(text) for text in texts]
+
+
+def is_oversize_batch_error(error: Exception) -> bool:
+    """Whether an embedding error suggests the batch was too large for the provider"""
+    if isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException)):
+        return True
+    if isinstance(error, ResponseError) and error.status_code in (413, 500, 503):
+        return any(marker in str(error).lower() for marker in _OVERSIZE_ERROR_MARKERS)
+    return False
+
+
+class EmbeddingBatchPlanner:
+    """
+    Builds embedding batches from a token budget instead of a fixed chunk count,
+    and remembers which batch size gave the best throughput for each model.
+    """
+
+    def __init__(self, token_budget: int, max_batch_size: int, smoothing: float = 0.3):
+        self.token_budget = token_budget
+        self.max_batch_size = max_batch_size
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        # model -> batch size bucket -> smoothed characters per second
+        self._throughput: Dict[str, Dict[int, float]] = {}
+        # model -> largest batch size known not to fail
+        self._ceiling: Dict[str, int] = {}
+
+    @staticmethod
+    def _bucket(batch_size: int) -> int:
+        """Group batch sizes by power of two so measurements accumulate"""
+        return 1 << (max(batch_size, 1).bit_length() - 1)
+
+    def record(self, model: str, batch_size: int, num_chars: int, seconds: float) -> None:
+        """Record the throughput of one successful provider call"""
+        if seconds <= 0 or batch_size <= 0:
+            return
+        bucket = self._bucket(batch_size)
+        rate = num_chars / seconds
+        with self._lock:
+            model_rates = self._throughput.setdefault(model, {})
+            previous = model_rates.get(bucket)
+            model_rates[bucket] = (
+                rate if previous is None
+                else previous + self.smoothing * (rate - previous)
+            )
+
+    def record_failure(self, model: str, batch_size: int) -> None:
+        """Lower the batch size ceiling after a timeout or out-of-memory error"""
+        with self._lock:
+            ceiling = max(1, batch_size // 2)
+            self._ceiling[model] = min(self._ceiling.get(model, ceiling), ceiling)
+            for bucket in [b for b in self._throughput.get(model, {}) if b > ceiling]:
+                del self._throughput[model][bucket]
+        logger.warning(f"Lowered embedding batch ceiling for {model} to {ceiling}")
+
+    def preferred_batch_size(self, model: str) -> int:
+        """Batch size with the best measured throughput, or the configured maximum"""
+        with self._lock:
+            ceiling = min(self._ceiling.get(model, self.max_batch_size), self.max_batch_size)
+            model_rates = self._throughput.get(model)
+            if not model_rates:
+                return ceiling
+            best_bucket = max(model_rates, key=model_rates.get)
+            # Keep probing one size bucket above the best so larger sizes can still win
+            return max(1, min(best_bucket * 2, ceiling))
+
+    def plan(self, token_counts: Sequence[int], model: str) -> List[slice]:
+        """Split items into contiguous batches within the token budget and size cap"""
+        max_items = self.preferred_batch_size(model)
+        batches = []
+        start = 0
+        tokens = 0
+        for i, count in enumerate(token_counts):
+            count_in_batch = i - start
+            if count_in_batch and (
+                tokens + count > self.token_budget or count_in_batch >= max_items
+            ):
+                batches.append(slice(start, i))
+                start = i
+                tokens = 0
+            tokens += count
+        if start < len(token_counts):
+            batches.append(slice(start, len(token_counts)))
+        return batches
+
+    def stats(self) -> Dict[str, Dict[str, Optional[int]]]:
+        with self._lock:
+            models = set(self._throughput) | set(self._ceiling)
+        return {
+            model: {
+                "preferred_batch_size": self.preferred_batch_size(model),
+                "ceiling": self._ceiling.get(model),
+            }
+            for model in models
+        }
+
+
+@lru_cache(maxsize=1)
+def get_embedding_batch_planner() -> EmbeddingBatchPlanner:
+    """
+    Get the shared batch planner, so throughput measurements outlive single documents
+    """
+    settings = get_vector_store_settings()
+    return EmbeddingBatchPlanner(
+        token_budget=settings.EMBEDDING_BATCH_TOKEN_BUDGET,
+        max_batch_size=settings.EMBEDDING_BATCH_MAX_CHUNKS,
+    )
@@ -0,0 +1,187 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Set
+
+from app.utils.logging_setup import create_logger
+
+logger = create_logger(__name__)
+
+
+class EmbeddingPriority(str, Enum):
+    """Scheduling class of an embedding request"""
+
+    QUERY = "query"  # Interactive search, latency sensitive
+    BULK = "bulk"  # Document ingestion and re-embedding
+
+
+@dataclass
+class _PendingRequest:
+    texts: List[str]
+    future: asyncio.Future
+    coalesce: bool = True
+
+
+class EmbeddingScheduler:
+    """
+    Coalesces concurrent embedding requests into a single provider call.
+
+    Requests arriving within `window_ms` of each other are merged into one
+    batch of at most `max_batch_size` texts. Query requests are always taken
+    before bulk requests, so ingestion cannot starve interactive search.
+    Requests submitted with coalesce=False (batches already sized by the
+    EmbeddingBatchPlanner) keep their priority but are sent on their own.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], Awaitable[List[Any]]],
+        window_ms: float = 10.0,
+        max_batch_size: int = 64,
+        max_in_flight: int = 2,
+    ):
+        self.embed_fn = embed_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._queues = {
+            EmbeddingPriority.QUERY: deque(),
+            EmbeddingPriority.BULK: deque(),
+        }
+        self._pending = asyncio.Event()
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self._closed = False
+        self.batches_sent = 0
+        self.requests_coalesced = 0
+
+    async def submit(
+        self,
+        texts: List[str],
+        priority: EmbeddingPriority = EmbeddingPriority.BULK,
+        coalesce: bool = True,
+    ) -> List[Any]:
+        """Queue texts for embedding and wait for their vectors"""
+        if self._closed:
+            raise RuntimeError("Embedding scheduler closed")
+        if not texts:
+            return []
+        future = asyncio.get_running_loop().create_future()
+        self._queues[priority].append(
+            _PendingRequest(texts=list(texts), future=future, coalesce=coalesce)
+        )
+        self._pending.set()
+        self._ensure_worker()
+        return await future
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    def pending(self, priority: EmbeddingPriority) -> int:
+        """Number of queued requests of a priority class"""
+        return len(self._queues[priority])
+
+    def _queued_texts(self) -> int:
+        return sum(len(r.texts) for q in self._queues.values() for r in q)
+
+    def _take_batch(self) -> List[_PendingRequest]:
+        """Take queued requests up to the batch cap, query requests first"""
+        batch: List[_PendingRequest] = []
+        size = 0
+        for priority in (EmbeddingPriority.QUERY, EmbeddingPriority.BULK):
+            queue: Deque[_PendingRequest] = self._queues[priority]
+            while queue:
+                request = queue[0]
+                # Always take at least one request, even if it exceeds the cap on its own
+                if batch and (
+                    not request.coalesce or size + len(request.texts) > self.max_batch_size
+                ):
+                    return batch
+                queue.popleft()
+                if request.future.cancelled():
+                    continue
+                batch.append(request)
+                size += len(request.texts)
+                if not request.coalesce:
+                    return batch
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._pending.wait()
+
+            # Hold the batch open for the coalescing window unless it is already full
+            deadline = loop.time() + self.window
+            while self._queued_texts() < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._pending.clear()
+                try:
+                    await asyncio.wait_for(self._pending.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            # Waiting for a free slot lets late query requests jump ahead of bulk ones
+            await self._slots.acquire()
+            batch = self._take_batch()
+            if any(self._queues.values()):
+                self._pending.set()
+            else:
+                self._pending.clear()
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: List[_PendingRequest]):
+        try:
+            texts = [text for request in batch for text in request.texts]
+            self.batches_sent += 1
+            self.requests_coalesced += len(batch)
+            logger.debug(
+                f"Dispatching embedding batch of {len(texts)} texts "
+                f"from {len(batch)} requests"
+            )
+            try:
+                embeddings = await self.embed_fn(texts)
+            except Exception as e:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                return
+
+            # Fan results back out to the waiting callers
+            start = 0
+            for request in batch:
+                end = start + len(request.texts)
+                if not request.future.done():
+                    request.future.set_result(embeddings[start:end])
+                start = end
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        """
+        Stop the background worker and fail every queued request, so callers awaiting
+        submit() during shutdown do not hang. Batches already sent to the provider finish.
+        """
+        self._closed = True
+        error = RuntimeError("Embedding scheduler closed")
+        for queue in self._queues.values():
+            while queue:
+                request = queue.popleft()
+                if not request.future.done():
+                    request.future.set_exception(error)
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
@@ -3,7 +3,7 @@ from app.services.retrieval import RetrievalService
 from app.infrastructure.llm.ollama import OllamaService
 from app.utils.logging_setup import create_logger
 from app.core.config.vector_store import get_vector_store_settings
-from app.models.schemas.requests import DocumentFilter
+from app.models.schemas.requests import DocumentFilter, SearchProfile
 from app.models.schemas.retrieved_context import (
     RetrievedContext,
     RetrievedContextCollection,
@@ -23,10 +23,14 @@ logger = create_logger(__name__)
 
 
 class GenerationService:
-    def __init__(self):
+    def __init__(
+        self,
+        llm_service: Optional[OllamaService] = None,
+        retrieval_service: Optional[RetrievalService] = None,
+    ):
         # Provider-agnostic LLM service, defaults to OllamaService
-        self.llm_service = OllamaService()
-        self.retrieval_service = RetrievalService()
+        self.llm_service = llm_service or OllamaService()
+        self.retrieval_service = retrieval_service or RetrievalService()
         self.batch_size = 3  # Process 3 chunks at a time
         self.settings = get_vector_store_settings()
 
@@ -159,13 +163,18 @@ class GenerationService:
         num_chunks: int,
         min_score: float,
         filters: Optional[DocumentFilter] = None,
+        search_profile: Optional[SearchProfile] = None,
     ) -> RetrievedContextCollection:
         """Retrieve and process context chunks."""
         logger.debug(
             f"Retrieving {num_chunks} chunks for query with filters: {filters}"
         )
         chunks = await self.retrieval_service.retrieve_similar(
-            query=query, limit=num_chunks, min_score=min_score, filters=filters
+            query=query,
+            limit=num_chunks,
+            min_score=min_score,
+            filters=filters,
+            search_profile=search_profile,
         )
 
         contexts = RetrievedContextCollection()
@@ -239,6 +248,7 @@ class GenerationService:
         temperature: float = 0.7,
         min_score: float = 0.3,
         filters: Optional[DocumentFilter] = None,
+        search_profile: Optional[SearchProfile] = None,
     ):
         """Stream a response using RAG and Ollama streaming for real-time SSE."""
         try:
@@ -246,7 +256,7 @@ class GenerationService:
             self._validate_input(query, num_chunks, temperature)
 
             contexts = await self._retrieve_and_process_contexts(
-                query, num_chunks, min_score, filters
+                query, num_chunks, min_score, filters, search_profile
             )
 
             if not contexts:
@@ -282,6 +292,7 @@ class GenerationService:
         temperature: float = 0.7,
         min_score: float = 0.0,
         filters: Optional[DocumentFilter] = None,
+        search_profile: Optional[SearchProfile] = None,
     ) -> Dict[str, Any]:
         """
         Generate a response using RAG (Retrieval Augmented Generation)
@@ -295,7 +306,11 @@ class GenerationService:
                 f"Retrieving {num_chunks} chunks for query with filters: {filters}"
             )
             chunks = await self.retrieval_service.retrieve_similar(
-                query=query, limit=num_chunks, min_score=min_score, filters=filters
+                query=query,
+                limit=num_chunks,
+                min_score=min_score,
+                filters=filters,
+                search_profile=search_profile,
             )
 
             # Extract content from chunks and sort by relevance score
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.controllers.document_chunk_controller import DocumentChunkController
+from app.core.config.vector_store import get_vector_store_settings
+from app.infrastructure.vector_store.base import point_id
+from app.infrastructure.vector_store.qdrant_store import (
+    QdrantVectorStore,
+    versioned_collection_name,
+)
+from app.services.document_processing import DocumentProcessingService
+from app.services.embedding import (
+    EmbeddingsService,
+    create_embedding_provider,
+    get_embeddings_service,
+)
+from app.services.embedding_scheduler import EmbeddingPriority
+from app.services.served_model import reembed_checkpoint_path
+from app.utils.logging_setup import create_logger
+
+logger = create_logger(__name__)
+
+
+def list_reembed_checkpoints() -> List[Dict[str, Any]]:
+    """Read the progress of all known re-embedding jobs"""
+    checkpoint_dir = Path(get_vector_store_settings().REEMBED_CHECKPOINT_DIR)
+    if not checkpoint_dir.exists():
+        return []
+    checkpoints = []
+    for path in sorted(checkpoint_dir.glob("*.json")):
+        try:
+            checkpoints.append(json.loads(path.read_text()))
+        except Exception as e:
+            logger.warning(f"Skipping unreadable checkpoint {path}: {e}")
+    return checkpoints
+
+
+class ReembeddingService:
+    """
+    Re-embeds every document chunk with a new embedding model into a model-versioned
+    shadow collection while the live alias keeps serving searches, then swaps the alias.
+
+    Progress is checkpointed after every batch (keyed by the last chunk id), so an
+    interrupted job resumes where it stopped. Batches are throttled and yield to
+    pending query embeddings.
+    """
+
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        embedding_model: str,
+        vector_size: int,
+        provider_name: Optional[str] = None,
+    ):
+        self.db_session = db_session
+        self.settings = get_vector_store_settings()
+        self.embedding_model = embedding_model
+        self.vector_size = vector_size
+        self.provider_name = provider_name or self.settings.EMBEDDING_PROVIDER
+        self.chunk_controller = DocumentChunkController(db_session)
+        self.target_collection = versioned_collection_name(
+            self.settings.QDRANT_COLLECTION, embedding_model, vector_size
+        )
+        self.live_embeddings_service = get_embeddings_service()
+
+        if (
+            embedding_model == self.live_embeddings_service.model_name
+            and self.provider_name.lower() == self.settings.EMBEDDING_PROVIDER.lower()
+        ):
+            self.embeddings_service = self.live_embeddings_service
+        else:
+            self.embeddings_service = EmbeddingsService(
+                provider=create_embedding_provider(self.provider_name, embedding_model)
+            )
+        # Set once activate() hands the job's provider over to the live service
+        self._provider_handed_over = False
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return reembed_checkpoint_path(self.target_collection)
+
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not self.checkpoint_path.exists():
+            return None
+        return json.loads(self.checkpoint_path.read_text())
+
+    def _save_checkpoint(self, state: Dict[str, Any]):
+        """Write the checkpoint atomically so a crash never leaves a torn file"""
+        state["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(state, indent=2))
+        os.replace(tmp_path, self.checkpoint_path)
+
+    async def _yield_to_live_queries(self):
+        """Throttle between batches and wait while interactive queries are queued"""
+        await asyncio.sleep(self.settings.REEMBED_THROTTLE_SECONDS)
+        while self.live_embeddings_service.has_pending_queries():
+            await asyncio.sleep(0.05)
+
+    async def run(self, activate: bool = True) -> Dict[str, Any]:
+        """Fill the shadow collection from document_chunks, then optionally activate it"""
+        state = self.load_checkpoint() or {
+            "target_collection": self.target_collection,
+            "embedding_model": self.embedding_model,
+            "vector_size": self.vector_size,
+            "provider": self.provider_name,
+            "last_chunk_id": 0,
+            "processed": 0,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        }
+        state["status"] = "running"
+        state["error"] = None
+        state["total"] = await self.chunk_controller.count_chunks()
+        self._save_checkpoint(state)
+
+        shadow_store = QdrantVectorStore(
+            collection_name=self.target_collection, vector_size=self.vector_size
+        )
+        try:
+            await shadow_store.ensure_collection()
+            logger.info(
+                f"Re-embedding into {self.target_collection} from chunk id "
+                f"{state['last_chunk_id']} ({state['processed']}/{state['total']} done)"
+            )
+
+            # Keyset pagination also picks up chunks created while the job runs
+            while True:
+                rows = await self.chunk_controller.list_chunks_with_documents_after(
+                    state["last_chunk_id"], limit=self.settings.REEMBED_BATCH_SIZE
+                )
+                if not rows:
+                    break
+
+                texts = [chunk.content for chunk, _ in rows]
+                embeddings = await self.embeddings_service.get_embeddings(
+                    texts, priority=EmbeddingPriority.BULK
+                )
+                if embeddings.shape[1] != self.vector_size:
+                    raise ValueError(
+                        f"Model {self.embedding_model} produced {embeddings.shape[1]}-dimensional "
+                        f"vectors, expected {self.vector_size}"
+                    )
+
+                await shadow_store.bulk_store_vectors(
+                    vectors=embeddings,
+                    metadata=[
+                        DocumentProcessingService._prepare_chunk_metadata(
+                            chunk, document, lean=self.settings.QDRANT_LEAN_PAYLOADS
+                        )
+                        for chunk, document in rows
+                    ],
+                    ids=[point_id(str(chunk.uuid), self.embedding_model) for chunk, _ in rows],
+                )
+
+                state["last_chunk_id"] = rows[-1][0].id
+                state["processed"] += len(rows)
+                self._save_checkpoint(state)
+                logger.info(
+                    f"Re-embedded {state['processed']}/{state['total']} chunks "
+                    f"into {self.target_collection}"
+                )
+                await self._yield_to_live_queries()
+
+            state["status"] = "completed"
+            self._save_checkpoint(state)
+
+            if activate:
+                await self.activate(shadow_store)
+                state["status"] = "activated"
+                self._save_checkpoint(state)
+
+            return state
+        except Exception as e:
+            logger.error(f"Re-embedding into {self.target_collection} failed: {str(e)}")
+            state["status"] = "failed"
+            state["error"] = str(e)
+            self._save_checkpoint(state)
+            raise
+        finally:
+            await shadow_store.close()
+
+    async def activate(self, shadow_store: Optional[QdrantVectorStore] = None):
+        """
+        Swap the served alias to the shadow collection and embed queries with its model.
+        Other workers follow the alias on their own (see ServedModelMonitor).
+        """
+        owned_store = shadow_store is None
+        if owned_store:
+            shadow_store = QdrantVectorStore(
+                collection_name=self.target_collection, vector_size=self.vector_size
+            )
+        try:
+            await shadow_store.activate_collection(self.target_collection)
+        finally:
+            if owned_store:
+                await shadow_store.close()
+
+        if self.embeddings_service is not self.live_embeddings_service:
+            await self.live_embeddings_service.switch_provider(self.embeddings_service.provider)
+            self._provider_handed_over = True
+        logger.warning(
+            f"Activated {self.target_collection}. Set the embedding model and "
+            f"VECTOR_SIZE={self.vector_size} in the environment so new deployments start with it."
+        )
+
+    async def close(self):
+        """Release the job's own embeddings service, keeping a provider the live service now uses"""
+        if self.embeddings_service is not self.live_embeddings_service:
+            await self.embeddings_service.close(close_provider=not self._provider_handed_over)
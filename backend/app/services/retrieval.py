@@ -1,25 +1,137 @@
+import asyncio
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import date
-from app.services.embedding import EmbeddingsService
-from app.infrastructure.vector_store.qdrant_store import QdrantVectorStore
+
+import numpy as np
+
+from app.core.config.vector_store import get_vector_store_settings
+from app.infrastructure.cache.embedding_cache import make_cache_key
+from app.services.chunk_content import ChunkContentStore, get_chunk_content_store
+from app.services.embedding import EmbeddingsService, get_embeddings_service
+from app.services.embedding_scheduler import EmbeddingPriority
+from app.services.served_model import ServedModelMonitor
+from app.utils.memory_cache import LRUCache
+from app.infrastructure.vector_store.base import BaseVectorStore, point_id
+from app.infrastructure.vector_store.factory import create_vector_store
 from app.utils.logging_setup import create_logger
-from app.models.schemas.requests import DocumentFilter
+from app.models.schemas.requests import DocumentFilter, RetrievalRequest, SearchProfile
 from app.models.schemas.search_result import SearchResult  # Add this import
 
 logger = create_logger(__name__)
 
+REQUIRED_PAYLOAD_FIELDS = ("chunk_id", "document_id", "uuid")
+
+
+@dataclass
+class SearchPage:
+    """One page of search results"""
+    results: List[SearchResult]
+    total_results: int  # Exact on the last page, Qdrant's estimate of filter matches otherwise
+    next_cursor: Optional[str]
+
+
+def _request_fingerprint(request: RetrievalRequest) -> str:
+    """Identifies the query a cursor belongs to, so it cannot be replayed on another one"""
+    state = {
+        "query": request.query,
+        "filters": request.filters.model_dump(exclude_none=True) if request.filters else None,
+        "min_score": request.min_score,
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def encode_cursor(offset: int, profile: SearchProfile, fingerprint: str) -> str:
+    """Opaque page cursor; pins the search profile so every page is ranked the same way"""
+    state = json.dumps({"o": offset, "p": profile.value, "f": fingerprint}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(state.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> Tuple[int, SearchProfile]:
+    """Return (offset, profile) of a cursor; raises ValueError for foreign or broken cursors"""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset, profile = int(state["o"]), SearchProfile(state["p"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if state.get("f") != fingerprint or offset < 0:
+        raise ValueError("Cursor does not belong to this query")
+    return offset, profile
+
+
+@lru_cache(maxsize=1)
+def get_query_embedding_cache() -> LRUCache:
+    """
+    Get the shared in-memory cache of query embeddings
+    """
+    settings = get_vector_store_settings()
+    return LRUCache(
+        maxsize=settings.QUERY_EMBEDDING_CACHE_SIZE,
+        ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+    )
+
+
 class RetrievalService:
-    def __init__(self):
-        self.embeddings_service = EmbeddingsService()
-        self.vector_store = QdrantVectorStore()
+    def __init__(
+        self,
+        embeddings_service: Optional[EmbeddingsService] = None,
+        vector_store: Optional[BaseVectorStore] = None,
+        content_store: Optional[ChunkContentStore] = None,
+    ):
+        self.embeddings_service = embeddings_service or get_embeddings_service()
+        self.vector_store = vector_store or create_vector_store()
+        self.content_store = content_store or get_chunk_content_store()
+        self.query_cache = get_query_embedding_cache()
+        self.served_model = ServedModelMonitor(self.embeddings_service, self.vector_store)
+
+    async def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a search query, reusing the embedding while the same query is re-issued
+        with different filters or pages
+        """
+        await self.served_model.sync()
+        key = make_cache_key(self.embeddings_service.model_name, query)
+        embedding = self.query_cache.get(key)
+        if embedding is None:
+            # Queries skip the persistent content cache; this TTL cache covers re-issues
+            embedding = await self.embeddings_service.get_embedding(
+                query, priority=EmbeddingPriority.QUERY, use_cache=False
+            )
+            # A row of the merged provider batch; copied so the cache does not pin the batch
+            embedding = embedding.copy()
+            self.query_cache.set(key, embedding)
+        return embedding
+
+    async def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed several queries as one (len(queries), dim) matrix; queries missing from the
+        query cache are embedded together in a single provider call
+        """
+        await self.served_model.sync()
+        keys = [make_cache_key(self.embeddings_service.model_name, query) for query in queries]
+        embeddings = [self.query_cache.get(key) for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            computed = await self.embeddings_service.get_embeddings(
+                [queries[i] for i in missing], priority=EmbeddingPriority.QUERY, use_cache=False
+            )
+            for i, embedding in zip(missing, computed):
+                embedding = embedding.copy()
+                self.query_cache.set(keys[i], embedding)
+                embeddings[i] = embedding
+        return np.stack(embeddings)
 
     async def retrieve_similar(
         self,
         query: str,
         limit: int = 5,
         min_score: float = 0.3,
-        filters: Optional[DocumentFilter] = None
+        filters: Optional[DocumentFilter] = None,
+        search_profile: Optional[SearchProfile] = None,
     ) -> List[SearchResult]:
         """
         Retrieve similar documents based on query and filters
@@ -28,49 +140,149 @@ class RetrievalService:
             query: The search query text
             limit: Maximum number of results to return
             filters: Optional DocumentFilter for refining search results
+            search_profile: Optional speed/recall profile, chosen from the filters when omitted
             
         Returns:
             List[SearchResult]: List of search results with their metadata and scores
         """
         try:
             # Generate embedding for query
-            query_embedding = (await self.embeddings_service.get_embeddings([query]))[0]
+            query_embedding = await self.embed_query(query)
 
             # Search for similar vectors
             search_results_list = await self.vector_store.search_similar(
                 query_vector=query_embedding,
                 min_score=min_score,
                 limit=limit,
-                filters=filters  # Pass the DocumentFilter object directly
+                filters=filters,  # Pass the DocumentFilter object directly
+                profile=search_profile,
             )
 
-            # Process and validate results
-            processed_results = []
-            for result in search_results_list:
-                # Skip results with missing required metadata
-                payload = result.payload
-                if not all(k in payload for k in ["chunk_id", "document_id", "uuid"]):
-                    continue
-                
-                processed_results.append(result)
-
-            return processed_results
+            # Skip results with missing required metadata
+            processed_results = self._valid_results(search_results_list)
+
+            # Lean payloads carry no text; fetch the page's contents in one query
+            return await self.content_store.hydrate(processed_results)
         except Exception as e:
             logger.error(f"Error retrieving similar documents: {str(e)}")
             raise
 
+    async def retrieve_page(self, request: RetrievalRequest) -> SearchPage:
+        """
+        Retrieve one page of results. Offset and score threshold are applied by the vector
+        store; a cursor from the previous page takes precedence over the request offset.
+        """
+        try:
+            offset, profile, fingerprint = await self._page_state(request)
+            query_embedding = await self.embed_query(request.query)
+            # One extra result tells whether another page exists
+            results = await self.vector_store.search_similar(
+                query_vector=query_embedding,
+                limit=request.limit + 1,
+                min_score=request.min_score,
+                filters=request.filters,
+                profile=profile,
+                offset=offset,
+            )
+            page = self._valid_results(results[: request.limit])
+            await self.content_store.hydrate(page)
+            return await self._to_page(request, results, page, offset, profile, fingerprint)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error retrieving page of similar documents: {str(e)}")
+            raise
+
+    async def retrieve_similar_batch(
+        self, requests: List[RetrievalRequest]
+    ) -> List[SearchPage]:
+        """
+        Retrieve result pages for several queries with one embedding call and one vector
+        search request, keeping each query's limit, offset, score threshold, filters and profile
+        """
+        try:
+            states = await asyncio.gather(*(self._page_state(r) for r in requests))
+            query_embeddings = await self.embed_queries([r.query for r in requests])
+            batch_results = await self.vector_store.search_similar_batch(
+                query_vectors=query_embeddings,
+                limits=[r.limit + 1 for r in requests],
+                min_scores=[r.min_score for r in requests],
+                filters=[r.filters for r in requests],
+                profiles=[profile for _, profile, _ in states],
+                offsets=[offset for offset, _, _ in states],
+            )
+
+            pages = [
+                self._valid_results(results[: r.limit])
+                for r, results in zip(requests, batch_results)
+            ]
+            # Hydrate lean payloads of all queries with a single content lookup
+            await self.content_store.hydrate([result for page in pages for result in page])
+            return list(await asyncio.gather(*(
+                self._to_page(r, results, page, offset, profile, fingerprint)
+                for r, results, page, (offset, profile, fingerprint)
+                in zip(requests, batch_results, pages, states)
+            )))
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error retrieving similar documents in batch: {str(e)}")
+            raise
+
+    async def _page_state(self, request: RetrievalRequest) -> Tuple[int, SearchProfile, str]:
+        """Offset, resolved search profile and fingerprint of a page request"""
+        fingerprint = _request_fingerprint(request)
+        offset, profile = request.offset, request.search_profile
+        if request.cursor:
+            offset, profile = decode_cursor(request.cursor, fingerprint)
+        profile = await self.vector_store.resolve_search_profile(profile, request.filters)
+        return offset, profile, fingerprint
+
+    async def _to_page(
+        self,
+        request: RetrievalRequest,
+        fetched: List[SearchResult],
+        page: List[SearchResult],
+        offset: int,
+        profile: SearchProfile,
+        fingerprint: str,
+    ) -> SearchPage:
+        if len(fetched) <= request.limit:
+            return SearchPage(results=page, total_results=offset + len(fetched), next_cursor=None)
+        # Not the last page: estimate from filter cardinality, at least what is known to exist
+        estimate = await self.vector_store.estimate_matches(request.filters)
+        return SearchPage(
+            results=page,
+            total_results=max(estimate, offset + len(fetched)),
+            next_cursor=encode_cursor(offset + request.limit, profile, fingerprint),
+        )
+
+    @staticmethod
+    def _valid_results(results: List[SearchResult]) -> List[SearchResult]:
+        """Drop results with missing required metadata"""
+        return [r for r in results if all(k in r.payload for k in REQUIRED_PAYLOAD_FIELDS)]
+
     async def store_embeddings(
         self,
         texts: List[str],
         metadata: List[Dict[str, Any]],
         ids: List[str] = None,
+        embeddings: Optional[np.ndarray] = None,
     ):
         """
-        Generate and store embeddings for new documents
+        Generate and store embeddings for new documents.
+        Pass precomputed embeddings to skip the embedding step. Without explicit ids,
+        point ids are derived from each metadata "uuid" so retried upserts are idempotent.
         """
         try:
+            if ids is None:
+                ids = self.point_ids_for(metadata)
+
             # Generate embeddings for all texts
-            embeddings = await self.embeddings_service.get_embeddings(texts)
+            if embeddings is None:
+                embeddings = await self.embeddings_service.get_embeddings(
+                    texts, priority=EmbeddingPriority.BULK
+                )
 
             # Store embeddings in vector store
             await self.vector_store.store_vectors(
@@ -84,6 +296,17 @@ class RetrievalService:
             logger.error(f"Error storing embeddings: {str(e)}")
             raise
     
+    def point_id_for(self, chunk_uuid: str) -> str:
+        """Point id of a chunk embedded with the current embedding model"""
+        return point_id(chunk_uuid, self.embeddings_service.model_name)
+
+    def point_ids_for(self, metadata: List[Dict[str, Any]]) -> List[str]:
+        """Point ids of chunks from their metadata "uuid" fields"""
+        missing = [i for i, item in enumerate(metadata) if not item.get("uuid")]
+        if missing:
+            raise ValueError(f"Metadata at positions {missing} has no 'uuid' to derive point ids from")
+        return [self.point_id_for(str(item["uuid"])) for item in metadata]
+
     async def update_payloads(
         self,
         ids: List[str],
@@ -93,15 +316,31 @@ class RetrievalService:
         Update payloads for existing vectors in the vector store
         """
         try:
-            await self.vector_store.update_payloads(
+            return await self.vector_store.update_payloads(
                 ids=ids,
                 payloads=payloads,
             )
-            return True
         except Exception as e:
             logger.error(f"Error updating payloads: {str(e)}")
             raise
 
+    async def update_payloads_by_filter(
+        self,
+        filters: DocumentFilter,
+        payload: Dict[str, Any],
+    ):
+        """
+        Apply one payload delta to all vectors matching the filters
+        """
+        try:
+            await self.vector_store.update_payloads_by_filter(
+                filters=filters,
+                payload=payload,
+            )
+        except Exception as e:
+            logger.error(f"Error updating payloads by filter: {str(e)}")
+            raise
+
 
     async def search_similar_chunks(
         self, query_text: str, limit: int = 5
@@ -116,10 +355,3 @@ class RetrievalService:
         except Exception as e:
             logger.error(f"Error searching similar chunks: {str(e)}")
             raise
-
-@lru_cache(maxsize=128)
-def get_retrieval_service() -> RetrievalService:
-    """
-    Get a singleton instance of the RetrievalService
-    """
-    return RetrievalService()
\ No newline at end of file
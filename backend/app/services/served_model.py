@@ -0,0 +1,95 @@
+import json
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app.core.config.vector_store import get_vector_store_settings
+from app.infrastructure.vector_store.base import BaseVectorStore
+from app.infrastructure.vector_store.qdrant_store import versioned_collection_name
+from app.services.embedding import EmbeddingsService, create_embedding_provider
+from app.utils.logging_setup import create_logger
+
+logger = create_logger(__name__)
+
+
+def reembed_checkpoint_path(target_collection: str) -> Path:
+    """Checkpoint of the re-embedding job that fills target_collection"""
+    return Path(get_vector_store_settings().REEMBED_CHECKPOINT_DIR) / f"{target_collection}.json"
+
+
+def collection_embedding_model(collection_name: str) -> Optional[Tuple[str, str]]:
+    """
+    (provider, embedding model) whose vectors fill a collection: recorded by the re-embedding
+    job that built it, or the configured model for its own versioned collection. None if unknown.
+    """
+    settings = get_vector_store_settings()
+    path = reembed_checkpoint_path(collection_name)
+    if path.exists():
+        try:
+            state = json.loads(path.read_text())
+            if state.get("status") in ("completed", "activated"):
+                return state["provider"], state["embedding_model"]
+        except Exception as e:
+            logger.warning(f"Unreadable re-embedding checkpoint {path}: {e}")
+    configured = versioned_collection_name(
+        settings.QDRANT_COLLECTION, settings.EMBEDDING_MODEL, settings.VECTOR_SIZE
+    )
+    if collection_name == configured:
+        return settings.EMBEDDING_PROVIDER, settings.EMBEDDING_MODEL
+    return None
+
+
+class ServedModelMonitor:
+    """
+    Keeps this worker's embedding model in step with the collection behind the served alias.
+
+    Activating a re-embedded collection moves the alias for every worker at once, but swaps
+    the embedding provider only in the process that ran the job. Every other worker (and
+    every worker started later with the old settings) notices the new alias target here
+    and loads the model recorded for it, at most SERVED_MODEL_CHECK_SECONDS after the swap.
+    """
+
+    def __init__(
+        self,
+        embeddings_service: EmbeddingsService,
+        vector_store: BaseVectorStore,
+        check_interval_seconds: Optional[float] = None,
+    ):
+        self.embeddings_service = embeddings_service
+        self.vector_store = vector_store
+        self.check_interval_seconds = (
+            get_vector_store_settings().SERVED_MODEL_CHECK_SECONDS
+            if check_interval_seconds is None
+            else check_interval_seconds
+        )
+        self.served_collection: Optional[str] = None
+        self._next_check = 0.0
+
+    async def sync(self):
+        """Switch the embedding provider if the served alias moved since the last check"""
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        # Claimed before awaiting, so concurrent callers do not all query the alias
+        self._next_check = now + self.check_interval_seconds
+        try:
+            target = await self.vector_store.get_alias_target(self.vector_store.collection_name)
+        except Exception as e:
+            logger.warning(f"Could not read the served alias, keeping the current model: {str(e)}")
+            return
+        if target is None or target == self.served_collection:
+            return
+
+        served = collection_embedding_model(target)
+        if served is None:
+            logger.error(
+                f"Served collection {target} has no recorded embedding model; queries keep "
+                f"using {self.embeddings_service.model_name}"
+            )
+        else:
+            provider_name, embedding_model = served
+            if embedding_model != self.embeddings_service.model_name:
+                await self.embeddings_service.switch_provider(
+                    create_embedding_provider(provider_name, embedding_model)
+                )
+        self.served_collection = target
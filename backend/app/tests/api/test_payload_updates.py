@@ -0,0 +1,88 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints import embeddings as endpoint
+from app.api.v1.endpoints.embeddings import PayloadUpdateRequest, update_payloads
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingSession:
+    def __init__(self):
+        self.committed = False
+        self.rolled_back = False
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+class RecordingRetrieval:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = []
+
+    async def update_payloads_by_filter(self, filters, payload):
+        if self.fail:
+            raise RuntimeError("vector store unavailable")
+        self.calls.append((filters, payload))
+
+
+@pytest.fixture
+def document_updates(monkeypatch):
+    calls = []
+
+    class RecordingController:
+        def __init__(self, db):
+            pass
+
+        async def update_documents_by_filter(self, filters, values):
+            calls.append((filters, values))
+            return 2
+
+    monkeypatch.setattr(endpoint, "DocumentController", RecordingController)
+    return calls
+
+
+async def test_document_fields_are_written_to_documents_and_vector_store(document_updates):
+    db, retrieval = RecordingSession(), RecordingRetrieval()
+    request = PayloadUpdateRequest(
+        filters={"department": "IT"}, payload={"department": "Information Technology", "reviewed": True}
+    )
+
+    result = await update_payloads(request, db=db, retrieval_service=retrieval)
+
+    assert document_updates[0][1] == {"department": "Information Technology"}
+    assert retrieval.calls[0][1] == {"department": "Information Technology", "reviewed": True}
+    assert db.committed
+    assert result["updated_documents"] == 2
+
+
+async def test_documents_are_rolled_back_when_the_vector_store_fails(document_updates):
+    db = RecordingSession()
+    request = PayloadUpdateRequest(filters={"department": "IT"}, payload={"department": "Ops"})
+
+    with pytest.raises(HTTPException) as error:
+        await update_payloads(request, db=db, retrieval_service=RecordingRetrieval(fail=True))
+
+    assert error.value.status_code == 500
+    assert db.rolled_back and not db.committed
+
+
+@pytest.mark.parametrize("request_body", [
+    {"filters": {"department": "IT"}, "payload": {"document_id": 7}},
+    {"updates": [{"chunk_uuid": "c-1", "payload": {"uuid": "other"}}]},
+    {"updates": [{"chunk_uuid": "c-1", "payload": {"chunk_id": 3}}]},
+    {"updates": [{"chunk_uuid": "c-1", "payload": {"department": "Ops"}}]},
+    {"filters": {"department": "IT"}, "payload": {"division": ""}},
+])
+async def test_rejected_updates_touch_nothing(document_updates, request_body):
+    retrieval = RecordingRetrieval()
+
+    with pytest.raises(HTTPException) as error:
+        await update_payloads(PayloadUpdateRequest(**request_body), db=RecordingSession(), retrieval_service=retrieval)
+
+    assert error.value.status_code == 400
+    assert not document_updates and not retrieval.calls
@@ -0,0 +1,106 @@
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.controllers.document_chunk_controller import DocumentChunkController
+from app.models.database import Document, DocumentChunk
+
+pytestmark = pytest.mark.anyio
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+class SyncSessionAdapter:
+    """
+    The part of AsyncSession that bulk_insert_chunks uses, over a synchronous SQLite
+    session, since no async SQLite driver is installed
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_bind(self):
+        return self.session.get_bind()
+
+    def add_all(self, instances):
+        self.session.add_all(instances)
+
+    async def execute(self, *args, **kwargs):
+        return self.session.execute(*args, **kwargs)
+
+    async def flush(self):
+        self.session.flush()
+
+    async def rollback(self):
+        self.session.rollback()
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Document.metadata.create_all(engine, tables=[Document.__table__, DocumentChunk.__table__])
+    with Session(engine) as session:
+        session.add(Document(id=1, uuid="doc-1", title="Manual", department="d", division="v", location="x"))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def make_chunks(count: int):
+    return [
+        DocumentChunk(
+            uuid=str(uuid.uuid4()),
+            document_id=1,
+            content=f"chunk {i}",
+            document_page=i // 10 + 1,
+            chunk_metadata={"index": i},
+        )
+        for i in range(count)
+    ]
+
+
+def stored_ids(session: Session, chunks) -> list:
+    rows = dict(session.execute(select(DocumentChunk.uuid, DocumentChunk.id)).all())
+    return [rows[chunk.uuid] for chunk in chunks]
+
+
+@pytest.mark.parametrize("batch_size", [1000, 7])
+async def test_ids_follow_chunk_order(session, batch_size):
+    chunks = make_chunks(25)
+    controller = DocumentChunkController(SyncSessionAdapter(session))
+
+    ids = await controller.bulk_insert_chunks(chunks, batch_size=batch_size)
+
+    assert ids == stored_ids(session, chunks)
+    assert [chunk.id for chunk in chunks] == ids
+    assert len(set(ids)) == len(chunks)
+    stored = session.execute(select(DocumentChunk).where(DocumentChunk.id == ids[12])).scalar_one()
+    assert stored.content == "chunk 12" and stored.chunk_metadata == {"index": 12}
+
+
+async def test_fallback_without_ordered_returning(session, monkeypatch):
+    dialect = session.get_bind().dialect
+    monkeypatch.setattr(dialect, "insert_executemany_returning_sort_by_parameter_order", False)
+    chunks = make_chunks(5)
+
+    ids = await DocumentChunkController(SyncSessionAdapter(session)).bulk_insert_chunks(chunks)
+
+    assert ids == stored_ids(session, chunks)
+
+
+async def test_insert_is_left_uncommitted(session):
+    chunks = make_chunks(3)
+    await DocumentChunkController(SyncSessionAdapter(session)).bulk_insert_chunks(chunks)
+    session.rollback()
+    assert session.execute(select(DocumentChunk)).all() == []
+
+
+async def test_no_chunks_is_a_no_op(session):
+    assert await DocumentChunkController(SyncSessionAdapter(session)).bulk_insert_chunks([]) == []
@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.controllers.document_controller import DocumentController
+from app.models.database import Document, DocumentChunk
+from app.models.schemas.requests import DocumentFilter
+from app.tests.repositories.test_document_chunk_bulk_insert import SyncSessionAdapter
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Document.metadata.create_all(engine, tables=[Document.__table__, DocumentChunk.__table__])
+    with Session(engine) as session:
+        session.add_all([
+            Document(id=1, uuid="doc-1", title="manual", department="it", division="eng", location="x"),
+            Document(id=2, uuid="doc-2", title="guide", department="it", division="ops", location="x"),
+            Document(id=3, uuid="doc-3", title="policy", department="hr", division="eng", location="x"),
+        ])
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def departments(session: Session) -> dict:
+    return dict(session.execute(select(Document.id, Document.department)).all())
+
+
+async def test_updates_documents_matching_the_payload_filter(session):
+    controller = DocumentController(SyncSessionAdapter(session))
+
+    updated = await controller.update_documents_by_filter(
+        DocumentFilter(department="IT", division=["ENG"]), {"department": "information technology"}
+    )
+
+    assert updated == 1
+    assert departments(session) == {1: "information technology", 2: "it", 3: "hr"}
+
+
+async def test_document_ids_filter_by_primary_key(session):
+    controller = DocumentController(SyncSessionAdapter(session))
+
+    assert await controller.update_documents_by_filter(DocumentFilter(document_id=[2, 3]), {"division": "x"}) == 2
+
+
+async def test_empty_filter_is_rejected(session):
+    controller = DocumentController(SyncSessionAdapter(session))
+
+    with pytest.raises(ValueError):
+        await controller.update_documents_by_filter(DocumentFilter(), {"department": "x"})
+    assert departments(session) == {1: "it", 2: "it", 3: "hr"}
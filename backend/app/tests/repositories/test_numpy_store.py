@@ -0,0 +1,152 @@
+import numpy as np
+import pytest
+from qdrant_client.models import FieldCondition, Filter
+
+from app.infrastructure.vector_store.numpy_store import INITIAL_CAPACITY, NumpyVectorStore
+from app.infrastructure.vector_store.qdrant_store import QdrantVectorStore
+from app.models.schemas.requests import DocumentFilter
+
+pytestmark = pytest.mark.anyio
+
+DIM = 8
+
+# Payloads as ingestion writes them: document.division/department stored as entered (filter
+# values are lowercased, so "Piping" is not matched by a division filter), integer document ids
+PAYLOADS = [
+    {"document_id": 1, "division": "mechanical", "department": "rotating", "document_name": "pumps"},
+    {"document_id": 1, "division": "mechanical", "department": "static", "document_name": "pumps"},
+    {"document_id": 2, "division": "piping", "department": "static", "document_name": "flanges"},
+    {"document_id": 3, "division": "instrumentation", "department": "control", "document_name": "transmitters"},
+    {"document_id": 4, "division": "Piping", "department": "static", "document_name": "valves"},
+    {"document_id": 5, "department": "static", "document_name": "gaskets"},
+]
+
+FILTERS = [
+    DocumentFilter(division="Mechanical"),
+    DocumentFilter(division="PIPING"),
+    DocumentFilter(division=["piping", "Instrumentation"]),
+    DocumentFilter(document_id=1),
+    DocumentFilter(document_id=[2, 3, 99]),
+    DocumentFilter(document_id=[1, 2], department="static"),
+    DocumentFilter(department="static", document_name=["Flanges", "gaskets"]),
+    DocumentFilter(division="mechanical", document_id=3),
+]
+
+
+def matches(condition, payload) -> bool:
+    """Evaluate a Qdrant filter built by _build_filter the way Qdrant does"""
+    if isinstance(condition, FieldCondition):
+        return payload.get(condition.key) == condition.match.value
+    if isinstance(condition, Filter):
+        must = all(matches(c, payload) for c in condition.must or [])
+        should = any(matches(c, payload) for c in condition.should) if condition.should else True
+        return must and should
+    raise TypeError(f"Unexpected condition {condition!r}")
+
+
+def payload(i: int, **fields) -> dict:
+    """Payload with the fields SearchResult requires"""
+    return {"chunk_id": i, "uuid": f"chunk-{i}", "content": f"chunk {i}", **fields}
+
+
+def vectors_for(count: int, seed: int = 0) -> np.ndarray:
+    """Non-negative vectors, so every cosine score clears min_score=0"""
+    return np.abs(np.random.default_rng(seed).normal(size=(count, DIM))).astype(np.float32)
+
+
+@pytest.fixture
+async def store(tmp_path):
+    store = NumpyVectorStore(collection_name="test", vector_size=DIM, data_dir=str(tmp_path))
+    await store.store_vectors(
+        vectors_for(len(PAYLOADS)),
+        [payload(i, **p) for i, p in enumerate(PAYLOADS)],
+        ids=[f"p{i}" for i in range(len(PAYLOADS))],
+    )
+    yield store
+    await store.close()
+
+
+@pytest.mark.parametrize("filters", FILTERS, ids=lambda f: str(f.model_dump(exclude_none=True)))
+async def test_filters_match_qdrant_semantics(store, filters):
+    qdrant_filter = QdrantVectorStore(collection_name="test", vector_size=DIM)._build_filter(filters)
+    expected = {f"p{i}" for i, p in enumerate(PAYLOADS) if matches(qdrant_filter, p)}
+
+    results = await store.search_similar(vectors_for(1, seed=1)[0], limit=10, min_score=0.0, filters=filters)
+    assert {r.id for r in results} == expected
+    assert await store.estimate_matches(filters) == len(expected)
+
+
+async def test_top_k_and_offset_follow_exact_ranking(store):
+    query = vectors_for(1, seed=1)[0]
+    stored = vectors_for(len(PAYLOADS))
+    scores = stored @ query / (np.linalg.norm(stored, axis=1) * np.linalg.norm(query))
+    ranking = [f"p{i}" for i in np.argsort(-scores, kind="stable")]
+
+    top = await store.search_similar(query, limit=2, min_score=0.0)
+    assert [r.id for r in top] == ranking[:2]
+    page = await store.search_similar(query, limit=2, min_score=0.0, offset=2)
+    assert [r.id for r in page] == ranking[2:4]
+    assert await store.search_similar(query, limit=2, min_score=0.0, offset=len(ranking)) == []
+
+
+async def test_batch_search_matches_single_searches(store):
+    queries = vectors_for(2, seed=2)
+    filters = [None, DocumentFilter(department="static")]
+    batch = await store.search_similar_batch(
+        queries, limits=[3, 2], min_scores=[0.0, 0.0], filters=filters, profiles=[None, None], offsets=[1, 0]
+    )
+    for i, (limit, offset) in enumerate([(3, 1), (2, 0)]):
+        single = await store.search_similar(queries[i], limit=limit, min_score=0.0, filters=filters[i], offset=offset)
+        assert [r.id for r in batch[i]] == [r.id for r in single]
+
+
+async def test_update_payloads_by_filter(store):
+    await store.update_payloads_by_filter(DocumentFilter(document_id=[1, 2]), {"department": "archived"})
+    assert await store.estimate_matches(DocumentFilter(department="archived")) == 3
+    # The merged payload keeps its other fields
+    assert await store.estimate_matches(DocumentFilter(department="archived", division="mechanical")) == 2
+    with pytest.raises(ValueError):
+        await store.update_payloads_by_filter(DocumentFilter(), {"department": "archived"})
+
+
+async def test_upsert_overwrites_existing_ids(store):
+    await store.store_vectors(vectors_for(1, seed=3), [payload(0, document_id=9)], ids=["p0"])
+    assert store.count == len(PAYLOADS)
+    assert await store.estimate_matches(DocumentFilter(document_id=1)) == 1
+    assert await store.estimate_matches(DocumentFilter(document_id=9)) == 1
+
+
+async def test_reopen_restores_vectors_and_payloads(tmp_path):
+    store = NumpyVectorStore(collection_name="test", vector_size=DIM, data_dir=str(tmp_path))
+    count = INITIAL_CAPACITY + 10  # Forces the matrix to grow once
+    vectors = vectors_for(count)
+    await store.store_vectors(
+        vectors, [payload(i, document_id=i % 3 + 1) for i in range(count)], ids=[f"p{i}" for i in range(count)]
+    )
+    await store.update_payloads(["p1"], [{"division": "piping"}])
+    await store.close()
+
+    reopened = NumpyVectorStore(collection_name="test", vector_size=DIM, data_dir=str(tmp_path))
+    await reopened.ensure_collection()
+    assert reopened.count == count
+    assert await reopened.estimate_matches(DocumentFilter(document_id=1)) == (count + 2) // 3
+    results = await reopened.search_similar(vectors[-1], limit=1, min_score=0.0)
+    assert results[0].id == f"p{count - 1}"
+    assert await reopened.estimate_matches(DocumentFilter(division="piping", document_id=2)) == 1
+    await reopened.close()
+
+
+async def test_snapshot_round_trip(store, tmp_path):
+    query = vectors_for(1, seed=4)[0]
+    before = await store.search_similar(query, limit=10, min_score=0.0)
+    store.save_snapshot(str(tmp_path / "snapshot"))
+
+    await store.update_payloads_by_filter(DocumentFilter(division="piping"), {"division": "changed"})
+    await store.store_vectors(vectors_for(1, seed=5), [payload(99, document_id=7)], ids=["extra"])
+
+    store.load_snapshot(str(tmp_path / "snapshot"))
+    after = await store.search_similar(query, limit=10, min_score=0.0)
+    assert store.count == len(PAYLOADS)
+    assert [(r.id, r.payload) for r in after] == [(r.id, r.payload) for r in before]
+    np.testing.assert_allclose([r.score for r in after], [r.score for r in before], rtol=1e-6)
+    assert await store.estimate_matches(DocumentFilter(division="changed")) == 0
@@ -0,0 +1,46 @@
+import uuid
+
+import pytest
+
+from app.infrastructure.vector_store.base import BaseVectorStore, point_id
+
+CHUNK_UUID = "3f2a9c1e-0000-4000-8000-000000000001"
+
+
+def test_point_id_is_stable_across_processes():
+    # Pinned: a different value means existing points would be duplicated on re-ingest
+    assert point_id(CHUNK_UUID, "nomic-embed-text:latest") == "4890762b-5d17-517c-b742-e7f0b90935ab"
+
+
+def test_point_id_is_a_uuid5():
+    assert uuid.UUID(point_id(CHUNK_UUID, "model")).version == 5
+
+
+def test_point_id_depends_on_chunk_and_model():
+    other_chunk = "3f2a9c1e-0000-4000-8000-000000000002"
+    ids = {
+        point_id(CHUNK_UUID, "model-a"),
+        point_id(CHUNK_UUID, "model-b"),
+        point_id(other_chunk, "model-a"),
+    }
+    assert len(ids) == 3
+    assert point_id(CHUNK_UUID, "model-a") == point_id(CHUNK_UUID, "model-a")
+
+
+@pytest.mark.anyio
+async def test_point_ids_for_uses_metadata_uuids(retrieval_service):
+    model = retrieval_service.embeddings_service.model_name
+    ids = retrieval_service.point_ids_for([{"uuid": CHUNK_UUID}, {"uuid": uuid.UUID(CHUNK_UUID)}])
+    assert ids == [point_id(CHUNK_UUID, model)] * 2
+
+
+@pytest.mark.anyio
+async def test_point_ids_for_rejects_missing_uuids(retrieval_service):
+    with pytest.raises(ValueError, match=r"\[1\]"):
+        retrieval_service.point_ids_for([{"uuid": CHUNK_UUID}, {"chunk_id": 2}])
+
+
+@pytest.mark.parametrize("ids", [None, [], ["a"], ["a", "b", "c"]])
+def test_explicit_ids_must_match_vector_count(ids):
+    with pytest.raises(ValueError, match="Expected 2 point ids"):
+        BaseVectorStore._point_ids(ids, 2)
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from app.infrastructure.cache.embedding_cache import EmbeddingCache, make_cache_key
+from app.utils import memory_cache
+from app.utils.memory_cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_ttl_expiry(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(memory_cache.time, "monotonic", clock)
+    cache = LRUCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", 1)
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a", "expired") == "expired"
+    assert len(cache) == 0
+
+
+def test_lru_set_refreshes_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(memory_cache.time, "monotonic", clock)
+    cache = LRUCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", 1)
+    clock.now += 50
+    cache.set("a", 2)
+    clock.now += 50
+    assert cache.get("a") == 2
+
+
+def test_lru_stats():
+    cache = LRUCache(maxsize=10)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_lru_rejects_empty_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_cache_key_normalizes_text_and_namespaces_model():
+    assert make_cache_key("m", "hello   world\n") == make_cache_key("m", "hello world")
+    assert make_cache_key("m", "hello") != make_cache_key("other", "hello")
+
+
+@pytest.mark.anyio
+async def test_embedding_cache_persists_to_disk(tmp_path):
+    vectors = {"k1": np.arange(4, dtype=np.float32), "k2": np.ones(4, dtype=np.float32)}
+    cache = EmbeddingCache(str(tmp_path), memory_size=10)
+    await cache.set_many(vectors)
+
+    # A fresh instance (new process) only has the disk tier
+    reopened = EmbeddingCache(str(tmp_path), memory_size=10)
+    found = await reopened.get_many(["k1", "k2", "missing"])
+    assert set(found) == {"k1", "k2"}
+    np.testing.assert_array_equal(found["k1"], vectors["k1"])
+    assert found["k1"].dtype == np.float32
+    stats = reopened.stats()
+    assert (stats["disk_hits"], stats["misses"]) == (2, 1)
+
+    # Disk hits are promoted to memory
+    await reopened.get_many(["k1"])
+    assert reopened.stats()["memory_hits"] == 1
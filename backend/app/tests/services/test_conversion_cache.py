@@ -0,0 +1,107 @@
+import os
+import time
+
+import pytest
+from docling_core.types.doc.document import DoclingDocument
+from docling_core.types.doc.labels import DocItemLabel
+
+from app.infrastructure.cache import conversion_cache
+from app.infrastructure.cache.conversion_cache import (
+    CACHE_SUFFIX,
+    ConversionCache,
+    file_sha256,
+    make_conversion_key,
+)
+
+
+def document(text: str = "hello") -> DoclingDocument:
+    doc = DoclingDocument(name="manual")
+    doc.add_text(label=DocItemLabel.TEXT, text=text)
+    return doc
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConversionCache(str(tmp_path / "conversions"), max_size_mb=1, max_age_days=1)
+
+
+def age(cache: ConversionCache, key: str, seconds: float):
+    path = cache._path(key)
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_get_returns_what_was_set(cache):
+    assert cache.get("missing") is None
+    cache.set("k", document("pump seal"))
+    assert cache.get("k").texts[0].text == "pump seal"
+
+
+def test_corrupt_entry_is_a_miss(cache):
+    cache._path("k").write_bytes(b"not gzip")
+    assert cache.get("k") is None
+
+
+def test_hit_refreshes_recency(cache):
+    cache.set("k", document())
+    age(cache, "k", 3600)
+    cache.get("k")
+    assert time.time() - cache._path("k").stat().st_mtime < 60
+
+
+def test_evict_removes_expired_entries_and_stale_temp_files(cache):
+    cache.set("old", document())
+    cache.set("new", document())
+    age(cache, "old", 2 * 24 * 3600)
+    stale = cache.cache_dir / ".x.tmp"
+    stale.write_text("partial")
+    then = time.time() - 2 * conversion_cache.STALE_TEMP_SECONDS
+    os.utime(stale, (then, then))
+
+    assert cache.evict() == 1
+    assert cache.get("old") is None and cache.get("new") is not None
+    assert not stale.exists()
+
+
+def test_evict_drops_least_recently_used_above_size_limit(cache):
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.set(key, document(key))
+        age(cache, key, 300 - i * 100)  # "a" is the least recently used
+    entry_size = cache._path("a").stat().st_size
+    cache.max_size_bytes = 2 * entry_size
+    assert cache.evict() == 1
+    assert sorted(p.name for p in cache.cache_dir.iterdir()) == [f"b{CACHE_SUFFIX}", f"c{CACHE_SUFFIX}"]
+
+
+def test_writes_trigger_eviction_sweeps_at_most_once_per_interval(cache, monkeypatch):
+    sweeps = []
+    monkeypatch.setattr(cache, "evict", lambda: sweeps.append(1) or ConversionCache.evict(cache))
+    for i in range(5):
+        cache.set(f"k{i}", document())
+    assert len(sweeps) == 1
+
+    cache._last_evict -= cache.evict_interval_seconds
+    cache.set("later", document())
+    assert len(sweeps) == 2
+
+
+def test_large_writes_trigger_an_early_sweep(cache, monkeypatch):
+    sweeps = []
+    monkeypatch.setattr(cache, "evict", lambda: sweeps.append(1) or ConversionCache.evict(cache))
+    cache.set("first", document())
+    cache.set("big", document(os.urandom(200_000).hex()))  # Incompressible, above a tenth of 1 MB
+    assert len(sweeps) == 2
+
+
+def test_conversion_key_changes_with_content_pipeline_and_pages(tmp_path):
+    path = tmp_path / "a.pdf"
+    path.write_bytes(b"%PDF-1.4 one")
+    digest = file_sha256(str(path))
+    key = make_conversion_key(digest, "pipeline")
+    assert key == make_conversion_key(digest, "pipeline")
+    assert key != make_conversion_key(digest, "other pipeline")
+    assert key != make_conversion_key(digest, "pipeline", page_range=(1, 20))
+    assert make_conversion_key(digest, "pipeline", (1, 20)) != make_conversion_key(digest, "pipeline", (21, 40))
+
+    path.write_bytes(b"%PDF-1.4 two")
+    assert make_conversion_key(file_sha256(str(path)), "pipeline") != key
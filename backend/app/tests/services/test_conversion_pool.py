@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.ingest.conversion_pool import ConversionPool
+from app.infrastructure.ingest.docling import REF_COLLECTIONS
+from app.models.database.chunk import DocumentChunk
+
+pytestmark = pytest.mark.anyio
+
+
+class ConcurrencyProbe:
+    """Local chunking stand-in that records how many conversions overlap"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.shards = []
+
+    def _enter(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def _exit(self):
+        with self.lock:
+            self.active -= 1
+
+    def chunk_pdf_shard(self, file_path, start_page, end_page, document_id=None, file_digest=None):
+        self._enter()
+        try:
+            time.sleep(0.02)
+            self.shards.append((start_page, end_page))
+            chunk = DocumentChunk(uuid=f"u{start_page}", content="text", document_page=start_page, chunk_metadata={})
+            return [chunk], {name: 0 for name in REF_COLLECTIONS}
+        finally:
+            self._exit()
+
+    def chunk_pdf_document(self, file_path, document_id=None):
+        self._enter()
+        try:
+            time.sleep(0.02)
+            return []
+        finally:
+            self._exit()
+
+
+@pytest.fixture
+def local_pool(monkeypatch):
+    monkeypatch.setenv("CONVERSION_CACHE_ENABLED", "false")
+    pool = ConversionPool(enabled=False)
+    pool.window_pages = 20
+    pool._local_chunking = ConcurrencyProbe()
+
+    async def page_count(file_path):
+        return 100
+
+    monkeypatch.setattr(pool, "streamed_page_count", page_count)
+    return pool
+
+
+async def test_local_streaming_converts_one_shard_at_a_time(local_pool):
+    batches = [batch async for batch in local_pool.iter_chunk_batches("doc.pdf", document_id=1)]
+    probe = local_pool._local_chunking
+    assert probe.peak == 1
+    assert probe.shards == [(1, 20), (21, 40), (41, 60), (61, 80), (81, 100)]
+    assert [batch[0].document_page for batch in batches] == [1, 21, 41, 61, 81]
+
+
+async def test_local_conversions_of_concurrent_documents_do_not_overlap(local_pool):
+    async def stream():
+        return [batch async for batch in local_pool.iter_chunk_batches("doc.pdf")]
+
+    await asyncio.gather(stream(), local_pool.chunk_document("small.pdf"), stream())
+    assert local_pool._local_chunking.peak == 1
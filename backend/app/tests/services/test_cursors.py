@@ -0,0 +1,47 @@
+import base64
+import json
+
+import pytest
+
+from app.models.schemas.requests import DocumentFilter, RetrievalRequest, SearchProfile
+from app.services.retrieval import _request_fingerprint, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    fingerprint = _request_fingerprint(RetrievalRequest(query="pump seal"))
+    cursor = encode_cursor(20, SearchProfile.EXACT, fingerprint)
+    assert "=" not in cursor  # Padding is stripped to keep cursors URL friendly
+    assert decode_cursor(cursor, fingerprint) == (20, SearchProfile.EXACT)
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        RetrievalRequest(query="valve body"),
+        RetrievalRequest(query="pump seal", filters=DocumentFilter(division="piping")),
+        RetrievalRequest(query="pump seal", min_score=0.5),
+    ],
+)
+def test_cursor_is_rejected_for_another_query(other):
+    cursor = encode_cursor(5, SearchProfile.BALANCED, _request_fingerprint(RetrievalRequest(query="pump seal")))
+    with pytest.raises(ValueError, match="does not belong"):
+        decode_cursor(cursor, _request_fingerprint(other))
+
+
+def test_fingerprint_ignores_paging_parameters():
+    request = RetrievalRequest(query="pump seal", limit=5)
+    paged = request.model_copy(update={"limit": 10, "offset": 30, "cursor": "abc"})
+    assert _request_fingerprint(paged) == _request_fingerprint(request)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", base64.urlsafe_b64encode(b'{"o": 1}').decode()])
+def test_broken_cursor_is_invalid(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "fingerprint")
+
+
+def test_negative_offset_is_rejected():
+    state = json.dumps({"o": -5, "p": SearchProfile.FAST.value, "f": "fingerprint"}).encode()
+    cursor = base64.urlsafe_b64encode(state).decode()
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "fingerprint")
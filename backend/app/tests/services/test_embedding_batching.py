@@ -0,0 +1,135 @@
+import pytest
+
+from app.infrastructure.ingest import docling
+from app.services import embedding_batching
+from app.services.embedding_batching import EmbeddingBatchPlanner, count_tokens_many
+
+
+def test_plan_splits_on_token_budget():
+    planner = EmbeddingBatchPlanner(token_budget=100, max_batch_size=64)
+    batches = planner.plan([40, 40, 40, 90, 10], model="m")
+    assert batches == [slice(0, 2), slice(2, 3), slice(3, 5)]
+
+
+def test_plan_keeps_oversize_item_in_its_own_batch():
+    planner = EmbeddingBatchPlanner(token_budget=100, max_batch_size=64)
+    assert planner.plan([500, 10], model="m") == [slice(0, 1), slice(1, 2)]
+
+
+def test_plan_caps_items_per_batch():
+    planner = EmbeddingBatchPlanner(token_budget=10_000, max_batch_size=4)
+    batches = planner.plan([1] * 10, model="m")
+    assert [b.stop - b.start for b in batches] == [4, 4, 2]
+
+
+def test_plan_empty():
+    planner = EmbeddingBatchPlanner(token_budget=100, max_batch_size=4)
+    assert planner.plan([], model="m") == []
+
+
+def test_record_prefers_fastest_bucket_and_probes_one_above():
+    planner = EmbeddingBatchPlanner(token_budget=10_000, max_batch_size=64)
+    planner.record("m", batch_size=8, num_chars=8000, seconds=1.0)
+    planner.record("m", batch_size=32, num_chars=8000, seconds=4.0)
+    assert planner.preferred_batch_size("m") == 16
+    # Other models are unaffected
+    assert planner.preferred_batch_size("other") == 64
+
+
+def test_record_smooths_measurements():
+    planner = EmbeddingBatchPlanner(token_budget=10_000, max_batch_size=64, smoothing=0.5)
+    planner.record("m", batch_size=4, num_chars=100, seconds=1.0)
+    planner.record("m", batch_size=4, num_chars=300, seconds=1.0)
+    assert planner._throughput["m"][4] == 200
+
+
+def test_record_ignores_invalid_measurements():
+    planner = EmbeddingBatchPlanner(token_budget=10_000, max_batch_size=64)
+    planner.record("m", batch_size=4, num_chars=100, seconds=0)
+    planner.record("m", batch_size=0, num_chars=100, seconds=1)
+    assert "m" not in planner._throughput
+
+
+def test_record_failure_lowers_ceiling():
+    planner = EmbeddingBatchPlanner(token_budget=10_000, max_batch_size=64)
+    planner.record("m", batch_size=64, num_chars=64000, seconds=1.0)
+    planner.record_failure("m", batch_size=64)
+    assert planner.preferred_batch_size("m") == 32
+    assert [b.stop - b.start for b in planner.plan([1] * 40, model="m")] == [32, 8]
+
+
+def test_chunk_tokenizer_carries_chunk_size_cap(monkeypatch):
+    calls = {}
+
+    def from_pretrained(**kwargs):
+        calls.update(kwargs)
+        return object()
+
+    monkeypatch.setattr(docling.HuggingFaceTokenizer, "from_pretrained", from_pretrained)
+    docling.get_chunk_tokenizer.cache_clear()
+    try:
+        docling.get_chunk_tokenizer()
+    finally:
+        docling.get_chunk_tokenizer.cache_clear()
+    assert calls["max_tokens"] == docling.CHUNK_MAX_TOKENS == 256
+
+
+def test_failed_tokenizer_load_is_not_retried(monkeypatch):
+    attempts = []
+
+    def from_pretrained(**kwargs):
+        attempts.append(kwargs)
+        raise OSError("no network")
+
+    monkeypatch.setattr(docling.HuggingFaceTokenizer, "from_pretrained", from_pretrained)
+    docling.get_chunk_tokenizer.cache_clear()
+    embedding_batching._load_chunk_tokenizer.cache_clear()
+    try:
+        counts = count_tokens_many(["x" * 40] * 100)
+    finally:
+        docling.get_chunk_tokenizer.cache_clear()
+        embedding_batching._load_chunk_tokenizer.cache_clear()
+    assert len(attempts) == 1
+    assert counts == [11] * 100
+
+
+class OversizeProvider:
+    EMBEDDING_MODEL = "oversize-model"
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.batches = []
+
+    async def get_embeddings(self, texts):
+        self.batches.append(len(texts))
+        if len(texts) > self.limit:
+            raise TimeoutError("timeout")
+        return [[1.0, 0.0]] * len(texts)
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.anyio
+async def test_failures_and_successes_are_recorded_on_the_provider_batch(monkeypatch):
+    from app.services import embedding
+    from app.services.document_processing import DocumentProcessingService
+    from app.services.embedding import EmbeddingsService
+
+    planner = EmbeddingBatchPlanner(token_budget=10_000, max_batch_size=64)
+    monkeypatch.setattr(embedding, "get_embedding_batch_planner", lambda: planner)
+    provider = OversizeProvider(limit=8)
+    service = EmbeddingsService(provider=provider, use_cache=False)
+    processing = object.__new__(DocumentProcessingService)
+    processing.embeddings_service = service
+    processing.batch_planner = planner
+    try:
+        embeddings = await processing._embed_with_split([f"text {i}" for i in range(32)])
+    finally:
+        await service.close()
+
+    assert len(embeddings) == 32
+    # 32 and 16 failed; the provider saw the same sizes the planner learned from
+    assert provider.batches[:3] == [32, 16, 8]
+    assert planner._ceiling["oversize-model"] == 8
+    assert set(planner._throughput["oversize-model"]) == {8}
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from app.services.embedding_scheduler import EmbeddingPriority, EmbeddingScheduler
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingEmbedder:
+    """Embeds each text as [len(text)] and records the batches it was called with"""
+
+    def __init__(self):
+        self.batches = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self, texts):
+        self.batches.append(list(texts))
+        await self.gate.wait()
+        return [[len(text)] for text in texts]
+
+
+async def test_concurrent_requests_are_coalesced():
+    embedder = RecordingEmbedder()
+    scheduler = EmbeddingScheduler(embedder, window_ms=20, max_batch_size=64)
+    results = await asyncio.gather(
+        scheduler.submit(["a"]), scheduler.submit(["bb", "ccc"]), scheduler.submit(["dddd"])
+    )
+    assert results == [[[1]], [[2], [3]], [[4]]]
+    assert len(embedder.batches) == 1
+    assert scheduler.requests_coalesced == 3
+    await scheduler.close()
+
+
+async def test_planned_batches_are_not_merged():
+    embedder = RecordingEmbedder()
+    scheduler = EmbeddingScheduler(embedder, window_ms=20, max_batch_size=64)
+    await asyncio.gather(
+        scheduler.submit(["a"]),
+        scheduler.submit(["planned", "batch"], coalesce=False),
+        scheduler.submit(["b"]),
+        scheduler.submit(["other", "plan"], coalesce=False),
+    )
+    assert sorted(embedder.batches) == sorted([["a"], ["planned", "batch"], ["b"], ["other", "plan"]])
+    await scheduler.close()
+
+
+async def test_query_requests_jump_ahead_of_bulk():
+    embedder = RecordingEmbedder()
+    scheduler = EmbeddingScheduler(embedder, window_ms=1, max_batch_size=1, max_in_flight=1)
+    embedder.gate.clear()
+    first = asyncio.create_task(scheduler.submit(["first"]))
+    await asyncio.sleep(0.05)  # "first" is now in flight and holds the only slot
+
+    bulk = asyncio.create_task(scheduler.submit(["bulk"], EmbeddingPriority.BULK))
+    await asyncio.sleep(0)
+    query = asyncio.create_task(scheduler.submit(["query"], EmbeddingPriority.QUERY))
+    await asyncio.sleep(0.05)
+    embedder.gate.set()
+    await asyncio.gather(first, bulk, query)
+
+    assert embedder.batches == [["first"], ["query"], ["bulk"]]
+    await scheduler.close()
+
+
+async def test_cancelled_request_is_not_sent():
+    embedder = RecordingEmbedder()
+    scheduler = EmbeddingScheduler(embedder, window_ms=50, max_batch_size=64)
+    cancelled = asyncio.create_task(scheduler.submit(["dropped"]))
+    kept = asyncio.create_task(scheduler.submit(["kept"]))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    assert await kept == [[4]]
+    assert embedder.batches == [["kept"]]
+    await scheduler.close()
+
+
+async def test_provider_error_reaches_every_caller_in_the_batch():
+    async def failing(texts):
+        raise ValueError("provider down")
+
+    scheduler = EmbeddingScheduler(failing, window_ms=20)
+    results = await asyncio.gather(
+        scheduler.submit(["a"]), scheduler.submit(["b"]), return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+    await scheduler.close()
+
+
+async def test_close_fails_queued_requests_and_rejects_new_ones():
+    embedder = RecordingEmbedder()
+    scheduler = EmbeddingScheduler(embedder, window_ms=1, max_batch_size=1, max_in_flight=1)
+    embedder.gate.clear()
+    in_flight = asyncio.create_task(scheduler.submit(["in flight"]))
+    await asyncio.sleep(0.05)
+    queued = asyncio.create_task(scheduler.submit(["queued"], EmbeddingPriority.QUERY))
+    await asyncio.sleep(0)
+
+    await scheduler.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        await asyncio.wait_for(queued, 1)
+    with pytest.raises(RuntimeError, match="closed"):
+        await scheduler.submit(["late"])
+
+    # A batch already sent to the provider still completes
+    embedder.gate.set()
+    assert await asyncio.wait_for(in_flight, 1) == [[9]]
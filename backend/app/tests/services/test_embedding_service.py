@@ -0,0 +1,131 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.infrastructure.cache.embedding_cache import make_cache_key
+from app.services import container
+from app.services.embedding import get_embeddings_service
+from app.services.embedding_scheduler import EmbeddingPriority
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_embeddings_are_one_row_per_text(embeddings_service, embedding_provider):
+    embeddings = await embeddings_service.get_embeddings(["pump seal", "valve body"])
+    assert embeddings.shape == (2, embedding_provider.dim)
+    assert embeddings.dtype == np.float32
+    single = await embeddings_service.get_embedding("pump seal", use_cache=False)
+    np.testing.assert_allclose(single, embeddings[0])
+
+
+async def test_only_cache_misses_reach_the_provider(embeddings_service, embedding_provider):
+    await embeddings_service.get_embeddings(["pump seal", "valve body"])
+    embedding_provider.calls.clear()
+
+    embeddings = await embeddings_service.get_embeddings(
+        ["valve body", "flange gasket", "pump seal"], priority=EmbeddingPriority.BULK
+    )
+    assert embedding_provider.calls == [["flange gasket"]]
+    assert embeddings.shape[0] == 3
+    stats = embeddings_service.get_stats()
+    assert stats["provider_texts"] == 3
+    assert stats["cache"]["memory_hits"] == 2
+
+
+async def test_duplicate_texts_in_one_batch_are_embedded_once(embeddings_service, embedding_provider):
+    embeddings = await embeddings_service.get_embeddings(["pump seal", "pump seal", "pump  seal"])
+    # Keys are built from normalized text, so all three share one provider row
+    assert embedding_provider.calls == [["pump seal"]]
+    np.testing.assert_allclose(embeddings[0], embeddings[2])
+
+
+async def test_use_cache_false_bypasses_the_cache(embeddings_service, embedding_provider):
+    await embeddings_service.get_embeddings(["pump seal"])
+    await embeddings_service.get_embeddings(["pump seal"], use_cache=False)
+    assert embedding_provider.calls == [["pump seal"], ["pump seal"]]
+
+
+async def test_empty_input_skips_the_provider(embeddings_service, embedding_provider):
+    embeddings = await embeddings_service.get_embeddings([])
+    assert embeddings.shape[0] == 0
+    assert embedding_provider.calls == []
+
+
+async def test_cached_embeddings_do_not_pin_the_provider_batch(embeddings_service):
+    texts = ["pump seal", "valve body", "flange gasket"]
+    await embeddings_service.get_embeddings(texts)
+    for text in texts:
+        cached = embeddings_service.cache.memory.get(make_cache_key(embeddings_service.model_name, text))
+        assert cached.base is None  # An own buffer, not a view of the (3, dim) batch
+
+
+class ClosableProvider:
+    """Provider that records close() and can hold its calls until released"""
+
+    def __init__(self, name, dim=64):
+        self.EMBEDDING_MODEL = name
+        self.dim = dim
+        self.closed = False
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def get_embeddings(self, texts):
+        await self.release.wait()
+        return np.ones((len(texts), self.dim), dtype=np.float32)
+
+    async def close(self):
+        self.closed = True
+
+
+async def test_switching_provider_closes_the_replaced_one(embeddings_service):
+    old, new = ClosableProvider("old-model"), ClosableProvider("new-model")
+    await embeddings_service.switch_provider(old)
+
+    await embeddings_service.switch_provider(new)
+
+    assert old.closed and not new.closed
+    assert embeddings_service.model_name == "new-model"
+
+
+async def test_replaced_provider_is_closed_after_its_calls_finish(embeddings_service):
+    old = ClosableProvider("old-model")
+    await embeddings_service.switch_provider(old)
+    old.release.clear()
+    call = asyncio.create_task(embeddings_service.get_embeddings(["pump seal"], use_cache=False))
+    await asyncio.sleep(0.05)
+
+    await embeddings_service.switch_provider(ClosableProvider("new-model"))
+    assert not old.closed
+
+    old.release.set()
+    assert (await call).shape == (1, 64)
+    assert old.closed
+
+
+async def test_handed_over_provider_stays_open(embeddings_service):
+    provider = ClosableProvider("new-model")
+    await embeddings_service.switch_provider(provider)
+
+    await embeddings_service.close(close_provider=False)
+
+    assert not provider.closed
+
+
+async def test_container_shutdown_drops_the_shared_embeddings_service(monkeypatch):
+    class ClosedContainer:
+        async def close(self):
+            pass
+
+    shared = get_embeddings_service()
+    monkeypatch.setattr(container, "_container", ClosedContainer())
+
+    await container.shutdown_service_container()
+
+    rebuilt = get_embeddings_service()
+    try:
+        assert rebuilt is not shared
+    finally:
+        await shared.close()
+        await rebuilt.close()
+        get_embeddings_service.cache_clear()
@@ -0,0 +1,33 @@
+import pytest
+
+from app.services import reembedding
+from app.services.reembedding import ReembeddingService
+from app.tests.services.test_embedding_service import ClosableProvider
+
+pytestmark = pytest.mark.anyio
+
+
+class AliasOnlyStore:
+    async def activate_collection(self, collection_name):
+        self.activated = collection_name
+
+
+@pytest.fixture
+def job(embeddings_service, monkeypatch):
+    monkeypatch.setattr(reembedding, "get_embeddings_service", lambda: embeddings_service)
+    monkeypatch.setattr(reembedding, "create_embedding_provider", lambda name, model: ClosableProvider(model))
+    return ReembeddingService(db_session=None, embedding_model="new-model", vector_size=64)
+
+
+async def test_unactivated_job_closes_its_provider(job):
+    await job.close()
+    assert job.embeddings_service.provider.closed
+
+
+async def test_activated_job_leaves_its_provider_to_the_live_service(job, embeddings_service):
+    await job.activate(AliasOnlyStore())
+    await job.close()
+
+    provider = job.embeddings_service.provider
+    assert embeddings_service.provider is provider
+    assert not provider.closed
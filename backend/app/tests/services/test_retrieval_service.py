@@ -0,0 +1,95 @@
+import pytest
+
+from app.infrastructure.cache.embedding_cache import make_cache_key
+from app.models.schemas.requests import DocumentFilter, RetrievalRequest
+
+pytestmark = pytest.mark.anyio
+
+CHUNKS = [
+    ("Replace the pump seal when leakage exceeds the limit", 1, "Mechanical"),
+    ("Inspect the pump impeller for erosion every year", 1, "Mechanical"),
+    ("Calibrate the pressure transmitter before startup", 2, "Instrumentation"),
+    ("Torque the flange bolts in a star pattern", 3, "Piping"),
+]
+
+
+async def store_chunks(retrieval_service):
+    texts = [text for text, _, _ in CHUNKS]
+    metadata = [
+        {
+            "chunk_id": i + 1,
+            "document_id": document_id,
+            "uuid": f"00000000-0000-0000-0000-00000000000{i + 1}",
+            "division": division.lower(),
+            "content": text,
+        }
+        for i, (text, document_id, division) in enumerate(CHUNKS)
+    ]
+    await retrieval_service.store_embeddings(texts, metadata)
+
+
+async def test_retrieve_page_ranks_matching_chunk_first(retrieval_service):
+    await store_chunks(retrieval_service)
+    page = await retrieval_service.retrieve_page(
+        RetrievalRequest(query="pump seal leakage", limit=2)
+    )
+    assert page.results[0].payload["chunk_id"] == 1
+    assert page.results[0].content == CHUNKS[0][0]
+    assert page.next_cursor is not None
+
+
+async def test_cursor_pages_do_not_overlap(retrieval_service):
+    await store_chunks(retrieval_service)
+    request = RetrievalRequest(query="pump seal leakage", limit=2)
+    first = await retrieval_service.retrieve_page(request)
+    second = await retrieval_service.retrieve_page(
+        request.model_copy(update={"cursor": first.next_cursor})
+    )
+    first_ids = {r.id for r in first.results}
+    second_ids = {r.id for r in second.results}
+    assert len(second_ids) == 2 and not first_ids & second_ids
+    assert second.next_cursor is None
+    assert second.total_results == 4
+
+
+async def test_filters_restrict_results(retrieval_service):
+    await store_chunks(retrieval_service)
+    page = await retrieval_service.retrieve_page(
+        RetrievalRequest(query="pump", limit=5, filters=DocumentFilter(division="Piping"))
+    )
+    assert [r.payload["chunk_id"] for r in page.results] == [4]
+
+
+async def test_query_embeddings_are_reused(retrieval_service, embedding_provider):
+    await store_chunks(retrieval_service)
+    embedding_provider.calls.clear()
+    request = RetrievalRequest(query="pump seal leakage", limit=1)
+    await retrieval_service.retrieve_page(request)
+    await retrieval_service.retrieve_page(request.model_copy(update={"limit": 3}))
+    assert embedding_provider.calls == [["pump seal leakage"]]
+
+
+async def test_batch_matches_single_queries(retrieval_service):
+    await store_chunks(retrieval_service)
+    requests = [
+        RetrievalRequest(query="pump seal leakage", limit=2),
+        RetrievalRequest(query="flange bolts", limit=1),
+    ]
+    pages = await retrieval_service.retrieve_similar_batch(requests)
+    for request, page in zip(requests, pages):
+        single = await retrieval_service.retrieve_page(request)
+        assert [r.id for r in page.results] == [r.id for r in single.results]
+
+
+async def test_store_embeddings_is_idempotent(retrieval_service):
+    await store_chunks(retrieval_service)
+    await store_chunks(retrieval_service)
+    assert await retrieval_service.vector_store.estimate_matches() == len(CHUNKS)
+
+
+async def test_cached_query_embeddings_are_copies(retrieval_service):
+    await retrieval_service.embed_queries(["pump seal", "flange bolts"])
+    await retrieval_service.embed_query("valve body")
+    for query in ("pump seal", "flange bolts", "valve body"):
+        key = make_cache_key(retrieval_service.embeddings_service.model_name, query)
+        assert retrieval_service.query_cache.get(key).base is None
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from app.services import served_model
+from app.services.served_model import ServedModelMonitor, reembed_checkpoint_path
+
+pytestmark = pytest.mark.anyio
+
+
+class AliasStore:
+    """Vector store stand-in whose served alias the test moves"""
+
+    collection_name = "rag_mvp"
+
+    def __init__(self, target=None):
+        self.target = target
+        self.lookups = 0
+
+    async def get_alias_target(self, alias_name=None):
+        self.lookups += 1
+        return self.target
+
+
+class NamedProvider:
+    def __init__(self, name):
+        self.EMBEDDING_MODEL = name
+
+
+@pytest.fixture
+def checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setenv("REEMBED_CHECKPOINT_DIR", str(tmp_path / "reembed"))
+    created = []
+
+    def create(provider_name, embedding_model):
+        created.append((provider_name, embedding_model))
+        return NamedProvider(embedding_model)
+
+    monkeypatch.setattr(served_model, "create_embedding_provider", create)
+
+    def write(collection, status="activated", provider="local", model="new-model"):
+        path = reembed_checkpoint_path(collection)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"status": status, "provider": provider, "embedding_model": model}))
+
+    write.created = created
+    return write
+
+
+async def test_switches_to_model_of_new_alias_target(embeddings_service, checkpoints):
+    store = AliasStore("rag_mvp__new_model__64")
+    checkpoints("rag_mvp__new_model__64")
+    monitor = ServedModelMonitor(embeddings_service, store, check_interval_seconds=0)
+
+    await monitor.sync()
+    assert embeddings_service.model_name == "new-model"
+    assert checkpoints.created == [("local", "new-model")]
+
+    # Same target again: nothing to reload
+    await monitor.sync()
+    assert checkpoints.created == [("local", "new-model")]
+
+
+async def test_checks_alias_at_most_once_per_interval(embeddings_service, checkpoints):
+    store = AliasStore()
+    monitor = ServedModelMonitor(embeddings_service, store, check_interval_seconds=60)
+    await monitor.sync()
+    await monitor.sync()
+    assert store.lookups == 1
+
+
+async def test_unfinished_or_unknown_collections_keep_current_model(embeddings_service, checkpoints):
+    model = embeddings_service.model_name
+    store = AliasStore("rag_mvp__half_done__64")
+    checkpoints("rag_mvp__half_done__64", status="running")
+    monitor = ServedModelMonitor(embeddings_service, store, check_interval_seconds=0)
+    await monitor.sync()
+    store.target = "rag_mvp__unknown__64"
+    await monitor.sync()
+    assert embeddings_service.model_name == model
+    assert checkpoints.created == []
+
+
+async def test_stores_without_aliases_are_ignored(embeddings_service, numpy_vector_store, checkpoints):
+    model = embeddings_service.model_name
+    await ServedModelMonitor(embeddings_service, numpy_vector_store, check_interval_seconds=0).sync()
+    assert embeddings_service.model_name == model
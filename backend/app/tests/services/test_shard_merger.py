@@ -0,0 +1,106 @@
+from docling_core.types.doc.document import DoclingDocument
+
+from app.infrastructure.ingest.docling import (
+    HEADING_LEVELS_KEY,
+    REF_COLLECTIONS,
+    DoclingChunking,
+    ShardMerger,
+)
+from app.models.database.chunk import DocumentChunk
+
+
+def chunk(refs, headings=None, parent="#/body", levels=None):
+    metadata = {
+        "doc_items": [{"self_ref": ref, "parent": {"$ref": parent}, "prov": [{"page_no": 1}]} for ref in refs]
+    }
+    if headings:
+        metadata["headings"] = headings
+    if levels:
+        metadata[HEADING_LEVELS_KEY] = levels
+    return DocumentChunk(uuid="u", content="text", chunk_metadata=metadata)
+
+
+def counts(**overrides):
+    return {**{name: 0 for name in REF_COLLECTIONS}, **overrides}
+
+
+def refs_of(merged):
+    return [item["self_ref"] for item in merged.chunk_metadata["doc_items"]]
+
+
+def test_first_shard_is_unchanged():
+    merger = ShardMerger()
+    merged = merger.merge([chunk(["#/texts/0", "#/tables/1"], headings=["Intro"])], counts(texts=3, tables=2))
+    assert refs_of(merged[0]) == ["#/texts/0", "#/tables/1"]
+    assert merged[0].chunk_metadata["headings"] == ["Intro"]
+
+
+def test_refs_are_offset_by_item_counts_of_earlier_shards():
+    merger = ShardMerger()
+    merger.merge([chunk(["#/texts/0"])], counts(texts=3, tables=2))
+    merger.merge([chunk(["#/texts/0"])], counts(texts=4, pictures=1))
+    merged = merger.merge(
+        [chunk(["#/texts/1", "#/tables/0", "#/pictures/0", "#/groups/2"], parent="#/texts/0")],
+        counts(),
+    )
+    assert refs_of(merged[0]) == ["#/texts/8", "#/tables/2", "#/pictures/1", "#/groups/2"]
+    # Nested "$ref" values are renumbered too; refs outside item collections are left alone
+    assert merged[0].chunk_metadata["doc_items"][0]["parent"] == {"$ref": "#/texts/7"}
+    assert merger.merge([chunk(["#/body"])], counts())[0].chunk_metadata["doc_items"][0]["self_ref"] == "#/body"
+
+
+def test_headings_carry_over_shard_boundaries():
+    merger = ShardMerger()
+    merger.merge([chunk(["#/texts/0"], headings=["2 Maintenance"])], counts(texts=1))
+    merged = merger.merge(
+        [chunk(["#/texts/0"]), chunk(["#/texts/1"], headings=["3 Safety"]), chunk(["#/texts/2"])],
+        counts(texts=3),
+    )
+    assert [c.chunk_metadata["headings"] for c in merged] == [["2 Maintenance"], ["3 Safety"], ["3 Safety"]]
+
+
+def test_shard_headings_keep_parents_from_earlier_shards():
+    merger = ShardMerger()
+    merger.merge([chunk(["#/texts/0"], headings=["Manual", "2 Maintenance"], levels=[0, 1])], counts(texts=1))
+    merged = merger.merge(
+        [
+            chunk(["#/texts/0"], headings=["2.3 Seals"], levels=[2]),
+            chunk(["#/texts/1"], headings=["2.3 Seals", "2.3.1 Wear"], levels=[2, 3]),
+            chunk(["#/texts/2"], headings=["3 Safety"], levels=[1]),
+        ],
+        counts(texts=3),
+    )
+    assert [c.chunk_metadata["headings"] for c in merged] == [
+        ["Manual", "2 Maintenance", "2.3 Seals"],
+        ["Manual", "2 Maintenance", "2.3 Seals", "2.3.1 Wear"],
+        ["Manual", "3 Safety"],
+    ]
+    assert all(HEADING_LEVELS_KEY not in c.chunk_metadata for c in merged)
+
+
+def test_shard_chunks_record_heading_levels(monkeypatch):
+    document = DoclingDocument(name="shard")
+    document.add_title(text="Manual")
+    document.add_heading(text="2 Maintenance", level=1)
+    document.add_heading(text="2.3 Seals", level=2)
+    chunking = DoclingChunking()
+    monkeypatch.setattr(chunking, "read_page_range", lambda *args, **kwargs: document)
+    monkeypatch.setattr(
+        chunking, "chunk_general_document",
+        lambda doc, document_id=None: [chunk(["#/texts/3"], headings=["Manual", "2 Maintenance", "2.3 Seals"])],
+    )
+
+    chunks, _ = chunking.chunk_pdf_shard("manual.pdf", 21, 40)
+
+    assert chunks[0].chunk_metadata[HEADING_LEVELS_KEY] == [0, 1, 2]
+
+
+def test_chunks_before_any_heading_get_none():
+    merged = ShardMerger().merge([chunk(["#/texts/0"])], counts(texts=1))
+    assert "headings" not in merged[0].chunk_metadata
+
+
+def test_page_windows_cover_document():
+    assert DoclingChunking.page_windows(45, 20) == [(1, 20), (21, 40), (41, 45)]
+    assert DoclingChunking.page_windows(20, 20) == [(1, 20)]
+    assert DoclingChunking.page_windows(0, 20) == []
@@ -63,6 +63,12 @@ class ServiceHealthChecker:
                 if response.status_code == 200:
                     collections = response.json()
                     collection_names = [c["name"] for c in collections.get("result", {}).get("collections", [])]
+
+                    # The served collection is normally an alias over a model-versioned collection
+                    aliases_response = await client.get(f"{qdrant_url}/aliases")
+                    if aliases_response.status_code == 200:
+                        aliases = aliases_response.json().get("result", {}).get("aliases", [])
+                        collection_names += [a["alias_name"] for a in aliases]
                     
                     if settings.QDRANT_COLLECTION in collection_names:
                         return {
@@ -103,7 +109,10 @@ class ServiceHealthChecker:
                     available_models = [model["name"] for model in models_data.get("models", [])]
                     
                     # Check if required models are available
-                    required_models = [settings.OLLAMA_EMBEDDING_MODEL, settings.OLLAMA_CHAT_MODEL]
+                    required_models = [settings.OLLAMA_CHAT_MODEL]
+                    # Embeddings only need Ollama when it is the configured provider
+                    if settings.EMBEDDING_PROVIDER.lower() == "ollama":
+                        required_models.append(settings.OLLAMA_EMBEDDING_MODEL)
                     missing_models = [model for model in required_models if model not in available_models]
                     
                     if missing_models:
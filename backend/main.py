@@ -1,13 +1,27 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
 from app.api.v1.routes import api_router
+from app.services.container import init_service_container, shutdown_service_container
 from app.utils.logging_setup import create_logger
 
 logger = create_logger(__name__)
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build shared services (and their connection pools) once per process
+    app.state.services = init_service_container()
+    await app.state.services.start()
+    yield
+    await shutdown_service_container()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3030,http://localhost:5173,http://frontend:5173").split(",")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+One-off migration of a legacy plain Qdrant collection to the alias layout.
+
+Older deployments stored vectors in a plain collection named QDRANT_COLLECTION.
+Re-embedding and activation need that name to be an alias over a model-versioned
+collection. This copies the legacy points into the versioned collection of the model
+that produced them, then replaces the legacy collection by an alias. Searches fail only
+for the moment between dropping the legacy collection and creating the alias, so run it
+in a quiet period.
+
+Usage (from backend/):
+    python scripts/migrate_legacy_collection.py --embedding-model nomic-embed-text:latest
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.infrastructure.vector_store.qdrant_store import QdrantVectorStore  # noqa: E402
+
+
+async def main(args):
+    store = QdrantVectorStore()
+    try:
+        result = await store.migrate_legacy_collection(embedding_model=args.embedding_model)
+    finally:
+        await store.close()
+    print(
+        f"{result['alias']} -> {result['collection']} "
+        f"({result['migrated_points']} points migrated)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--embedding-model",
+        default=None,
+        help="Model that produced the legacy vectors (default: the configured embedding model)",
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
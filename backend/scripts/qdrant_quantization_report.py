@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Recall-versus-latency report for Qdrant quantization modes.
+
+Copies a sample of the served collection into temporary collections (one per
+quantization mode, built with the configured HNSW and on-disk settings), runs the
+same queries against each with different rescoring/oversampling parameters, and
+compares the results to exact brute-force search.
+
+Usage (from backend/):
+    python scripts/qdrant_quantization_report.py --max-points 20000 --queries 200
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from qdrant_client.http import models  # noqa: E402
+
+from app.core.config.vector_store import get_vector_store_settings  # noqa: E402
+from app.infrastructure.vector_store.qdrant_store import QdrantVectorStore  # noqa: E402
+
+
+async def load_sample(store: QdrantVectorStore, max_points: int):
+    """Scroll up to max_points (id, vector) pairs from the served collection"""
+    ids, vectors = [], []
+    offset = None
+    while len(ids) < max_points:
+        points, offset = await store.async_client.scroll(
+            collection_name=store.collection_name,
+            limit=min(1000, max_points - len(ids)),
+            offset=offset,
+            with_vectors=True,
+            with_payload=False,
+        )
+        for point in points:
+            ids.append(point.id)
+            vectors.append(point.vector)
+        if offset is None:
+            break
+    return ids, np.asarray(vectors, dtype=np.float32)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Ground truth: indices of the k most cosine-similar vectors per query"""
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    query_norm = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = query_norm @ normalized.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+async def build_mode_collection(settings, mode: str, ids, vectors: np.ndarray) -> QdrantVectorStore:
+    mode_settings = settings.model_copy(update={"QDRANT_QUANTIZATION": mode})
+    store = QdrantVectorStore(
+        collection_name=f"{settings.QDRANT_COLLECTION}__report_{mode}",
+        vector_size=vectors.shape[1],
+    )
+    store.settings = mode_settings
+    if await store.async_client.collection_exists(store.collection_name):
+        await store.async_client.delete_collection(store.collection_name)
+    await store.ensure_collection()
+    # Index small samples too, otherwise Qdrant answers with a plain full scan
+    await store.async_client.update_collection(
+        collection_name=store.collection_name,
+        optimizers_config=models.OptimizersConfigDiff(indexing_threshold=1),
+    )
+    await store.bulk_store_vectors(vectors, [{} for _ in ids], ids=ids)
+
+    while (await store.async_client.get_collection(store.collection_name)).status != models.CollectionStatus.GREEN:
+        await asyncio.sleep(1)
+    return store
+
+
+async def measure(store: QdrantVectorStore, queries: np.ndarray, truth_ids, k: int, params):
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth_ids):
+        start = time.perf_counter()
+        hits = await store.async_client.search(
+            collection_name=store.collection_name,
+            query_vector=query,
+            limit=k,
+            search_params=params,
+            with_payload=False,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len({hit.id for hit in hits} & set(expected)) / k)
+    return float(np.mean(recalls)), float(np.percentile(latencies, 50)), float(np.percentile(latencies, 95))
+
+
+async def main(args):
+    settings = get_vector_store_settings()
+    source = QdrantVectorStore()
+    ids, vectors = await load_sample(source, args.max_points)
+    if len(ids) < args.limit:
+        print(f"Not enough points in {source.collection_name} ({len(ids)})")
+        return 1
+
+    rng = np.random.default_rng(args.seed)
+    query_rows = rng.choice(len(ids), size=min(args.queries, len(ids)), replace=False)
+    # Perturb sampled vectors so queries do not trivially match themselves
+    queries = vectors[query_rows] + rng.normal(0, 0.01, (len(query_rows), vectors.shape[1])).astype(np.float32)
+    truth = exact_top_k(vectors, queries, args.limit)
+    truth_ids = [[ids[i] for i in row] for row in truth]
+
+    print(f"{len(ids)} points, {len(queries)} queries, recall@{args.limit} against exact search\n")
+    print(f"{'mode':<8} {'search params':<28} {'recall':>7} {'p50 ms':>8} {'p95 ms':>8}")
+
+    for mode in args.modes.split(","):
+        store = await build_mode_collection(settings, mode, ids, vectors)
+        try:
+            variants = [("hnsw", models.SearchParams(hnsw_ef=args.hnsw_ef))]
+            if mode != "none":
+                variants.append((
+                    "no rescore",
+                    models.SearchParams(
+                        hnsw_ef=args.hnsw_ef,
+                        quantization=models.QuantizationSearchParams(rescore=False),
+                    ),
+                ))
+                for oversampling in args.oversampling.split(","):
+                    variants.append((
+                        f"rescore x{oversampling}",
+                        models.SearchParams(
+                            hnsw_ef=args.hnsw_ef,
+                            quantization=models.QuantizationSearchParams(
+                                rescore=True, oversampling=float(oversampling)
+                            ),
+                        ),
+                    ))
+            for label, params in variants:
+                recall, p50, p95 = await measure(store, queries, truth_ids, args.limit, params)
+                print(f"{mode:<8} {label:<28} {recall:>7.3f} {p50:>8.2f} {p95:>8.2f}")
+        finally:
+            if not args.keep:
+                await store.async_client.delete_collection(store.collection_name)
+            await store.close()
+
+    await source.close()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-points", type=int, default=20000, help="Points copied from the served collection")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--limit", type=int, default=10, help="k for recall@k")
+    parser.add_argument("--modes", default="none,scalar,binary", help="Quantization modes to compare")
+    parser.add_argument("--oversampling", default="1.0,2.0,4.0", help="Oversampling factors for rescoring")
+    parser.add_argument("--hnsw-ef", type=int, default=None, help="Query-time HNSW ef")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary collections")
+    sys.exit(asyncio.run(main(parser.parse_args())))